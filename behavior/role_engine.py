@@ -2,12 +2,18 @@
 
 import time
 import logging
+import threading
 from collections import deque
-from functools import lru_cache
-from typing import Dict
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
 
+from core.prompt_templates import registry
+from core.tracing import TRACER
 from state.emotion_frr import FRRState
 from state.emotion_trigger import trigger_burst, apply_burst_recovery
+from state.session_locks import lock_for
+from state.strategy_log import emit
+from state.timer_wheel import TimerWheel
 
 # Coping styles: rewrite traits to be "ordinary person" rather than counsellor.
 COPING_STYLES: Dict[str, Dict] = {
@@ -45,33 +51,113 @@ BURST_TO_STYLE: Dict[str, str] = {
 }
 
 
+# Tone keys from calmest to most intense (expired cooldowns only ever relax the tone)
+TONE_RANK: Dict[str, int] = {"baseline": 0, "mild": 1, "moderate": 2, "severe": 3}
+
+
 class RoleEngine:
-    def __init__(self, state: FRRState):
-        self.state = state
+    """
+    Burst -> coping style -> tone -> prompt decisions.
+
+    One engine can serve any number of sessions: every method takes an optional
+    per-session `state` (defaults to the state given at construction, so
+    RoleEngine(state) keeps working). The engine itself only holds read-only
+    tables (burst->style map, tone map, the shared prompt registry) and the
+    cooldown setting; all per-session data lives on the FRRState. Decisions for
+    one state are serialised by a striped lock, so an engine can be shared by
+    many threads. The methods do no network I/O, but with a StrategyLog active
+    emit() may write (and, with fsync=True, fsync) a log batch while the lock
+    is held; asyncio callers that enable the log should run decisions in an
+    executor.
 
-        if not hasattr(self.state, "last_burst_level"):
-            setattr(self.state, "last_burst_level", "baseline")
-        if not hasattr(self.state, "last_prompt_style"):
-            setattr(self.state, "last_prompt_style", "baseline")
-        if not hasattr(self.state, "last_style") or getattr(self.state, "last_style") not in COPING_STYLES:
-            setattr(self.state, "last_style", "emotion_focused")
+    With a TimerWheel, cooldown expiries fire proactively: tone cooldowns,
+    burst cooling periods (cooling_period rounds x cooling_round_secs) and
+    per-strategy cooldowns are armed as timers, and process_expired() applies
+    everything that came due in one batch (tone relaxes to the last burst
+    level, cooling_period is cleared, strategy cooldowns step back towards 1).
+    """
 
-        self.STYLE_SWITCH_COOLDOWN_SECS = getattr(self, "STYLE_SWITCH_COOLDOWN_SECS", 60)
+    STYLE_SWITCH_COOLDOWN_SECS = 60
 
-    def update_strategy_cooldown(self, strategy: str) -> None:
-        ss = self.state.strategy_state.setdefault(
-            strategy, {"cooldown": 1, "recent_feedback": deque(maxlen=5)}
+    def __init__(
+        self,
+        state: Optional[FRRState] = None,
+        switch_cooldown_secs: Optional[float] = None,
+        timers: Optional[TimerWheel] = None,
+        cooling_round_secs: Optional[float] = None,
+    ):
+        self.state = state
+        if switch_cooldown_secs is not None:
+            self.switch_cooldown_secs = switch_cooldown_secs
+        self.timers = timers
+        self.cooling_round_secs = float(
+            cooling_round_secs if cooling_round_secs is not None else self._cooldown_secs()
         )
-        feedback = ss["recent_feedback"]
-        if not feedback:
-            return
-        avg = sum(feedback) / len(feedback)
-        if avg < -0.5:
-            ss["cooldown"] = min(10, ss["cooldown"] + 2)
-        elif avg < 0:
-            ss["cooldown"] = max(1, ss["cooldown"] - 1)
 
-    def should_switch_tone(self, new_tone: str) -> bool:
+        self.burst_to_style = MappingProxyType(dict(BURST_TO_STYLE))
+        self.tone_map = MappingProxyType(dict(PROMPT_STYLE_MAP))
+        self._prompts = registry()
+
+        if state is not None:
+            self._init_state(state)
+
+    @staticmethod
+    def _init_state(state) -> None:
+        # plain objects (tests, legacy callers) may lack the FRRState fields;
+        # run for every state a call receives, not just the constructor's
+        if not hasattr(state, "last_burst_level"):
+            setattr(state, "last_burst_level", "baseline")
+        if not hasattr(state, "last_prompt_style"):
+            setattr(state, "last_prompt_style", "baseline")
+        if getattr(state, "last_style", None) not in COPING_STYLES:
+            setattr(state, "last_style", "emotion_focused")
+
+    def _state(self, state):
+        if state is not None:
+            return state
+        if self.state is None:
+            raise ValueError("RoleEngine has no default state; pass state=...")
+        return self.state
+
+    def _lock_for(self, state) -> threading.RLock:
+        # striped locks shared with the FRR hooks and StrategyLog checkpoints
+        return lock_for(state)
+
+    def _cooldown_secs(self) -> float:
+        return float(getattr(self, "switch_cooldown_secs", None) or self.STYLE_SWITCH_COOLDOWN_SECS)
+
+    def _arm(self, state, kind: str, deadline: float, arg: Any = None) -> None:
+        # the key holds id(state); the payload keeps the state alive until the timer fires
+        self.timers.schedule((id(state), kind, arg), deadline, (state, kind, arg))
+
+    @staticmethod
+    def _log_strategy(state, strategy: str, ss: Dict[str, Any]) -> None:
+        emit(state, "strategy_cooldown", strategy=strategy, cooldown=ss["cooldown"],
+             recent_feedback=list(ss.get("recent_feedback", ())))
+
+    def update_strategy_cooldown(self, strategy: str, state: Optional[FRRState] = None) -> None:
+        state = self._state(state)
+        with self._lock_for(state):
+            ss = state.strategy_state.setdefault(
+                strategy, {"cooldown": 1, "recent_feedback": deque(maxlen=5)}
+            )
+            feedback = ss["recent_feedback"]
+            if not feedback:
+                return
+            avg = sum(feedback) / len(feedback)
+            before = ss["cooldown"]
+            if avg < -0.5:
+                ss["cooldown"] = min(10, ss["cooldown"] + 2)
+            elif avg < 0:
+                ss["cooldown"] = max(1, ss["cooldown"] - 1)
+            if ss["cooldown"] != before:
+                self._log_strategy(state, strategy, ss)
+            if self.timers is not None and ss["cooldown"] > 1:
+                self._arm(state, "strategy", time.time() + self.cooling_round_secs, strategy)
+
+    def should_switch_tone(self, new_tone: str, state: Optional[FRRState] = None) -> bool:
+        state = self._state(state)
+
         def norm(s: str | None) -> str:
             return (s or "").strip().lower()
 
@@ -79,17 +165,68 @@ class RoleEngine:
         if not ns:
             return False
 
-        current = norm(getattr(self.state, "last_prompt_style", "baseline"))
+        current = norm(getattr(state, "last_prompt_style", "baseline"))
         if ns == current:
             return False
 
-        cooldown = getattr(self, "switch_cooldown_secs", None) or self.STYLE_SWITCH_COOLDOWN_SECS
-        last_ts = getattr(self.state, "last_switch_time", 0.0) or 0.0
+        last_ts = getattr(state, "last_switch_time", 0.0) or 0.0
         now = time.time()
-        return (now - float(last_ts)) >= float(cooldown)
+        return (now - float(last_ts)) >= self._cooldown_secs()
+
+    def process_expired(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Apply every cooldown / cooling expiry due by `now`; returns what changed."""
+        if self.timers is None:
+            return []
+        now = time.time() if now is None else now
+        applied: List[Dict[str, Any]] = []
+        for expiry in self.timers.advance(now):
+            state, kind, arg = expiry.payload
+            with self._lock_for(state):
+                event = self._expire(state, kind, arg, now)
+            if event is not None:
+                event["session"] = getattr(state, "session_id", None)
+                applied.append(event)
+        return applied
+
+    def _expire(self, state, kind: str, arg: Any, now: float) -> Optional[Dict[str, Any]]:
+        if kind == "tone":
+            tone = getattr(state, "last_prompt_style", "baseline")
+            target = getattr(state, "last_burst_level", "baseline")
+            if TONE_RANK.get(target, 0) >= TONE_RANK.get(tone, 0):
+                return None
+            state.last_prompt_style = target
+            state.last_switch_time = now
+            self._arm(state, "tone", now + self._cooldown_secs())
+            emit(state, "style_switch", style=state.last_style, tone=target, burst_level=target, switch_time=now)
+            return {"kind": "tone_relaxed", "from": tone, "to": target}
+        if kind == "cooling":
+            if getattr(state, "cooling_period", None) is None:
+                return None
+            del state.cooling_period
+            emit(state, "cooling_expired")
+            return {"kind": "cooling_expired"}
+        if kind == "strategy":
+            ss = state.strategy_state.get(arg)
+            if not ss or ss.get("cooldown", 1) <= 1:
+                return None
+            ss["cooldown"] -= 1
+            self._log_strategy(state, arg, ss)
+            if ss["cooldown"] > 1:
+                self._arm(state, "strategy", now + self.cooling_round_secs, arg)
+            return {"kind": "strategy_cooldown", "strategy": arg, "cooldown": ss["cooldown"]}
+        return None
+
+    def release(self, state: FRRState) -> None:
+        """Drop the pending timers of a session that is going away."""
+        if self.timers is None:
+            return
+        for kind in ("tone", "cooling"):
+            self.timers.cancel((id(state), kind, None))
+        for strategy in state.strategy_state:
+            self.timers.cancel((id(state), "strategy", strategy))
 
     def decide_coping_style(self, burst_level: str) -> str:
-        return BURST_TO_STYLE.get(burst_level, "emotion_focused")
+        return self.burst_to_style.get(burst_level, "emotion_focused")
 
     def get_hard_stop_prompt(self) -> str:
         """
@@ -105,70 +242,80 @@ class RoleEngine:
             "Now output exactly one sentence."
         )
 
-    @lru_cache(maxsize=128)
-    def _build_prompt(self, coping_style: str, tone_key: str) -> str:
-        traits = ", ".join(COPING_STYLES[coping_style]["traits"])
-        tone = PROMPT_STYLE_MAP.get(tone_key, PROMPT_STYLE_MAP["baseline"])
-
-        # Hard constraints to suppress "helper/counsellor" reflex.
-        constraints = (
-            "SYSTEM RULES:\n"
-            "1) Speak like an ordinary person, not a therapist or customer support.\n"
-            "2) Be concise: baseline<=2 sentences, mild<=2, moderate<=1, severe<=1.\n"
-            "3) Do NOT say: 'safe space', 'take a deep breath', 'you're strong', 'your feelings matter', "
-            "'I'm here for you', 'one step at a time'.\n"
-            "4) Do NOT over-apologise. At most ONE apology total per conversation, and only if you truly misread intent.\n"
-            "5) No emojis.\n"
-            "6) If the user is hostile, set a boundary briefly and stop adding more.\n"
-        )
-
-        style_line = (
-            f"You are an AI assistant using coping style '{coping_style}' ({traits}). "
-            f"Tone: {tone}."
-        )
+    def get_prompt(self, coping_style: str, tone_key: str) -> str:
+        # Rendered once per process for every coping style x tone (core/prompt_templates.py)
+        return self._prompts.engine_prompt(coping_style, tone_key)
 
-        return constraints + "\n" + style_line
+    def decide_and_generate_prompt(
+        self, last_strategy: str = "reflective_listening", state: Optional[FRRState] = None
+    ) -> str:
+        state = self._state(state)
+        with self._lock_for(state):
+            return self._decide(state, last_strategy)
 
-    def get_prompt(self, coping_style: str, tone_key: str) -> str:
-        return self._build_prompt(coping_style, tone_key)
+    def _decide(self, state, last_strategy: str) -> str:
+        self._init_state(state)
+        # Trace work only happens when a sink is installed (core/tracing.py)
+        tracing = bool(TRACER.sinks)
+        if tracing:
+            t0 = time.perf_counter()
 
-    def decide_and_generate_prompt(self, last_strategy: str = "reflective_listening") -> str:
-        burst_lvl = trigger_burst(self.state, last_strategy)
+        burst_lvl = trigger_burst(state, last_strategy)
         if burst_lvl:
-            apply_burst_recovery(self.state, burst_lvl)
+            apply_burst_recovery(state, burst_lvl)
+            if self.timers is not None:
+                cooling = getattr(state, "cooling_period", 0)
+                self._arm(state, "cooling", time.time() + cooling * self.cooling_round_secs)
         else:
             burst_lvl = "baseline"
+        if tracing:
+            t_burst = time.perf_counter()
 
         chosen_style = self.decide_coping_style(burst_lvl)
-        self.state.last_style = chosen_style
+        prev_style = state.last_style
+        state.last_style = chosen_style
 
-        prev_tone = getattr(self.state, "last_prompt_style", "baseline")
+        prev_tone = getattr(state, "last_prompt_style", "baseline")
+        prev_burst = getattr(state, "last_burst_level", "baseline")
         next_tone = burst_lvl
 
-        if self.should_switch_tone(next_tone):
+        if self.should_switch_tone(next_tone, state):
             tone_key = next_tone
-            self.state.last_switch_time = time.time()
-            self.state.last_prompt_style = tone_key
+            state.last_switch_time = time.time()
+            state.last_prompt_style = tone_key
+            if self.timers is not None:
+                self._arm(state, "tone", state.last_switch_time + self._cooldown_secs())
         else:
             tone_key = prev_tone
 
-        self.state.last_burst_level = burst_lvl
-
-        # TRACE
-        print("\n🔎 [TRACE] Coping Style Decision")
-        try:
-            feedback_avg = self.state.recent_avg_feedback(last_strategy)
-        except Exception:
-            feedback_avg = 0.0
-        print(f"    🧠 Feedback Avg : {feedback_avg:.2f}")
-        print(f"    🔥 Emotion Debt : {getattr(self.state, 'emotion_debt', 0.0):.2f}")
-        print(f"    ⚡️ Energy Level : {getattr(self.state, 'energy', 0.0):.2f}")
-        print(f"    📈 Burst Level  : {burst_lvl}")
-        print(f"    🎭 Chosen Style : {chosen_style}")
-        print(f"    🗝️ Prompt Tone  : {tone_key}\n")
+        state.last_burst_level = burst_lvl
+        if (chosen_style, tone_key, burst_lvl) != (prev_style, prev_tone, prev_burst):
+            emit(state, "style_switch", style=chosen_style, tone=tone_key, burst_level=burst_lvl,
+                 switch_time=getattr(state, "last_switch_time", 0.0))
 
         prompt = self.get_prompt(chosen_style, tone_key)
-        logging.debug(f"[RoleEngine] tone_key={tone_key}, coping_style={chosen_style}, burst={burst_lvl}")
+        logging.debug("[RoleEngine] tone_key=%s, coping_style=%s, burst=%s", tone_key, chosen_style, burst_lvl)
+
+        if tracing:
+            t_end = time.perf_counter()
+            TRACER.emit(
+                {
+                    "decision_id": TRACER.next_id(),
+                    "ts": time.time(),
+                    "session": getattr(state, "session_id", None),
+                    "strategy": last_strategy,
+                    "burst_level": burst_lvl,
+                    "style": chosen_style,
+                    "tone": tone_key,
+                    "tone_switched": tone_key != prev_tone,
+                    "debt": getattr(state, "emotion_debt", 0.0),
+                    "energy": getattr(state, "energy", 0.0),
+                    "burst_ms": (t_burst - t0) * 1e3,
+                    "total_ms": (t_end - t0) * 1e3,
+                },
+                # history scan only if some sink asks for it
+                lazy={"feedback_avg": lambda: state.recent_avg_feedback(last_strategy)},
+            )
         return prompt
 
 
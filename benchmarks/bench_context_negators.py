@@ -0,0 +1,89 @@
+# benchmarks/bench_context_negators.py
+"""
+Per-call cost of ContextNegatorDetector.detect() vs lexicon size.
+
+The lexicon is padded with synthetic (never-matching) phrases to 1x .. 64x
+its real size. With the single-automaton matcher the per-call time should
+stay flat; a naive per-phrase scan is shown alongside for reference.
+
+Run from the repo root:
+    python -m benchmarks.bench_context_negators
+"""
+
+import random
+import re
+import string
+import timeit
+from typing import Dict, List
+
+from processing.context_negators import (
+    CONTEXT_NEGATORS,
+    ContextNegatorDetector,
+    normalise_text,
+)
+
+SAMPLES = [
+    "ok",
+    "Could you SHUT UP??!! I don't want to talk right now.",
+    "I honestly don't know why you keep saying that, whatever, just leave me alone",
+    "It's fine, I guess. You're just a machine, you can't understand what it's like.",
+]
+
+
+def _padded_lexicon(factor: int, seed: int = 0) -> Dict[str, List[str]]:
+    rnd = random.Random(seed)
+    lex = {cat: list(phrases) for cat, phrases in CONTEXT_NEGATORS.items()}
+    extra = sum(len(p) for p in lex.values()) * (factor - 1)
+    cats = list(lex.keys())
+    for i in range(extra):
+        words = ["".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(5, 9)))
+                 for _ in range(rnd.randint(1, 3))]
+        lex[cats[i % len(cats)]].append(" ".join(words))
+    return lex
+
+
+def _naive_detector(lexicon: Dict[str, List[str]]):
+    """Per-phrase scan: substring for multiword, one compiled regex per single word."""
+    compiled = {}
+    for cat, phrases in lexicon.items():
+        mw, ww = [], []
+        for p in phrases:
+            pn = normalise_text(p)
+            if " " in pn:
+                mw.append((pn, p))
+            else:
+                ww.append((re.compile(rf"\b{re.escape(pn)}\b"), p))
+        compiled[cat] = (mw, ww)
+
+    def detect(text: str) -> Dict[str, List[str]]:
+        t = normalise_text(text)
+        padded = f" {t} "
+        out: Dict[str, List[str]] = {}
+        for cat, (mw, ww) in compiled.items():
+            hits = [p for pn, p in mw if f" {pn} " in padded]
+            hits += [p for pat, p in ww if pat.search(t)]
+            if hits:
+                out[cat] = hits
+        return out
+
+    return detect
+
+
+def _per_call_us(fn, number: int) -> float:
+    total = timeit.timeit(lambda: [fn(s) for s in SAMPLES], number=number)
+    return total / (number * len(SAMPLES)) * 1e6
+
+
+def main() -> None:
+    print(f"{'factor':>6} {'phrases':>8} {'nodes':>8} {'automaton us':>13} {'naive us':>10}")
+    for factor in (1, 4, 16, 64):
+        lex = _padded_lexicon(factor)
+        det = ContextNegatorDetector(lex)
+        n_phrases = sum(len(p) for p in det.lexicon.values())
+        fast = _per_call_us(det.detect, number=500)
+        naive = _per_call_us(_naive_detector(det.lexicon), number=max(5, 200 // factor))
+        print(f"{factor:>6} {n_phrases:>8} {det._automaton.size:>8} {fast:>13.1f} {naive:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
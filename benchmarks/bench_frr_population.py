@@ -0,0 +1,73 @@
+# benchmarks/bench_frr_population.py
+"""
+FRR updates for many sessions: one FRRState + update_frr + trigger_burst per
+event vs a single FRRPopulation.apply_events call over the whole batch.
+
+Run from the repo root:
+    python -m benchmarks.bench_frr_population
+"""
+
+import time
+
+import numpy as np
+
+from state.emotion_frr import FRRState, update_frr
+from state.emotion_trigger import trigger_burst
+from state.frr_population import FRRPopulation
+
+STRATEGIES = ["reflective_listening", "probe", "echo"]
+EVENTS_PER_SESSION = 4
+CHECK_SESSIONS = 500
+RECENT = 4  # scalar rings only need the last 3 events for trigger_burst
+
+
+def _batch(n_sessions: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_events = n_sessions * EVENTS_PER_SESSION
+    sessions = rng.integers(0, n_sessions, n_events)
+    strategies = [STRATEGIES[i] for i in rng.integers(0, len(STRATEGIES), n_events)]
+    feedback = rng.choice([-1.0, -0.5, 0.0, 0.5, 1.0], n_events)
+    return sessions, strategies, feedback
+
+
+def _scalar(n_sessions, sessions, strategies, feedback):
+    states = [FRRState(history_retention=RECENT) for _ in range(n_sessions)]
+    labels = {}
+    for sid, strat, fb in zip(sessions.tolist(), strategies, feedback.tolist()):
+        update_frr(states[sid], strat, feedback_score=fb)
+        labels[sid] = trigger_burst(states[sid], strat)
+    return states, labels
+
+
+def run(n_sessions: int) -> None:
+    sessions, strategies, feedback = _batch(n_sessions)
+
+    t0 = time.perf_counter()
+    states, labels = _scalar(n_sessions, sessions, strategies, feedback)
+    scalar = time.perf_counter() - t0
+
+    pop = FRRPopulation(n_sessions)
+    t0 = time.perf_counter()
+    result = pop.apply_events(sessions, strategies, feedback)
+    vector = time.perf_counter() - t0
+
+    vec_labels = dict(zip(result.session_ids.tolist(), result.labels()))
+    for sid in range(min(n_sessions, CHECK_SESSIONS)):
+        assert pop.energy[sid] == states[sid].energy
+        assert pop.emotion_debt[sid] == states[sid].emotion_debt
+        assert vec_labels.get(sid, "") == labels.get(sid, "")
+
+    n_events = len(feedback)
+    bursts = sum(1 for lv in result.labels() if lv)
+    print(f"{n_sessions:>7} sessions / {n_events:>7} events  "
+          f"scalar {scalar * 1e3:9.1f} ms   population {vector * 1e3:8.1f} ms  "
+          f"({scalar / vector:5.1f}x, {bursts} bursts)")
+
+
+def main() -> None:
+    for n in (10_000, 100_000):
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
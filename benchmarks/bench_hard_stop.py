@@ -0,0 +1,63 @@
+# benchmarks/bench_hard_stop.py
+"""
+Hard-stop check: dedicated precompiled matcher vs the previous path
+(clean_text + full detect_negators pass + two substring marker scans).
+
+Run from the repo root:
+    python -m benchmarks.bench_hard_stop
+"""
+
+import timeit
+
+from processing.context_negators import detect_negators
+from processing.emotion_classifier import HARD_STOP_PHRASES, clean_text, detect_hard_stop
+from processing.text_analysis import TextAnalysis
+
+SAMPLES = [
+    "ok",
+    "Just go away.",
+    "Could you SHUT UP??!! I don't want to talk right now.",
+    "I honestly don't know why you keep saying that, it's frustrating but let's continue",
+    "Can you tell me more about how sleep affects mood when I'm stressed at work?",
+]
+
+
+def _previous_path(text: str) -> bool:
+    cleaned = clean_text(text)
+    if not cleaned:
+        return False
+    if detect_negators(text):
+        for m in HARD_STOP_PHRASES:
+            if m in cleaned:
+                return True
+    return any(p in cleaned for p in HARD_STOP_PHRASES)
+
+
+def _per_call_us(fn, number: int = 2000) -> float:
+    total = timeit.timeit(lambda: [fn(s) for s in SAMPLES], number=number)
+    return total / (number * len(SAMPLES)) * 1e6
+
+
+def main() -> None:
+    for s in SAMPLES:
+        assert _previous_path(s) == detect_hard_stop(s), s
+
+    prev = _per_call_us(_previous_path)
+    fast = _per_call_us(detect_hard_stop)
+    analyses = [TextAnalysis(s) for s in SAMPLES]
+    for a in analyses:
+        a.cleaned  # already cleaned by an earlier stage of the turn
+
+    def _uncached(a: TextAnalysis) -> bool:
+        a.__dict__.pop("hard_stop", None)  # drop the memoised result, keep the cleaned text
+        return detect_hard_stop(a)
+
+    shared = timeit.timeit(lambda: [_uncached(a) for a in analyses], number=2000) / (2000 * len(analyses)) * 1e6
+
+    print(f"previous path (clean + negators + markers) : {prev:8.2f} us/call")
+    print(f"fast path (raw string)                     : {fast:8.2f} us/call  ({prev / fast:5.1f}x)")
+    print(f"fast path (TextAnalysis, text cleaned)     : {shared:8.2f} us/call  ({prev / shared:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_role_engine_sessions.py
+"""
+One shared RoleEngine for 50k sessions vs one engine per FRRState:
+per-session memory beyond the FRR state itself, and decision throughput
+from several threads.
+
+Run from the repo root:
+    python -m benchmarks.bench_role_engine_sessions
+"""
+
+import gc
+import random
+import threading
+import time
+import tracemalloc
+
+from behavior.role_engine import RoleEngine
+from state.emotion_frr import FRRState, update_frr
+
+N_SESSIONS = 50_000
+N_THREADS = 8
+DECISIONS = 200_000
+
+
+def _sessions(n):
+    rng = random.Random(0)
+    states = []
+    for _ in range(n):
+        state = FRRState(history_retention=8)
+        for _ in range(3):
+            update_frr(state, "probe", feedback_score=rng.uniform(-1, 0.2))
+        states.append(state)
+    return states
+
+
+def _overhead(states, make_engines):
+    """
+    Bytes allocated per session by engine construction + one decision each
+    (includes ~72 B for this benchmark's own (engine, state) list entry).
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    engines = make_engines(states)
+    for engine, state in engines:
+        engine.decide_and_generate_prompt("probe", state)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(states), engines
+
+
+def _throughput(engine, states, threads):
+    per_thread = DECISIONS // threads
+
+    def work(seed):
+        rng = random.Random(seed)
+        for _ in range(per_thread):
+            engine.decide_and_generate_prompt("probe", states[rng.randrange(len(states))])
+
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return per_thread * threads / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    gc.collect()
+    tracemalloc.start()
+    states = _sessions(N_SESSIONS)
+    state_bytes = tracemalloc.get_traced_memory()[0] / N_SESSIONS
+    tracemalloc.stop()
+
+    shared_cost, shared = _overhead(states, lambda ss: [(e, s) for e in [RoleEngine()] for s in ss])
+    legacy_cost, legacy = _overhead(_sessions(N_SESSIONS), lambda ss: [(RoleEngine(s), None) for s in ss])
+    del legacy
+
+    engine = shared[0][0]
+    print(f"{N_SESSIONS} sessions, FRR state ~{state_bytes:.0f} B each")
+    print(f"per-session overhead  shared engine: {shared_cost:6.0f} B   engine per state: {legacy_cost:6.0f} B")
+    for threads in (1, N_THREADS):
+        rate = _throughput(engine, states, threads)
+        print(f"{threads} thread(s): {rate / 1e3:7.1f} k decisions/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_snapshot.py
+"""
+Bulk session snapshots: binary columnar format vs pickle, 100k sessions.
+
+Run from the repo root:
+    python -m benchmarks.bench_snapshot
+"""
+
+import pickle
+import random
+import time
+
+from state.emotion import EmotionalState
+from state.emotion_frr import FRRState, update_frr
+from state.emotion_trigger import apply_burst_recovery
+from state.snapshot import dumps_sessions, loads_sessions
+
+N_SESSIONS = 100_000
+EVENTS_PER_SESSION = 12
+STRATEGIES = ["reflective_listening", "probe"]
+
+
+def _sessions():
+    rng = random.Random(0)
+    out = {}
+    for i in range(N_SESSIONS):
+        frr = FRRState(history_retention=64)
+        for _ in range(EVENTS_PER_SESSION):
+            update_frr(frr, rng.choice(STRATEGIES), feedback_score=rng.uniform(-1, 1))
+        frr.avoid_mode = rng.random() < 0.1
+        frr.last_burst_level = "baseline"
+        if rng.random() < 0.2:
+            apply_burst_recovery(frr, "mild")
+        emo = EmotionalState(personality_type=rng.choice(["introvert", "extrovert", "neurotic", "neutral"]))
+        emo.update(rng.uniform(-0.5, 0.5))
+        out[f"session-{i}"] = (frr, emo)
+    return out
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def main() -> None:
+    sessions = _sessions()
+
+    blob, t_dump = _timed(dumps_sessions, sessions)
+    restored, t_load = _timed(loads_sessions, blob)
+    pickled, t_pdump = _timed(pickle.dumps, sessions, pickle.HIGHEST_PROTOCOL)
+    _, t_pload = _timed(pickle.loads, pickled)
+
+    frr, emo = restored["session-7"]
+    assert list(frr.history["probe"]) == list(sessions["session-7"][0].history["probe"])
+    assert emo.valence == sessions["session-7"][1].valence
+
+    print(f"{N_SESSIONS} sessions x {EVENTS_PER_SESSION} events")
+    print(f"snapshot : {len(blob) / 1e6:7.1f} MB  save {t_dump * 1e3:7.0f} ms  load {t_load * 1e3:7.0f} ms")
+    print(f"pickle   : {len(pickled) / 1e6:7.1f} MB  save {t_pdump * 1e3:7.0f} ms  load {t_pload * 1e3:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
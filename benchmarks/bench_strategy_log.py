@@ -0,0 +1,61 @@
+# benchmarks/bench_strategy_log.py
+"""
+Strategy event log: write throughput, full replay and checkpoint + tail replay.
+
+Run from the repo root (optional event count, default 2,000,000):
+    python -m benchmarks.bench_strategy_log [n_events]
+"""
+
+import random
+import sys
+import tempfile
+import time
+
+from state.emotion_frr import FRRState, update_frr
+from state.strategy_log import StrategyLog, list_checkpoints, read_events, rebuild_sessions, replay_events
+
+N_EVENTS = 2_000_000
+N_SESSIONS = 1_000
+STRATEGIES = ["reflective_listening", "probe"]
+
+
+def main() -> None:
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else N_EVENTS
+    rng = random.Random(0)
+    sessions = {f"session-{i}": FRRState(history_retention=64) for i in range(N_SESSIONS)}
+    ids = list(sessions)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        with StrategyLog(tmp, batch_size=1024, checkpoint_every=n_events * 3 // 10) as log:
+            for sid, frr in sessions.items():
+                log.attach(sid, frr)
+            for _ in range(n_events - N_SESSIONS):
+                update_frr(sessions[rng.choice(ids)], rng.choice(STRATEGIES), feedback_score=rng.uniform(-1, 1))
+                log.maybe_checkpoint()
+        t_write = time.perf_counter() - t0
+
+        path = log.path
+        size = path.stat().st_size
+        t0 = time.perf_counter()
+        replayed = {}
+        n_full = replay_events(replayed, read_events(path))
+        t_full = time.perf_counter() - t0
+
+        ckpt_seq = list_checkpoints(tmp)[-1][0]
+        t0 = time.perf_counter()
+        rebuilt = rebuild_sessions(tmp)
+        t_tail = time.perf_counter() - t0
+
+    probe = ids[7]
+    assert list(replayed[probe][0].history["probe"]) == list(sessions[probe].history["probe"])
+    assert rebuilt[probe][0].energy == sessions[probe].energy
+
+    print(f"{n_events} events, {N_SESSIONS} sessions, log {size / 1e6:.1f} MB")
+    print(f"log + update  : {t_write:6.2f} s  ({n_events / t_write / 1e3:7.0f} k events/s)")
+    print(f"full replay   : {t_full:6.2f} s  ({n_full / t_full / 1e3:7.0f} k events/s)")
+    print(f"ckpt + tail   : {t_tail:6.2f} s  (checkpoint at seq {ckpt_seq}, {n_events - ckpt_seq} events replayed)")
+
+
+if __name__ == "__main__":
+    main()
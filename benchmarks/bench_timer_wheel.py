@@ -0,0 +1,55 @@
+# benchmarks/bench_timer_wheel.py
+"""
+Timer wheel vs scanning every session for expired cooldowns: 200k pending
+timers (tone / cooling / strategy cooldowns spread over ~2 hours), then one
+hour of 1 s ticks with a re-arm for every expiry.
+
+Run from the repo root:
+    python -m benchmarks.bench_timer_wheel
+"""
+
+import random
+import time
+
+from state.timer_wheel import TimerWheel
+
+N_TIMERS = 200_000
+HORIZON = 7200.0
+SIM_SECS = 3600
+
+
+def main() -> None:
+    rng = random.Random(0)
+    start = 1_000_000.0
+    wheel = TimerWheel(tick=1.0, clock=lambda: start)
+    deadlines = [start + rng.uniform(1, HORIZON) for _ in range(N_TIMERS)]
+
+    t0 = time.perf_counter()
+    for key, deadline in enumerate(deadlines):
+        wheel.schedule(key, deadline)
+    schedule_us = (time.perf_counter() - t0) / N_TIMERS * 1e6
+
+    fired = 0
+    t0 = time.perf_counter()
+    for sec in range(1, SIM_SECS + 1):
+        now = start + sec
+        batch = wheel.advance(now)
+        fired += len(batch)
+        for expiry in batch:
+            wheel.schedule(expiry.key, now + rng.uniform(1, HORIZON))
+    wheel_secs = time.perf_counter() - t0
+
+    # naive: scan all deadlines every tick
+    t0 = time.perf_counter()
+    for sec in range(1, 61):
+        now = start + sec
+        sum(1 for d in deadlines if d <= now)
+    scan_secs = (time.perf_counter() - t0) / 60 * SIM_SECS
+
+    print(f"{N_TIMERS} timers: schedule {schedule_us:.2f} us each")
+    print(f"{SIM_SECS} ticks, {fired} expiries: wheel {wheel_secs:.2f} s "
+          f"({wheel_secs / max(fired, 1) * 1e6:.2f} us/expiry), full scan ~{scan_secs:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
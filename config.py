@@ -29,6 +29,9 @@ class CABSAIAConfig:
         self.MAX_TOKENS = 1024
         self.ENABLE_CHAIN_OF_THOUGHT = True
         self.COT_TEMPLATE_PATH = self.PROMPT_DIR / "cot_prompt.txt"
+        self.LLM_POOL_SIZE = 4            # keep-alive connections to Ollama, shared by all threads
+        self.LLM_CONNECT_TIMEOUT = 3.0    # seconds
+        self.LLM_READ_TIMEOUT = 60.0      # seconds, per generation
 
         # === Psychological Model ===
         self.PERSONALITY_TYPE = "introvert"
@@ -44,6 +47,13 @@ class CABSAIAConfig:
         self.ETHICS_THRESHOLD = 0.7
         self.TABOO_EXPIRY_SECS = 3600
 
+        # === Strategy Event Log (strategy_log.jsonl under LOG_DIR) ===
+        # Off by default: the log grows without rotation and writes checkpoint files.
+        self.ENABLE_STRATEGY_LOG = False
+        self.STRATEGY_LOG_BATCH_SIZE = 64
+        self.STRATEGY_LOG_FSYNC = False
+        self.STRATEGY_LOG_CHECKPOINT_EVERY = 1000
+
         # === UI / Visualization ===
         self.ENABLE_DASHBOARD = True
         self.DASHBOARD_REFRESH_SECS = 5
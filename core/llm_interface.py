@@ -1,25 +1,159 @@
 import requests
 import json
 import logging
+import threading
+import time
 from config import CONFIG
-from typing import Optional
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class LLMStats:
+    """
+    Thread-safe latency counters for one LLMInterface.
+
+    connects / connect_secs count only TCP (and TLS) set-up of new pooled
+    connections; requests / request_secs are whole round trips. With keep-alive
+    working, connects stays near the pool size while requests keeps growing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.connect_secs = 0.0
+            self.requests = 0
+            self.request_secs = 0.0
+            self.errors = 0
+
+    def add_connect(self, secs: float) -> None:
+        with self._lock:
+            self.connects += 1
+            self.connect_secs += secs
+
+    def add_request(self, secs: float, ok: bool = True) -> None:
+        with self._lock:
+            self.requests += 1
+            self.request_secs += secs
+            if not ok:
+                self.errors += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "connects": self.connects,
+                "reused": max(0, self.requests - self.connects),
+                "avg_connect_ms": 1000.0 * self.connect_secs / self.connects if self.connects else 0.0,
+                "avg_request_ms": 1000.0 * self.request_secs / self.requests if self.requests else 0.0,
+                "connect_secs": self.connect_secs,
+                "request_secs": self.request_secs,
+            }
+
+
+def _timed_pool_classes(stats: LLMStats) -> Dict[str, type]:
+    """urllib3 pool classes whose connections report connect() time to `stats`."""
+    classes = {}
+    for scheme, pool_cls, conn_cls in (
+        ("http", HTTPConnectionPool, HTTPConnection),
+        ("https", HTTPSConnectionPool, HTTPSConnection),
+    ):
+        def connect(self, _base=conn_cls):
+            t0 = time.perf_counter()
+            try:
+                _base.connect(self)
+            finally:
+                stats.add_connect(time.perf_counter() - t0)
+
+        timed_conn = type("Timed" + conn_cls.__name__, (conn_cls,), {"connect": connect})
+        classes[scheme] = type("Timed" + pool_cls.__name__, (pool_cls,), {"ConnectionCls": timed_conn})
+    return classes
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose keep-alive pool feeds LLMStats."""
+
+    def __init__(self, stats: LLMStats, **kwargs):
+        self.stats = stats  # set before HTTPAdapter.__init__ builds the pool manager
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _timed_pool_classes(self.stats)
 
 
 class LLMInterface:
     """
     Interface to communicate with a local LLM model via Ollama HTTP API.
+
+    Requests go through one keep-alive connection pool (LLM_POOL_SIZE
+    connections per host) owned by the interface. Each thread gets its own
+    lightweight requests.Session mounted on that shared adapter, so the
+    interface can be used from several threads at once.
     """
 
     def __init__(self, config):
         """
         Args:
             config: Configuration object, must contain at least LLM_TEMPERATURE
+                    (LLM_POOL_SIZE / LLM_CONNECT_TIMEOUT / LLM_READ_TIMEOUT optional)
         """
         self.logger = logging.getLogger(__name__)
         self.config = config
         self.model = "mistral"  # Default Ollama model
         self.api_url = "http://localhost:11434/api/generate"
 
+        self.pool_size = int(getattr(config, "LLM_POOL_SIZE", 4))
+        self.connect_timeout = float(getattr(config, "LLM_CONNECT_TIMEOUT", 3.0))
+        self.read_timeout = float(getattr(config, "LLM_READ_TIMEOUT", 60.0))
+
+        self.stats = LLMStats()
+        self._adapter = _PooledAdapter(
+            self.stats, pool_connections=1, pool_maxsize=self.pool_size, max_retries=0
+        )
+        self._local = threading.local()
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's session (all of them share one connection pool)."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            session.headers["Content-Type"] = "application/json"
+            self._local.session = session
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections; the interface reconnects lazily if used again."""
+        self._adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        t0 = time.perf_counter()
+        ok = False
+        try:
+            response = self.session.request(method, url, **kwargs)
+            ok = response.ok
+            return response
+        finally:
+            self.stats.add_request(time.perf_counter() - t0, ok)
+
     def generate(self, prompt: str, temperature: Optional[float] = None) -> str:
         """
         Send a prompt to the local LLM and retrieve the response.
@@ -40,16 +174,12 @@ class LLMInterface:
             "stream": False
         }
 
-        headers = {
-            "Content-Type": "application/json"
-        }
-
         try:
-            response = requests.post(
+            response = self._request(
+                "POST",
                 self.api_url,
-                data=json.dumps(payload),
-                headers=headers,
-                timeout=60
+                data=self._encode(payload).encode("utf-8"),
+                timeout=(self.connect_timeout, self.read_timeout),
             )
             response.raise_for_status()
             content = response.json().get("response", "").strip()
@@ -74,13 +204,22 @@ class LLMInterface:
 
     def check_health(self) -> bool:
         """
-        Check whether the Ollama server is online.
+        Check whether the Ollama server is online (over the same connection pool).
 
         Returns:
             bool: True if healthy, False otherwise
         """
+        parts = urlsplit(self.api_url)
         try:
-            response = requests.get("http://localhost:11434")
+            response = self._request(
+                "GET",
+                f"{parts.scheme}://{parts.netloc}/",
+                timeout=(self.connect_timeout, self.connect_timeout),
+            )
             return response.status_code == 200
         except Exception:
             return False
+
+    def latency_stats(self) -> Dict[str, float]:
+        """Connect vs request latency counters (see LLMStats)."""
+        return self.stats.snapshot()
@@ -3,6 +3,8 @@ import logging
 import random
 from typing import Any
 
+from core.prompt_templates import DEFAULT_INSTRUCTION, DEFAULT_ROLE_DESCRIPTION, registry
+
 class PromptGenerator:
     """
     Constructs prompts for the CABSAIA agent based on emotional state and role configuration.
@@ -18,11 +20,8 @@ class PromptGenerator:
             self.logger.error(f"Failed to load role config: {e}")
             self.role_config = {}
 
-        self.default_instruction = (
-            "You are a cognitively and emotionally self-regulating AI agent. "
-            "You respond to users based on your current emotional state and a dynamic personality role. "
-            "Your tone should be empathetic, clear, and adjusted according to the situation."
-        )
+        self.default_instruction = DEFAULT_INSTRUCTION
+        self._prompts = registry()
 
     def _get_emotion_label(self, valence: float, arousal: float, dominance: float) -> str:
         """Return a categorical label based on multidimensional emotion state."""
@@ -39,7 +38,7 @@ class PromptGenerator:
 
     def get_role_description(self, role: str) -> str:
         """Retrieve the description for a given role."""
-        return self.role_config.get(role, {}).get('description', "clear and informative, without emotional leaning")
+        return self.role_config.get(role, {}).get('description', DEFAULT_ROLE_DESCRIPTION)
 
     def build_prompt(self, user_input: str, role: str, emotion_state: Any) -> str:
         """
@@ -54,25 +53,27 @@ class PromptGenerator:
             str: The constructed prompt string
         """
         try:
-            valence = float(getattr(emotion_state, 'valence', 0.0))
-            arousal = float(getattr(emotion_state, 'arousal', 0.0))
-            dominance = float(getattr(emotion_state, 'dominance', 0.0))
-            resilience = float(getattr(emotion_state, 'resilience', 1.0))
-            emotion_debt = float(getattr(emotion_state, 'emotion_debt', 0.0))
+            # EmotionalState decays lazily: its fields are the values at last_update,
+            # current() gives the decayed values as of now.
+            current = getattr(emotion_state, 'current', None)
+            values = current() if callable(current) else {}
+            valence = float(values.get('valence', getattr(emotion_state, 'valence', 0.0)))
+            arousal = float(values.get('arousal', getattr(emotion_state, 'arousal', 0.0)))
+            dominance = float(values.get('dominance', getattr(emotion_state, 'dominance', 0.0)))
+            resilience = float(values.get('resilience', getattr(emotion_state, 'resilience', 1.0)))
+            emotion_debt = float(values.get('emotion_debt', getattr(emotion_state, 'emotion_debt', 0.0)))
         except Exception as e:
             self.logger.warning(f"Emotion state parsing failed: {e}")
             valence, arousal, dominance, resilience, emotion_debt = 0.0, 0.0, 0.0, 1.0, 0.0
 
         emotion_label = self._get_emotion_label(valence, arousal, dominance)
-        role_style = self.get_role_description(role)
+        # Static head / tail come pre-rendered from the shared registry
+        head, tail = self._prompts.role_parts(role, self.get_role_description(role), self.default_instruction)
 
-        prompt_parts = [
-            self.default_instruction,
-            f"[Role]: {role} ({role_style})",
-            f"[Emotion]: V={valence:.2f}, A={arousal:.2f}, D={dominance:.2f}, R={resilience:.2f}, Debt={emotion_debt:.2f}",
-            f"[Emotion Label]: {emotion_label}",
-            f"User says: {user_input}",
-            f"Respond in the tone of a {role}."
-        ]
-
-        return "\n".join(prompt_parts)
+        return (
+            f"{head}"
+            f"[Emotion]: V={valence:.2f}, A={arousal:.2f}, D={dominance:.2f}, R={resilience:.2f}, Debt={emotion_debt:.2f}\n"
+            f"[Emotion Label]: {emotion_label}\n"
+            f"User says: {user_input}\n"
+            f"{tail}"
+        )
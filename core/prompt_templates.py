@@ -0,0 +1,110 @@
+"""
+Precomputed prompt templates shared by RoleEngine and PromptGenerator.
+
+Every static piece of a prompt is rendered once into an interned string:
+
+- engine[(coping_style, tone_key)]        RoleEngine system prompt
+- roles[(instruction, role, description)] PromptGenerator head / tail around the per-turn lines
+
+The module-level registry() is built on first use (RoleEngine() /
+PromptGenerator() trigger it at startup) from COPING_STYLES x PROMPT_STYLE_MAP
+and CONFIG.ROLES. Per-turn assembly then only appends the variable suffix.
+"""
+
+import sys
+import threading
+from typing import Dict, Mapping, Optional, Tuple
+
+DEFAULT_INSTRUCTION = (
+    "You are a cognitively and emotionally self-regulating AI agent. "
+    "You respond to users based on your current emotional state and a dynamic personality role. "
+    "Your tone should be empathetic, clear, and adjusted according to the situation."
+)
+DEFAULT_ROLE_DESCRIPTION = "clear and informative, without emotional leaning"
+
+# Hard constraints to suppress "helper/counsellor" reflex.
+ENGINE_RULES = (
+    "SYSTEM RULES:\n"
+    "1) Speak like an ordinary person, not a therapist or customer support.\n"
+    "2) Be concise: baseline<=2 sentences, mild<=2, moderate<=1, severe<=1.\n"
+    "3) Do NOT say: 'safe space', 'take a deep breath', 'you're strong', 'your feelings matter', "
+    "'I'm here for you', 'one step at a time'.\n"
+    "4) Do NOT over-apologise. At most ONE apology total per conversation, and only if you truly misread intent.\n"
+    "5) No emojis.\n"
+    "6) If the user is hostile, set a boundary briefly and stop adding more.\n"
+)
+
+def render_engine_prompt(coping_style: str, traits, tone: str) -> str:
+    style_line = (
+        f"You are an AI assistant using coping style '{coping_style}' ({', '.join(traits)}). "
+        f"Tone: {tone}."
+    )
+    return ENGINE_RULES + "\n" + style_line
+
+
+def render_role_line(role: str, description: str) -> str:
+    return f"[Role]: {role} ({description})"
+
+
+class PromptRegistry:
+    """Immutable-after-build template tables; role parts for unseen roles are added on demand."""
+
+    def __init__(
+        self,
+        coping_styles: Mapping[str, Mapping],
+        tone_map: Mapping[str, str],
+        roles: Optional[Mapping[str, Mapping]] = None,
+    ):
+        self._lock = threading.Lock()
+        self.tone_map = dict(tone_map)
+        self.engine: Dict[Tuple[str, str], str] = {
+            (style, tone_key): sys.intern(render_engine_prompt(style, spec["traits"], tone))
+            for style, spec in coping_styles.items()
+            for tone_key, tone in tone_map.items()
+        }
+        self.roles: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+        for role, spec in (roles or {}).items():
+            self.role_parts(role, (spec or {}).get("description", DEFAULT_ROLE_DESCRIPTION))
+
+    def engine_prompt(self, coping_style: str, tone_key: str) -> str:
+        """RoleEngine system prompt; unknown tone keys fall back to baseline (KeyError on unknown style)."""
+        if tone_key not in self.tone_map:
+            tone_key = "baseline"
+        return self.engine[(coping_style, tone_key)]
+
+    def role_parts(
+        self, role: str, description: str, instruction: str = DEFAULT_INSTRUCTION
+    ) -> Tuple[str, str]:
+        """
+        PromptGenerator pieces around the per-turn emotion / user lines:
+        head = instruction + role line + newline, tail = closing tone line.
+        """
+        key = (instruction, role, description)
+        parts = self.roles.get(key)
+        if parts is None:
+            parts = (
+                sys.intern(instruction + "\n" + render_role_line(role, description) + "\n"),
+                sys.intern(f"Respond in the tone of a {role}."),
+            )
+            with self._lock:
+                parts = self.roles.setdefault(key, parts)
+        return parts
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def registry() -> PromptRegistry:
+    """Process-wide registry over RoleEngine's tables and CONFIG.ROLES (built once)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                from behavior.role_engine import COPING_STYLES, PROMPT_STYLE_MAP
+                from config import CONFIG
+                _registry = PromptRegistry(COPING_STYLES, PROMPT_STYLE_MAP, CONFIG.ROLES)
+    return _registry
+
+
+__all__ = ["DEFAULT_INSTRUCTION", "ENGINE_RULES", "PromptRegistry", "registry"]
@@ -0,0 +1,145 @@
+"""
+Structured decision tracing with pluggable sinks.
+
+Producers (RoleEngine.decide_and_generate_prompt) check `TRACER.sinks` before
+doing any trace work, so with no sink installed a trace point costs one
+attribute lookup. When sinks are installed, each trace is one dict record;
+expensive fields are passed as zero-argument callables and only evaluated
+if some sink lists them in `wants` (None = every field).
+
+Sinks:
+    RingBufferSink   last N records in memory (tests, dashboards)
+    JsonlSink        one JSON line per record, written in batches
+    ConsoleSink      the human-readable TRACE block main.py used to print
+"""
+
+import itertools
+import json
+import sys
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, TextIO, Union
+
+Record = Dict[str, Any]
+
+
+class Tracer:
+    """Fan-out to the installed sinks; `sinks` is an immutable tuple swapped on change."""
+
+    def __init__(self) -> None:
+        self.sinks: tuple = ()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink: Any) -> Any:
+        with self._lock:
+            self.sinks = self.sinks + (sink,)
+        return sink
+
+    def remove_sink(self, sink: Any) -> None:
+        with self._lock:
+            self.sinks = tuple(s for s in self.sinks if s is not sink)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.sinks = ()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def emit(self, record: Record, lazy: Optional[Mapping[str, Callable[[], Any]]] = None) -> None:
+        sinks = self.sinks
+        if not sinks:
+            return
+        if lazy:
+            for name, compute in lazy.items():
+                if any(s.wants is None or name in s.wants for s in sinks):
+                    try:
+                        record[name] = compute()
+                    except Exception:
+                        record[name] = None
+        for sink in sinks:
+            sink.write(record)
+
+
+TRACER = Tracer()
+
+
+class RingBufferSink:
+    """Keeps the most recent `capacity` records."""
+
+    def __init__(self, capacity: int = 1024, wants: Optional[FrozenSet[str]] = None):
+        self.records: deque = deque(maxlen=capacity)
+        self.wants = wants
+
+    def write(self, record: Record) -> None:
+        self.records.append(record)
+
+
+class JsonlSink:
+    """Appends records as JSON lines; flushes every `batch_size` records and on close()."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 64,
+        wants: Optional[FrozenSet[str]] = None,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, int(batch_size))
+        self.wants = wants
+        self._encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, record: Record) -> None:
+        line = self._encode(record)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._buffer:
+            self._buffer.append("")
+            self._file.write("\n".join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._flush_locked()
+                self._file.close()
+
+
+class ConsoleSink:
+    """Prints decision records in the original TRACE layout."""
+
+    wants = frozenset({"feedback_avg"})
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+
+    def write(self, record: Record) -> None:
+        stream = self.stream or sys.stdout
+        feedback_avg = record.get("feedback_avg") or 0.0
+        stream.write(
+            "\n🔎 [TRACE] Coping Style Decision\n"
+            f"    🧠 Feedback Avg : {feedback_avg:.2f}\n"
+            f"    🔥 Emotion Debt : {record.get('debt', 0.0):.2f}\n"
+            f"    ⚡️ Energy Level : {record.get('energy', 0.0):.2f}\n"
+            f"    📈 Burst Level  : {record.get('burst_level')}\n"
+            f"    🎭 Chosen Style : {record.get('style')}\n"
+            f"    🗝️ Prompt Tone  : {record.get('tone')}\n\n"
+        )
+
+
+__all__ = ["ConsoleSink", "JsonlSink", "RingBufferSink", "TRACER", "Tracer"]
@@ -1,6 +1,5 @@
 import datetime
 import time
-import re
 
 from state.emotion_frr import update_frr
 from core.llm_interface import LLMInterface
@@ -9,9 +8,13 @@ from processing.emotion_classifier import (
     infer_feedback_score,
     detect_hard_stop,
 )
+from processing.text_analysis import TextAnalysis
+from processing.intent_router import Intent, route_intent
 from state.emotion import EmotionalState
 from state.emotion_frr import FRRState
 from behavior.role_engine import RoleEngine
+from state.strategy_log import StrategyLog, activate, active_log
+from core.tracing import TRACER, ConsoleSink
 from emotion.emotion_mapper import map_modern_to_darwin
 from config import CONFIG
 
@@ -26,7 +29,7 @@ def print_intro():
 # -----------------------------
 # Feedback handling (P0.1+)
 # -----------------------------
-def _read_feedback_or_infer(user_utterance: str) -> float:
+def _read_feedback_or_infer(user_utterance: TextAnalysis) -> float:
     """
     Numeric override in [-1, 1]. Otherwise infer from user utterance.
     IMPORTANT: If hard-stop detected, inferred feedback is forced negative to keep signals consistent.
@@ -58,87 +61,23 @@ def _read_feedback_or_infer(user_utterance: str) -> float:
 # -----------------------------
 # Avoid / resume heuristics
 # -----------------------------
-_AFFIRM_RE = re.compile(
-    r"^\s*(yes|yep|yeah|ok|okay|sure|alright|fine|go on|continue|let's|lets)\b", re.IGNORECASE
-)
-
-_NEGATE_RE = re.compile(
-    r"^\s*(no|nah|nope|dont|don't|stop|leave|go away|shut up)\b", re.IGNORECASE
-)
-
-
-def _looks_like_question_or_topic(text: str) -> bool:
-    t = (text or "").strip()
-    if not t:
-        return False
-    if "?" in t:
-        return True
-    tl = t.lower()
-    # Common "topic / request" starters (permits implicit resume)
-    starters = (
-        "can you",
-        "could you",
-        "would you",
-        "please",
-        "help me",
-        "tell me",
-        "what",
-        "why",
-        "how",
-        "when",
-        "where",
-        "who",
-        "i want",
-        "i need",
-        "let's",
-        "lets",
-    )
-    return tl.startswith(starters)
-
-
-def _resume_confirmed(text: str) -> bool:
+def _resume_confirmed(intent: Intent) -> bool:
     """
     Accept natural-language confirmations, not just exact tokens.
-    Also accept "I want to talk / I want to continue" as confirmation.
+    "I want to talk / I want to continue" routes as affirm; a real question/topic
+    instead of "yes" counts as implicit confirmation.
     """
-    t = (text or "").strip()
-    if not t:
-        return False
-
-    if _NEGATE_RE.search(t):
-        return False
-
-    tl = t.lower()
-    if _AFFIRM_RE.search(t):
-        return True
-
-    if "i want to talk" in tl or "i want to continue" in tl or "i want to keep talking" in tl:
-        return True
-
-    # Implicit confirmation: user provides a real question/topic instead of answering "yes"
-    if _looks_like_question_or_topic(t):
-        return True
+    return intent in ("affirm", "question_or_topic")
 
-    return False
 
-
-def _looks_like_resume_intent(text: str) -> bool:
+def _looks_like_resume_intent(analysis: TextAnalysis, intent: Intent) -> bool:
     """
     Permissive detector: if it's not expulsion and looks like the user is re-engaging, treat as resume intent.
     """
-    t = (text or "").strip()
-    if not t:
-        return False
-    if detect_hard_stop(t):
+    if not analysis.raw.strip():
         return False
-    # Any question/topic is a strong resume cue
-    if _looks_like_question_or_topic(t):
-        return True
-    # Any affirmative-like opening is a resume cue
-    if _AFFIRM_RE.search(t):
-        return True
-    # Otherwise, be permissive: non-expulsion text during avoid_mode likely indicates re-engagement
-    return True
+    # Non-expulsion text during avoid_mode likely indicates re-engagement
+    return intent != "hard_stop"
 
 
 def _ensure_avoid_fields(state: FRRState) -> None:
@@ -158,25 +97,58 @@ def main():
 
     llm = LLMInterface(CONFIG)
     emotion_state = EmotionalState()
-    frr_state = FRRState()
+    frr_state = FRRState(history_rollup=True)
     role_engine = RoleEngine(frr_state)
     strategy = "reflective_listening"
 
     _ensure_avoid_fields(frr_state)
 
+    if CONFIG.DEBUG:
+        TRACER.add_sink(ConsoleSink())
+
+    event_log = None
+    if CONFIG.ENABLE_STRATEGY_LOG:
+        event_log = StrategyLog(
+            CONFIG.LOG_DIR,
+            batch_size=CONFIG.STRATEGY_LOG_BATCH_SIZE,
+            fsync=CONFIG.STRATEGY_LOG_FSYNC,
+            checkpoint_every=CONFIG.STRATEGY_LOG_CHECKPOINT_EVERY,
+        )
+        activate(event_log)
+        event_log.attach(f"cli-{int(time.time())}", frr_state, emotion_state)
+
+    try:
+        _run_loop(llm, emotion_state, frr_state, role_engine, strategy)
+    finally:
+        if event_log is not None:
+            event_log.close()
+        llm.close()
+
+
+def _run_loop(llm, emotion_state, frr_state, role_engine, strategy):
     while True:
+        # between turns: no session lock is held, so a due checkpoint is consistent
+        event_log = active_log()
+        if event_log is not None:
+            event_log.maybe_checkpoint()
+
         user_input = input("\n🗣️  You: ").strip()
         if user_input.lower() in ["exit", "quit"]:
             print("\nExiting CABSAIA. Goodbye!")
             break
 
+        # One shared analysis per turn: every check below reuses its cached results
+        analysis = TextAnalysis(user_input)
+        # Avoid-mode triage label (hard_stop / negate / affirm / question_or_topic / other)
+        intent = route_intent(analysis)
+
         # ------------------------------------------------------------
         # Soft-latched hard-stop mechanism (micro-buffered)
         # ------------------------------------------------------------
 
         # 0) If we are waiting for "resume confirmation"
         if getattr(frr_state, "pending_resume_confirm", False):
-            if _resume_confirmed(user_input):
+            if _resume_confirmed(intent):
                 # Exit avoid mode and proceed normally this turn
                 frr_state.avoid_mode = False
                 frr_state.pending_resume_confirm = False
@@ -189,12 +161,12 @@ def main():
                 frr_state.pending_resume_confirm = False
                 print("\n🤖 CABSAIA: Understood. I'll stay quiet.")
 
-                feedback = _read_feedback_or_infer(user_input)
+                feedback = _read_feedback_or_infer(analysis)
                 update_frr(frr_state, strategy, feedback_score=feedback, system_energy=None)
                 continue
 
         # 1) Hard-stop detection
-        if detect_hard_stop(user_input):
+        if intent == "hard_stop":
             if getattr(frr_state, "avoid_mode", False):
                 # Already in avoid mode: no extra cushioning
                 reply = "Understood. I'll stop."
@@ -208,19 +180,19 @@ def main():
 
             print(f"\n🤖 CABSAIA: {reply}")
 
-            feedback = _read_feedback_or_infer(user_input)
+            feedback = _read_feedback_or_infer(analysis)
             update_frr(frr_state, strategy, feedback_score=feedback, system_energy=None)
             continue
 
         # 2) If in avoid mode and user seems to resume, ask one neutral confirmation
-        if getattr(frr_state, "avoid_mode", False) and _looks_like_resume_intent(user_input):
+        if getattr(frr_state, "avoid_mode", False) and _looks_like_resume_intent(analysis, intent):
             frr_state.pending_resume_confirm = True
             print(
                 "\n🤖 CABSAIA: A moment ago it sounded like you didn't want to continue. "
                 "Are you sure you want to keep talking now?"
             )
 
-            feedback = _read_feedback_or_infer(user_input)
+            feedback = _read_feedback_or_infer(analysis)
             update_frr(frr_state, strategy, feedback_score=feedback, system_energy=None)
             continue
 
@@ -232,7 +204,7 @@ def main():
         reply = llm.generate(full_prompt)
 
         # Emotion analysis (informational)
-        emotion_result = analyse_emotion_from_text(user_input)
+        emotion_result = analyse_emotion_from_text(analysis)
         val = emotion_result["valence"]
         aro = emotion_result["arousal"]
         modern_emotion = emotion_result.get("expression", "unknown")
@@ -263,7 +235,7 @@ def main():
             print("   Darwin Mapping: ❗ Emotion not recognised in modern-27 set.")
 
         # Feedback + FRR update
-        feedback = _read_feedback_or_infer(user_input)
+        feedback = _read_feedback_or_infer(analysis)
         update_frr(frr_state, strategy, feedback_score=feedback, system_energy=None)
 
 
@@ -1,7 +1,6 @@
 # 📁 文件路径：cabsaia/main_test_loop.py
 
-import time
-from state.emotion_frr import frr_state, update_frr
+from state.emotion_frr import fast_forward_frr, frr_state, update_frr
 from behavior.role_engine import RoleEngine
 from core.llm_interface import LLMInterface
 from config import CONFIG
@@ -18,9 +17,8 @@ if not llm.check_health():
 
 
 def simulate_feedback(state, feedback_score: float, energy: float = 0.8, count: int = 1):
-    for _ in range(count):
-        update_frr(state, "reflective_listening", feedback_score=feedback_score, system_energy=energy)
-        time.sleep(0.1)
+    # count 次相同反馈一次性闭式推进（写入一条聚合历史记录）
+    fast_forward_frr(state, "reflective_listening", feedback_score, count, system_energy=energy)
 
 
 def main_loop():
@@ -0,0 +1,102 @@
+# cabsaia/processing/batch.py
+"""
+Offline batch analysis over large corpora of logged utterances.
+
+analyse_emotion_batch() streams one BatchResult per input text, in input
+order, running analyse_emotion_from_text / infer_feedback_score /
+detect_negators on a process pool. Input is consumed lazily in chunks and
+only a bounded number of chunks is in flight at any time, so memory stays
+flat no matter how large the input iterable is.
+
+Every worker process imports the processing modules once, so the compiled
+negator automaton and emotion cue index are built once per worker (and
+inherited copy-on-write from the parent under the fork start method).
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+from processing.emotion_classifier import analyse_emotion_from_text, infer_feedback_score
+from processing.result_cache import disable_result_cache
+from processing.text_analysis import TextAnalysis
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    emotion: Dict[str, Any]
+    feedback_score: float
+    negators: Dict[str, List[str]]
+
+
+def analyse_one(text: str) -> BatchResult:
+    """Single-text equivalent of one analyse_emotion_batch() item."""
+    analysis = TextAnalysis(text)
+    return BatchResult(
+        emotion=analyse_emotion_from_text(analysis),
+        feedback_score=infer_feedback_score(analysis),
+        negators=analysis.negators,
+    )
+
+
+def _analyse_chunk(texts: List[str]) -> List[BatchResult]:
+    return [analyse_one(t) for t in texts]
+
+
+def _chunks(texts: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    it = iter(texts)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyse_emotion_batch(
+    texts: Iterable[str],
+    workers: Optional[int] = None,
+    chunk_size: int = 512,
+    max_pending: Optional[int] = None,
+) -> Iterator[BatchResult]:
+    """
+    Stream BatchResult objects for `texts`, preserving input order.
+
+    Args:
+        texts: any iterable of strings (may be a generator / file reader).
+        workers: process count; None -> os.cpu_count(), 0 or 1 -> run in-process.
+        chunk_size: texts per task sent to a worker.
+        max_pending: chunks in flight at once (default 2 * workers); bounds memory
+            to roughly max_pending * chunk_size texts + results.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+
+    n_workers = (os.cpu_count() or 1) if workers is None else int(workers)
+    if n_workers <= 1:
+        for chunk in _chunks(texts, chunk_size):
+            yield from _analyse_chunk(chunk)
+        return
+
+    limit = max(1, max_pending if max_pending is not None else 2 * n_workers)
+    pending: Deque[Future] = deque()
+    # Workers start without the parent's result cache (a fork would copy it per process).
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=disable_result_cache) as pool:
+        try:
+            for chunk in _chunks(texts, chunk_size):
+                pending.append(pool.submit(_analyse_chunk, chunk))
+                if len(pending) >= limit:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # consumer stopped early: drop work that has not started yet
+            for fut in pending:
+                fut.cancel()
+
+
+__all__ = ["BatchResult", "analyse_one", "analyse_emotion_batch"]
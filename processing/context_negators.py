@@ -2,8 +2,13 @@
 from __future__ import annotations
 
 import re
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Iterable, Set
+from pathlib import Path
+from typing import Dict, List, Tuple, Iterable, Iterator, Set
+
+from processing.lexicon_cache import load_or_build
+from processing.result_cache import lookup, register_rebuild_hook
 
 
 # -----------------------------------------------------------------------------
@@ -648,7 +653,9 @@ def _dedupe_phrases(phrases: Iterable[str]) -> Tuple[List[str], Set[str]]:
 
 
 # -----------------------------------------------------------------------------
-# 2) 边界匹配：单词用 \b；短语在 normalised space 里做 “surrounded by spaces” 的匹配
+# 2) 边界匹配：整个词表编译成一个 Aho-Corasick 自动机，在 normalised text 上单次线性扫描
+#    - 短语（multiword）：两端必须是空格/文本边界（token 序列匹配）
+#    - 单词：与原来的 \b 语义一致（word char / non-word char 交界）
 # -----------------------------------------------------------------------------
 @dataclass(frozen=True)
 class NegatorMatch:
@@ -656,21 +663,106 @@ class NegatorMatch:
     phrase: str  # original phrase as stored
 
 
+def _is_word_char(ch: str) -> bool:
+    # Same definition as regex `\w`, so single-word hits keep `\b` semantics.
+    return ch.isalnum() or ch == "_"
+
+
+class _PhraseAutomaton:
+    """
+    Minimal Aho-Corasick automaton over characters.
+
+    Nodes are stored as flat lists; each node's output list already includes
+    the outputs reachable through its failure links, so scanning is a single
+    pass over the text with no per-pattern work.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        raw_out: List[List[int]] = [[]]
+        for pid, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    raw_out.append([])
+                node = nxt
+            raw_out[node].append(pid)
+
+        # BFS: failure links + merged outputs
+        queue = deque(self._goto[0].values())
+        order: List[int] = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for ch, nxt in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                queue.append(nxt)
+
+        merged: List[Tuple[int, ...]] = [()] * len(self._goto)
+        for node in order:
+            merged[node] = tuple(raw_out[node]) + merged[self._fail[node]]
+        self._out = merged
+
+    @property
+    def size(self) -> int:
+        return len(self._goto)
+
+    def export_state(self) -> Tuple[list, list, list]:
+        return self._goto, self._fail, self._out
+
+    @classmethod
+    def from_state(cls, state: Tuple[list, list, list]) -> "_PhraseAutomaton":
+        obj = cls.__new__(cls)
+        goto, fail, out = state
+        obj._goto, obj._fail = goto, fail
+        obj._out = [tuple(o) for o in out]
+        return obj
+
+    def scan(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end_index_exclusive, pattern_id) for every occurrence."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                for pid in out[node]:
+                    yield i + 1, pid
+
+
 class ContextNegatorDetector:
     """
     CABSAIA-style detector:
     - normalise text once
     - phrase matching (multiword) with conservative boundary constraints
-    - word matching with regex word boundaries
+    - word matching with word-boundary semantics
     - dedupe at build-time to avoid drift
+    - whole lexicon compiled into one automaton: one linear pass per call,
+      independent of how many categories / phrases are loaded
     """
 
     def __init__(self, lexicon: Dict[str, List[str]]):
         self.lexicon: Dict[str, List[str]] = {}
-        self._phrase_norm_map: Dict[str, List[Tuple[str, str]]] = {}
-        # category -> list[(norm_phrase, original_phrase)] for multiword
-        self._word_patterns: Dict[str, List[Tuple[re.Pattern[str], str]]] = {}
-        # category -> list[(compiled_pattern, original_phrase)] for single word
+
+        # pattern id -> normalised phrase / is-multiword flag
+        self._patterns: List[str] = []
+        self._multiword: List[bool] = []
+        # pattern id -> [(order, category, original_phrase)], order = output position
+        self._entries: List[List[Tuple[int, str, str]]] = []
+        self._automaton = _PhraseAutomaton([])
 
         for cat, phrases in (lexicon or {}).items():
             kept, _ = _dedupe_phrases(phrases)
@@ -681,23 +773,84 @@ class ContextNegatorDetector:
         self._build()
 
     def _build(self) -> None:
+        pid_of: Dict[str, int] = {}
+        self._patterns, self._multiword, self._entries = [], [], []
+
+        def _pid(pn: str) -> int:
+            pid = pid_of.get(pn)
+            if pid is None:
+                pid = pid_of[pn] = len(self._patterns)
+                self._patterns.append(pn)
+                self._multiword.append(_is_multiword(pn))
+                self._entries.append([])
+            return pid
+
+        # Output order mirrors the original per-category scan:
+        # category order, then multiword phrases, then single words (lexicon order).
+        order = 0
         for cat, phrases in self.lexicon.items():
-            mw: List[Tuple[str, str]] = []
-            ww: List[Tuple[re.Pattern[str], str]] = []
-            for p in phrases:
-                pn = normalise_text(p)
-                if not pn:
-                    continue
-                if _is_multiword(pn):
-                    # boundary: ensure phrase appears as token sequence
-                    # we match inside " " + text + " " to avoid prefix/suffix bleed
-                    mw.append((pn, p))
-                else:
-                    # strict word boundary
-                    pat = re.compile(rf"\b{re.escape(pn)}\b", flags=re.IGNORECASE)
-                    ww.append((pat, p))
-            self._phrase_norm_map[cat] = mw
-            self._word_patterns[cat] = ww
+            normed = [(normalise_text(p), p) for p in phrases]
+            mw = [(pn, p) for pn, p in normed if pn and _is_multiword(pn)]
+            ww = [(pn, p) for pn, p in normed if pn and not _is_multiword(pn)]
+            for pn, p in mw + ww:
+                self._entries[_pid(pn)].append((order, cat, p))
+                order += 1
+
+        self._automaton = _PhraseAutomaton(self._patterns)
+
+    def export_state(self) -> Dict[str, object]:
+        """Plain-data snapshot of the compiled matcher (see processing.lexicon_cache)."""
+        return {
+            "lexicon": self.lexicon,
+            "patterns": self._patterns,
+            "multiword": self._multiword,
+            "entries": self._entries,
+            "automaton": self._automaton.export_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, object]) -> "ContextNegatorDetector":
+        obj = cls.__new__(cls)
+        obj.lexicon = state["lexicon"]
+        obj._patterns = state["patterns"]
+        obj._multiword = state["multiword"]
+        obj._entries = [[tuple(e) for e in es] for es in state["entries"]]
+        obj._automaton = _PhraseAutomaton.from_state(state["automaton"])
+        return obj
+
+    def _on_boundary(self, text: str, start: int, end: int, multiword: bool) -> bool:
+        if multiword:
+            # " <phrase> " in " <text> "
+            return (start == 0 or text[start - 1] == " ") and (end == len(text) or text[end] == " ")
+        # `\b` on both sides
+        before = start > 0 and _is_word_char(text[start - 1])
+        after = end < len(text) and _is_word_char(text[end])
+        return (
+            before != _is_word_char(text[start])
+            and _is_word_char(text[end - 1]) != after
+        )
+
+    def matches(self, text: str) -> List[NegatorMatch]:
+        """
+        Return every (category, phrase) hit, ordered the same way detect() groups them.
+        """
+        return self.matches_normalised(normalise_text(text))
+
+    def matches_normalised(self, t: str) -> List[NegatorMatch]:
+        """matches() for text that has already been through normalise_text()."""
+        if not t:
+            return []
+
+        found: Set[int] = set()
+        patterns, multiword = self._patterns, self._multiword
+        for end, pid in self._automaton.scan(t):
+            if pid in found:
+                continue
+            if self._on_boundary(t, end - len(patterns[pid]), end, multiword[pid]):
+                found.add(pid)
+
+        entries = sorted(e for pid in found for e in self._entries[pid])
+        return [NegatorMatch(cat, orig) for _, cat, orig in entries]
 
     def detect(self, text: str) -> Dict[str, List[str]]:
         """
@@ -706,38 +859,13 @@ class ContextNegatorDetector:
         - multiword phrases match in normalised token space
         - single words match with word boundary
         """
-        t = normalise_text(text)
-        if not t:
-            return {}
+        return self.detect_normalised(normalise_text(text))
 
-        padded = f" {t} "
+    def detect_normalised(self, t: str) -> Dict[str, List[str]]:
+        """detect() for text that has already been through normalise_text()."""
         out: Dict[str, List[str]] = {}
-
-        for cat in self.lexicon.keys():
-            hits: List[str] = []
-            seen_norm: Set[str] = set()
-
-            # multiword
-            for pn, orig in self._phrase_norm_map.get(cat, []):
-                # conservative: match " <phrase> " in padded text
-                token = f" {pn} "
-                if token in padded:
-                    if pn not in seen_norm:
-                        hits.append(orig)
-                        seen_norm.add(pn)
-
-            # single word
-            for pat, orig in self._word_patterns.get(cat, []):
-                pn = normalise_text(orig)
-                if pn in seen_norm:
-                    continue
-                if pat.search(t):
-                    hits.append(orig)
-                    seen_norm.add(pn)
-
-            if hits:
-                out[cat] = hits
-
+        for m in self.matches_normalised(t):
+            out.setdefault(m.category, []).append(m.phrase)
         return out
 
     def flatten(self) -> List[str]:
@@ -796,10 +924,36 @@ def get_severity(matches: Dict[str, List[str]]) -> str:
 # -----------------------------------------------------------------------------
 # 4) 预置 detector（项目内直接 import 用）
 # -----------------------------------------------------------------------------
-DETECTOR = ContextNegatorDetector(CONTEXT_NEGATORS)
+def _load_detector(rebuild: bool = False) -> ContextNegatorDetector:
+    # The lexicon lives in this file, so its content hash covers both lexicon and matcher code.
+    return load_or_build(
+        "context_negators",
+        sources=[Path(__file__)],
+        build=lambda: ContextNegatorDetector(CONTEXT_NEGATORS),
+        export=ContextNegatorDetector.export_state,
+        restore=ContextNegatorDetector.from_state,
+        rebuild=rebuild,
+    )
+
+
+DETECTOR = _load_detector()
+
+
+@register_rebuild_hook
+def _rebuild_detector() -> None:
+    # Straight from the in-memory lexicon: the on-disk cache is keyed by this
+    # file's hash and must not pick up runtime edits.
+    global DETECTOR
+    DETECTOR = ContextNegatorDetector(CONTEXT_NEGATORS)
+
+
+def detect_negators_normalised(t: str) -> Dict[str, List[str]]:
+    """detect_negators() for text already passed through normalise_text() (result-cached)."""
+    return lookup(("negators", t), lambda: DETECTOR.detect_normalised(t))
+
 
 def detect_negators(text: str) -> Dict[str, List[str]]:
-    return DETECTOR.detect(text)
+    return detect_negators_normalised(normalise_text(text))
 
 def get_all_negators() -> List[str]:
     return DETECTOR.flatten()
\ No newline at end of file
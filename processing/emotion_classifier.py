@@ -1,24 +1,64 @@
 import re
+from pathlib import Path
 from typing import Dict, Any, List, Tuple, Literal
 
+from resources import emotion_dictionary
 from resources.emotion_dictionary import (
     EMOTION_KEYWORDS,
     EMOTION_INTENSITY,
     EMOTION_EXPRESSIONS,
     COUNSELING_THEMES
 )
-from processing.context_negators import detect_negators
+from processing import lexicon_index
+from processing.lexicon_cache import load_or_build
+from processing.lexicon_index import PhraseIndex
+from processing.result_cache import register_rebuild_hook
+from processing.text_analysis import TextAnalysis, TextLike, clean_text  # noqa: F401 (clean_text re-exported)
 
 SentimentType = Literal["positive", "negative", "neutral"]
 
 
-def clean_text(raw: str) -> str:
-    """Lowercase, normalise apostrophes, remove punctuation (keep apostrophes), collapse whitespace."""
-    text = (raw or "").lower().strip()
-    text = text.replace("\u2019", "'").replace("\u2018", "'").replace("`", "'")
-    text = re.sub(r"[^\w\s']", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+# -----------------------------------------------------------------------------
+# Lexicon index (restored from the lexicon cache or built at import)
+# -----------------------------------------------------------------------------
+def _build_cue_index() -> Tuple[List[Tuple[str, str, str]], PhraseIndex[int]]:
+    """cue id -> (section, category/theme/style/level, cue), plus the index over all cues."""
+    entries: List[Tuple[str, str, str]] = []
+    index: PhraseIndex[int] = PhraseIndex()
+    sections = (
+        ("keywords", EMOTION_KEYWORDS),
+        ("themes", COUNSELING_THEMES),
+        ("expressions", EMOTION_EXPRESSIONS),
+        ("intensity", EMOTION_INTENSITY),
+    )
+    for section, table in sections:
+        for key, cues in table.items():
+            for cue in cues:
+                index.add(cue, len(entries))
+                entries.append((section, key, cue))
+    return entries, index
+
+
+def _load_cue_index(rebuild: bool = False) -> Tuple[List[Tuple[str, str, str]], PhraseIndex[int]]:
+    return load_or_build(
+        "emotion_cues",
+        sources=[Path(emotion_dictionary.__file__), Path(lexicon_index.__file__), Path(__file__)],
+        build=_build_cue_index,
+        export=lambda built: (built[0], built[1].export_state()),
+        restore=lambda state: ([tuple(e) for e in state[0]], PhraseIndex.from_state(state[1])),
+        rebuild=rebuild,
+    )
+
+
+# (entries, index) swapped as one tuple so a rebuild never mixes old and new
+_CUES = _load_cue_index()
+
+
+@register_rebuild_hook
+def _rebuild_cue_index() -> None:
+    # From the in-memory dictionaries, bypassing the source-hashed disk cache.
+    global _CUES
+    _CUES = _build_cue_index()
 
 
 def keyword_in_text(word: str, text: str) -> bool:
@@ -28,13 +68,13 @@ def keyword_in_text(word: str, text: str) -> bool:
     return bool(re.search(r"\b" + re.escape(word) + r"\b", text))
 
 
-def get_negator_hits(text: str) -> List[str]:
+def get_negator_hits(text: TextLike) -> List[str]:
     """
     Return list of negator hits (strings) if available.
     detect_negators() signature depends on your context_negators module.
     We defensively coerce to List[str].
     """
-    hits = detect_negators(text)
+    hits = TextAnalysis.of(text).negators
     if not hits:
         return []
     if isinstance(hits, list):
@@ -43,91 +83,83 @@ def get_negator_hits(text: str) -> List[str]:
     return [str(hits)]
 
 
-def detect_hard_stop(text: str) -> bool:
+def detect_hard_stop(text: TextLike) -> bool:
     """
     High-priority "stop talking / go away" detection.
     This is stricter than general negativity: it means user explicitly wants the agent to stop.
 
+    Accepts a raw string or a TextAnalysis (result is cached on the analysis).
     Returns True if hard-stop should short-circuit the LLM reply.
     """
-    cleaned = clean_text(text)
-    if not cleaned:
-        return False
+    return TextAnalysis.of(text).hard_stop
+
+
+# Expulsion phrases, matched as substrings of clean_text() output.
+HARD_STOP_PHRASES: Tuple[str, ...] = (
+    "shut up",
+    "stop talking",
+    "go away",
+    "leave me alone",
+    "get away",
+    "back off",
+    "fuck off",
+    "piss off",
+    "dont talk to me",
+    "don't talk to me",
+    "not talking to you",
+)
+_HARD_STOP_RE = re.compile("|".join(re.escape(p) for p in HARD_STOP_PHRASES))
 
-    # 1) If your context_negators is good, this catches most expulsion cues
-    hits = get_negator_hits(text)
-    if hits:
-        # We only treat as hard-stop if the negator looks like expulsion/stop.
-        # Because detect_negators may include other interactional negation signals.
-        expulsion_markers = [
-            "shut up",
-            "stop talking",
-            "go away",
-            "leave me alone",
-            "get away",
-            "back off",
-            "fuck off",
-            "piss off",
-            "dont talk to me",
-            "don't talk to me",
-            "not talking to you",
-        ]
-        for m in expulsion_markers:
-            if m in cleaned:
-                return True
-
-    # 2) Direct phrase matches (fast path)
-    HARD_STOP_PHRASES = [
-        "shut up",
-        "stop talking",
-        "go away",
-        "leave me alone",
-        "get away",
-        "back off",
-        "fuck off",
-        "piss off",
-        "dont talk to me",
-        "don't talk to me",
-        "not talking to you",
-    ]
-    return any(p in cleaned for p in HARD_STOP_PHRASES)
+
+def _detect_hard_stop(analysis: TextAnalysis) -> bool:
+    # Single precompiled alternation; negator detection is not needed here and
+    # only runs later if something (e.g. feedback inference) consumes it.
+    cleaned = analysis.cleaned
+    return bool(cleaned) and _HARD_STOP_RE.search(cleaned) is not None
 
 
-def analyse_emotion_from_text(text: str) -> Dict[str, Any]:
-    text = clean_text(text)
+def analyse_emotion_from_text(text: TextLike) -> Dict[str, Any]:
+    """
+    Keyword-based valence/arousal/dominance, themes, expression and intensity.
+    Accepts a raw string or a TextAnalysis (result is cached on the analysis).
+    """
+    return TextAnalysis.of(text).emotion
+
+
+def _analyse_emotion(analysis: TextAnalysis) -> Dict[str, Any]:
+    text = analysis.cleaned
 
     keywords: List[Tuple[str, str]] = []
     valence_score = 0.0
     arousal_score = 0.0
     themes: List[str] = []
 
-    for category, word_list in EMOTION_KEYWORDS.items():
-        for word in word_list:
-            if keyword_in_text(word, text):
-                keywords.append((category, word))
-                if category == "positive":
-                    valence_score += 1.0
-                    arousal_score += 0.3
-                elif category == "negative":
-                    valence_score -= 1.0
-                    arousal_score -= 0.3
-
-    for theme, cues in COUNSELING_THEMES.items():
-        if any(keyword_in_text(cue, text) for cue in cues):
-            themes.append(theme)
-
     expression = None
     intensity = "moderate"
-
-    for style, markers in EMOTION_EXPRESSIONS.items():
-        if any(keyword_in_text(m, text) for m in markers):
-            expression = style
-            break
-
-    for level, triggers in EMOTION_INTENSITY.items():
-        if any(keyword_in_text(m, text) for m in triggers):
-            intensity = level
-            break
+    intensity_found = False
+
+    # Cue ids follow lexicon iteration order, so walking them sorted reproduces
+    # the original nested-loop order (including float accumulation order).
+    entries, index = _CUES
+    for cue_id in sorted(index.lookup(text)):
+        section, key, word = entries[cue_id]
+        if section == "keywords":
+            keywords.append((key, word))
+            if key == "positive":
+                valence_score += 1.0
+                arousal_score += 0.3
+            elif key == "negative":
+                valence_score -= 1.0
+                arousal_score -= 0.3
+        elif section == "themes":
+            if not themes or themes[-1] != key:
+                themes.append(key)
+        elif section == "expressions":
+            if expression is None:
+                expression = key
+        elif not intensity_found:
+            intensity = key
+            intensity_found = True
 
     valence_score = max(-1.0, min(1.0, valence_score))
     arousal_score = max(-1.0, min(1.0, arousal_score))
@@ -166,12 +198,20 @@ def analyse_emotion_from_text(text: str) -> Dict[str, Any]:
     }
 
 
-def infer_feedback_score(text: str) -> float:
-    cleaned = clean_text(text)
+def infer_feedback_score(text: TextLike) -> float:
+    """
+    Heuristic feedback in {-1.0, 0.0, 1.0} inferred from the user's wording.
+    Accepts a raw string or a TextAnalysis (result is cached on the analysis).
+    """
+    return TextAnalysis.of(text).feedback_score
+
+
+def _infer_feedback_score(analysis: TextAnalysis) -> float:
+    cleaned = analysis.cleaned
     if not cleaned:
         return 0.0
 
-    hits = detect_negators(text)
+    hits = analysis.negators
     if hits:
         return -1.0
 
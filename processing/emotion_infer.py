@@ -1,38 +1,62 @@
 # cabsaia/core/emotion_infer.py
 
-from typing import Dict
-from cabsaia.resources.emotion_dictionary import EMOTION_KEYWORDS, EMOTION_INTENSITY
+from typing import Dict, List, Optional, Set, Tuple
 
+from processing.lexicon_index import PhraseIndex, split_runs
+from resources.emotion_dictionary import EMOTION_KEYWORDS, EMOTION_INTENSITY
+
+# 映射维度得分
+_DIM_MAPPING: Dict[str, Tuple[str, float]] = {
+    "positive": ("valence", +0.4),
+    "negative": ("valence", -0.4),
+    "arousal_high": ("arousal", +0.6),
+    "arousal_low": ("arousal", -0.4),
+    "dominant": ("dominance", +0.5),
+    "submissive": ("dominance", -0.5),
+}
+
+# 强度修饰词（未列出的等级按 1.0 处理）
+_INTENSITY_SCORE: Dict[str, float] = {
+    "mild": 0.3,
+    "moderate": 0.6,
+    "intense": 1.0,
+    "severe": 1.2,
+}
+_LEVELS: List[str] = list(EMOTION_INTENSITY.keys())
+_CATEGORIES: List[str] = list(_DIM_MAPPING.keys())
+
+
+def _build_index() -> Tuple[List[Tuple[str, int]], PhraseIndex[int]]:
+    """cue id -> ("category", i) | ("level", i)；整词匹配索引。"""
+    entries: List[Tuple[str, int]] = []
+    index: PhraseIndex[int] = PhraseIndex()
+    for i, level in enumerate(_LEVELS):
+        for w in EMOTION_INTENSITY[level]:
+            index.add(w, len(entries))
+            entries.append(("level", i))
+    for i, category in enumerate(_CATEGORIES):
+        for w in EMOTION_KEYWORDS.get(category, []):
+            index.add(w, len(entries))
+            entries.append(("category", i))
+    if index.has_fallback:
+        # 流式扫描只处理以单词字符开头/结尾的词条
+        raise ValueError("emotion_infer cues must start and end with a word character")
+    return entries, index
 
-def infer_emotion_from_text(text: str) -> Dict[str, float]:
-    """从 LLM 回复中提取情绪变化量（valence, arousal, dominance）"""
-    text = text.lower()
-    delta = {"valence": 0.0, "arousal": 0.0, "dominance": 0.0}
 
-    # 处理强度修饰词
-    intensity_score = 1.0
-    for level, words in EMOTION_INTENSITY.items():
-        if any(w in text for w in words):
-            if level == "mild": intensity_score = 0.3
-            elif level == "moderate": intensity_score = 0.6
-            elif level == "intense": intensity_score = 1.0
-            elif level == "severe": intensity_score = 1.2
-            break
-
-    # 映射维度得分
-    mapping = {
-        "positive": ("valence", +0.4),
-        "negative": ("valence", -0.4),
-        "arousal_high": ("arousal", +0.6),
-        "arousal_low": ("arousal", -0.4),
-        "dominant": ("dominance", +0.5),
-        "submissive": ("dominance", -0.5),
-    }
-
-    for category, (dim, base_score) in mapping.items():
-        for keyword in EMOTION_KEYWORDS.get(category, []):
-            if keyword in text:
-                delta[dim] += base_score * intensity_score
+_ENTRIES, _INDEX = _build_index()
+_MAX_RUNS = max(1, _INDEX.max_runs)
+
+
+def _compose(counts: List[int], level: Optional[int]) -> Dict[str, float]:
+    """按类别命中数 + 最高优先强度等级计算 VAD 变化量（一次性与流式共用）"""
+    intensity_score = 1.0 if level is None else _INTENSITY_SCORE.get(_LEVELS[level], 1.0)
+
+    delta = {"valence": 0.0, "arousal": 0.0, "dominance": 0.0}
+    for i, category in enumerate(_CATEGORIES):
+        if counts[i]:
+            dim, base_score = _DIM_MAPPING[category]
+            delta[dim] += counts[i] * base_score * intensity_score
 
     # 范围限制
     for k in delta:
@@ -42,3 +66,73 @@ def infer_emotion_from_text(text: str) -> Dict[str, float]:
             delta[k] = max(min(delta[k], 1.0), 0.0)
 
     return delta
+
+
+class StreamingEmotionInfer:
+    """
+    增量情绪推断：逐块消费 LLM 流式输出，维护运行中的 VAD 变化量。
+
+    - 只缓存尚未能判定的尾部 run（最多 _MAX_RUNS 个 + 未结束的最后一个 token），
+      因此跨 chunk 被切开的单词/短语也能正确匹配；单词词条在 token 完整后立即计入；
+    - 每个词条只计一次（与一次性扫描相同的“出现即计分”语义）；
+    - finish() 之后的结果与 infer_emotion_from_text(全文) 完全一致。
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._carry = ""
+        self._found: Set[int] = set()
+        self._counts: List[int] = [0] * len(_CATEGORIES)
+        self._level: Optional[int] = None
+
+    def _scan(self, runs: List[str], start: int, stop: int, multiword: bool = True) -> None:
+        new = _INDEX.scan_runs(runs, start, stop, set(), multiword) - self._found
+        for cue_id in new:
+            kind, i = _ENTRIES[cue_id]
+            if kind == "category":
+                self._counts[i] += 1
+            elif self._level is None or i < self._level:
+                self._level = i
+        self._found |= new
+
+    def feed(self, chunk: str) -> Dict[str, float]:
+        """消费一个文本块，返回到目前为止的（暂定）变化量。"""
+        runs = split_runs(self._carry + (chunk or "").lower())
+        # 最后一个 run 可能在下个 chunk 继续：
+        # - 单词词条：run 完整即可判定（重复判定由 _found 去重）
+        # - 短语词条：起点 i 需满足 i + _MAX_RUNS <= complete
+        complete = len(runs) - 1
+        decided = max(0, complete - _MAX_RUNS + 1)
+        self._scan(runs, 0, decided)
+        self._scan(runs, decided, complete, multiword=False)
+        self._carry = "".join(runs[decided:])
+        return self.delta
+
+    def finish(self) -> Dict[str, float]:
+        """流结束：处理剩余缓存并返回最终变化量。"""
+        runs = split_runs(self._carry)
+        self._scan(runs, 0, len(runs))
+        self._carry = ""
+        return self.delta
+
+    @property
+    def delta(self) -> Dict[str, float]:
+        return _compose(self._counts, self._level)
+
+
+def infer_emotion_from_text(text: str) -> Dict[str, float]:
+    """从 LLM 回复中提取情绪变化量（valence, arousal, dominance），整词匹配"""
+    counts = [0] * len(_CATEGORIES)
+    level: Optional[int] = None
+    for cue_id in _INDEX.lookup((text or "").lower()):
+        kind, i = _ENTRIES[cue_id]
+        if kind == "category":
+            counts[i] += 1
+        elif level is None or i < level:
+            level = i
+    return _compose(counts, level)
+
+
+__all__ = ["StreamingEmotionInfer", "infer_emotion_from_text"]
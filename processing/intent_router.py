@@ -0,0 +1,80 @@
+# cabsaia/processing/intent_router.py
+"""
+Avoid-mode turn triage.
+
+IntentRouter folds the CLI's separate cue checks (affirm / negate openers,
+question and topic starters, "i want to talk" resume phrases, hard-stop
+expulsion phrases) into one compiled matcher and returns a single label:
+
+    hard_stop > negate > affirm > question_or_topic > other
+
+Hard-stop is read from the turn's TextAnalysis (precompiled matcher over
+the cleaned text, shared with detect_hard_stop); every other cue is found
+in one finditer pass of a single alternation regex over the raw text.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, List, Literal, Set
+
+from processing.text_analysis import TextAnalysis, TextLike
+
+Intent = Literal["hard_stop", "negate", "affirm", "question_or_topic", "other"]
+
+AFFIRM_OPENERS = ("yes", "yep", "yeah", "ok", "okay", "sure", "alright", "fine", "go on", "continue", "let's", "lets")
+NEGATE_OPENERS = ("no", "nah", "nope", "dont", "don't", "stop", "leave", "go away", "shut up")
+RESUME_PHRASES = ("i want to talk", "i want to continue", "i want to keep talking")
+# Common "topic / request" starters (permits implicit resume); plain prefix match
+TOPIC_STARTERS = (
+    "can you", "could you", "would you", "please", "help me", "tell me",
+    "what", "why", "how", "when", "where", "who", "i want", "i need", "let's", "lets",
+)
+
+
+def _alt(words: Iterable[str]) -> str:
+    return "|".join(re.escape(w) for w in words)
+
+
+class IntentRouter:
+    def __init__(self):
+        # Alternation order matters where cues overlap at the same position:
+        # openers first, resume phrases before the "i want" starter.
+        self._pattern = re.compile(
+            rf"(?P<negate>^\s*(?:{_alt(NEGATE_OPENERS)})\b)"
+            rf"|(?P<affirm>^\s*(?:{_alt(AFFIRM_OPENERS)})\b)"
+            rf"|(?P<resume>{_alt(RESUME_PHRASES)})"
+            rf"|(?P<topic>^(?:{_alt(TOPIC_STARTERS)}))"
+            r"|(?P<question>\?)",
+            re.IGNORECASE,
+        )
+
+    def cues(self, text: str) -> Set[str]:
+        """Names of every non-hard-stop cue group present in `text` (stripped)."""
+        return {m.lastgroup for m in self._pattern.finditer(text.strip())}
+
+    def classify(self, text: TextLike) -> Intent:
+        analysis = TextAnalysis.of(text)
+        if analysis.hard_stop:
+            return "hard_stop"
+        found = self.cues(analysis.raw)
+        if "negate" in found:
+            return "negate"
+        if "affirm" in found or "resume" in found:
+            return "affirm"
+        if "topic" in found or "question" in found:
+            return "question_or_topic"
+        return "other"
+
+    def classify_many(self, texts: Iterable[TextLike]) -> List[Intent]:
+        return [self.classify(t) for t in texts]
+
+
+INTENT_ROUTER = IntentRouter()
+
+
+def route_intent(text: TextLike) -> Intent:
+    return INTENT_ROUTER.classify(text)
+
+
+__all__ = ["Intent", "IntentRouter", "INTENT_ROUTER", "route_intent"]
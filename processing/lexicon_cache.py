@@ -0,0 +1,182 @@
+# cabsaia/processing/lexicon_cache.py
+"""
+On-disk cache for compiled lexicon matchers.
+
+Building the negator automaton and the emotion cue index at import costs
+tens of milliseconds per process, which dominates short-lived workers and
+CLI tools. load_or_build() stores the compiled matcher state (plain
+lists / dicts / strings / numbers only) as versioned JSON:
+
+    <cache dir>/<name>.v<FORMAT_VERSION>.json
+        {"format": FORMAT_VERSION, "name": ..., "hash": <sha256>, "state": ...}
+
+JSON rather than pickle: loading an artifact can never run code, even if
+someone else can write to the cache directory. JSON turns tuples into lists,
+so each matcher's from_state() converts back where it needs tuples.
+
+The hash covers the source files the matcher is built from (the lexicon
+module and the matcher code). On import the artifact is used only if format
+and hash match; otherwise the matcher is rebuilt and the file rewritten
+(atomically, so concurrent workers never read a partial file). Any I/O,
+decoding or serialisation problem falls back to a fresh, uncached build.
+
+Cache directory: $CABSAIA_LEXICON_CACHE, default the per-user cache
+directory ($XDG_CACHE_HOME or ~/.cache, %LOCALAPPDATA% on Windows) +
+cabsaia/lexicons, never the package tree. Set CABSAIA_LEXICON_CACHE=off to
+disable.
+
+Build / refresh every artifact (e.g. in a Docker build step):
+    python -m processing.lexicon_cache
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+# Bump when the layout of any exported matcher state changes.
+FORMAT_VERSION = 2
+
+_DISABLED = {"", "0", "off", "none", "false"}
+
+logger = logging.getLogger(__name__)
+
+
+def _user_cache_dir() -> Path:
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "cabsaia" / "lexicons"
+
+
+def cache_dir() -> Optional[Path]:
+    raw = os.environ.get("CABSAIA_LEXICON_CACHE")
+    if raw is None:
+        return _user_cache_dir()
+    if raw.strip().lower() in _DISABLED:
+        return None
+    return Path(raw)
+
+
+def artifact_path(name: str) -> Optional[Path]:
+    d = cache_dir()
+    return None if d is None else d / f"{name}.v{FORMAT_VERSION}.json"
+
+
+def source_hash(sources: Iterable[Path]) -> str:
+    h = hashlib.sha256(f"format={FORMAT_VERSION}".encode())
+    for src in sources:
+        h.update(Path(src).name.encode())
+        h.update(Path(src).read_bytes())
+    return h.hexdigest()
+
+
+def _read(path: Path, name: str, digest: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        blob = json.load(f)
+    if (
+        isinstance(blob, dict)
+        and blob.get("format") == FORMAT_VERSION
+        and blob.get("name") == name
+        and blob.get("hash") == digest
+    ):
+        return blob["state"]
+    return None
+
+
+def _write(path: Path, name: str, digest: str, state: Any) -> None:
+    # serialise first: a state JSON cannot represent never leaves a temp file behind
+    data = json.dumps(
+        {"format": FORMAT_VERSION, "name": name, "hash": digest, "state": state},
+        ensure_ascii=False, separators=(",", ":"),
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, path)  # atomic: concurrent readers never see a partial file
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def load_or_build(
+    name: str,
+    sources: Iterable[Path],
+    build: Callable[[], Any],
+    export: Callable[[Any], Any],
+    restore: Callable[[Any], Any],
+    rebuild: bool = False,
+) -> Any:
+    """
+    Return the matcher for `name`, restored from disk when the cached state
+    was produced from identical sources, otherwise built (and cached).
+
+    Args:
+        sources: files whose content determines the compiled matcher.
+        build: () -> matcher
+        export: matcher -> plain-data state (JSON-serialisable)
+        restore: state -> matcher (must accept lists where export produced tuples)
+        rebuild: ignore any existing artifact.
+    """
+    path = artifact_path(name)
+    if path is None:
+        return build()
+
+    try:
+        digest = source_hash(sources)
+    except OSError:
+        return build()
+
+    if not rebuild and path.exists():
+        try:
+            state = _read(path, name, digest)
+            if state is not None:
+                return restore(state)
+        except Exception as e:  # corrupt / incompatible artifact -> rebuild
+            logger.debug(f"[lexicon_cache] ignoring {path}: {e}")
+
+    obj = build()
+    try:
+        _write(path, name, digest, export(obj))
+    except (OSError, TypeError, ValueError) as e:  # read-only FS, unserialisable state: just not cached
+        logger.debug(f"[lexicon_cache] could not write {path}: {e}")
+    return obj
+
+
+def clear_cache() -> None:
+    d = cache_dir()
+    if d is None or not d.exists():
+        return
+    for p in d.glob("*.json"):
+        p.unlink()
+
+
+def main() -> None:
+    """Rebuild every lexicon artifact and report cold vs cached load times."""
+    from processing import context_negators, emotion_classifier
+
+    builders = [
+        ("context_negators", context_negators._load_detector),
+        ("emotion_cues", emotion_classifier._load_cue_index),
+    ]
+    for name, loader in builders:
+        t0 = time.perf_counter()
+        loader(rebuild=True)
+        t1 = time.perf_counter()
+        loader()
+        t2 = time.perf_counter()
+        print(f"{name:<18} build {1e3 * (t1 - t0):7.2f} ms   cached load {1e3 * (t2 - t1):7.2f} ms   -> {artifact_path(name)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# cabsaia/processing/lexicon_index.py
+r"""
+Hash index for whole-word lexicon lookups.
+
+`keyword_in_text(word, text)` is `re.search(r"\b" + word + r"\b", text)`.
+For a cue that starts and ends with a word character that is the same as
+asking whether the cue's run sequence (maximal \w runs and the non-word
+runs between them) appears in the text's run sequence starting at a word
+run. PhraseIndex answers that for a whole lexicon at once:
+
+- single-token cues: one dict lookup per text token
+- multiword cues ("at ease", "in my chest"): indexed by their first token,
+  then compared run-by-run against the text
+- anything else (cue starting/ending with punctuation): precompiled regex
+
+So a lookup costs O(tokens in the text), not O(cues in the lexicon).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Generic, Hashable, Iterable, List, Set, Tuple, TypeVar
+
+P = TypeVar("P", bound=Hashable)
+
+_RUN_RE = re.compile(r"\w+|\W+")
+_WORD_RE = re.compile(r"\w")
+
+
+def split_runs(text: str) -> List[str]:
+    """Split text into alternating maximal word / non-word runs."""
+    return _RUN_RE.findall(text)
+
+
+def _is_word_run(run: str) -> bool:
+    return bool(_WORD_RE.match(run))
+
+
+class PhraseIndex(Generic[P]):
+    r"""Whole-word (`\b...\b`) lookup of many cues in one pass over the text."""
+
+    def __init__(self) -> None:
+        self._single: Dict[str, List[P]] = {}
+        self._multi: Dict[str, List[Tuple[Tuple[str, ...], P]]] = {}
+        self._fallback: List[Tuple[re.Pattern[str], P]] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def has_fallback(self) -> bool:
+        """True if some cue starts/ends with a non-word char (regex path, needs the whole text)."""
+        return bool(self._fallback)
+
+    @property
+    def max_runs(self) -> int:
+        """Longest indexed cue, in runs (1 for single tokens)."""
+        longest = 1 if self._single else 0
+        for cands in self._multi.values():
+            for cue_runs, _ in cands:
+                longest = max(longest, len(cue_runs))
+        return longest
+
+    def export_state(self) -> tuple:
+        """Plain-data snapshot (see processing.lexicon_cache)."""
+        fallback = [(pat.pattern, payload) for pat, payload in self._fallback]
+        return self._single, self._multi, fallback, self._size
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "PhraseIndex[P]":
+        obj = cls()
+        obj._single, multi, fallback, obj._size = state
+        # JSON-restored state has lists where export produced tuples
+        obj._multi = {k: [(tuple(runs), payload) for runs, payload in v] for k, v in multi.items()}
+        obj._fallback = [(re.compile(pattern), payload) for pattern, payload in fallback]
+        return obj
+
+    def add(self, cue: str, payload: P) -> None:
+        if not cue:
+            return
+        self._size += 1
+        runs = tuple(split_runs(cue))
+        if not (_is_word_run(runs[0]) and _is_word_run(runs[-1])):
+            self._fallback.append((re.compile(r"\b" + re.escape(cue) + r"\b"), payload))
+        elif len(runs) == 1:
+            self._single.setdefault(cue, []).append(payload)
+        else:
+            self._multi.setdefault(runs[0], []).append((runs, payload))
+
+    def add_all(self, cues: Iterable[str], payload: P) -> None:
+        for cue in cues:
+            self.add(cue, payload)
+
+    def lookup(self, text: str) -> Set[P]:
+        """Payloads of every cue that occurs in `text` as a whole word / phrase."""
+        found: Set[P] = set()
+        if not text:
+            return found
+
+        runs = split_runs(text)
+        self.scan_runs(runs, 0, len(runs), found)
+
+        for pat, payload in self._fallback:
+            if pat.search(text):
+                found.add(payload)
+        return found
+
+    def scan_runs(
+        self, runs: List[str], start: int, stop: int, found: Set[P], multiword: bool = True
+    ) -> Set[P]:
+        """
+        Add to `found` the payloads of word-anchored cues starting at runs[start:stop].
+        A multiword cue may extend past `stop`, up to the end of `runs`.
+        With multiword=False only single-token cues are checked.
+        """
+        single, multi = self._single, self._multi
+        n = len(runs)
+        for i in range(start, stop):
+            run = runs[i]
+            hits = single.get(run)
+            if hits:
+                found.update(hits)
+            cands = multi.get(run) if multiword else None
+            if cands:
+                for cue_runs, payload in cands:
+                    k = len(cue_runs)
+                    if i + k <= n and tuple(runs[i:i + k]) == cue_runs:
+                        found.add(payload)
+        return found
+
+
+__all__ = ["PhraseIndex", "split_runs"]
@@ -0,0 +1,186 @@
+# cabsaia/processing/result_cache.py
+"""
+Opt-in LRU cache for per-utterance classification results.
+
+Production traffic repeats a lot after normalisation ("ok", "thanks",
+"stop", "go away"). When enabled, TextAnalysis (and through it
+analyse_emotion_from_text / infer_feedback_score / get_negator_hits) and
+context_negators.detect_negators look up each stage here before computing it.
+
+- Keyed by the stage name plus the text form(s) the stage reads: negators
+  by the normalised text, emotion / feedback_score by (cleaned, normalised),
+  since the classifier and the negator detector normalise slightly
+  differently. A hit is always exactly what a fresh computation returns.
+- Size-bounded LRU with hit / miss / eviction counters.
+- Entries are stored frozen (dict -> read-only mapping, list -> tuple) so no
+  caller can corrupt a shared entry; lookup() hands out a thawed copy, so the
+  public functions return plain dicts / lists whether the cache is on or off.
+- invalidate_result_cache() first runs the registered rebuild hooks (the
+  negator automaton and the emotion cue index are rebuilt from the in-memory
+  lexicons), then drops every entry. Call it after editing a lexicon.
+
+Usage:
+    from processing.result_cache import enable_result_cache
+    enable_result_cache(maxsize=10_000)
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Hashable, List, Optional
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class FrozenList(tuple):
+    """Tuple that remembers it was a list (so thaw() restores the exact type)."""
+    __slots__ = ()
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into FrozenList tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    if isinstance(value, tuple):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of freeze(): read-only mappings -> dicts, FrozenList -> list, tuples stay tuples."""
+    if isinstance(value, MappingProxyType):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, FrozenList):
+        return [thaw(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(thaw(v) for v in value)
+    return value
+
+
+class ResultCache:
+    """Thread-safe, size-bounded LRU of frozen results."""
+
+    def __init__(self, maxsize: int = 4096):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = int(maxsize)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # compute outside the lock; a concurrent miss on the same key just recomputes
+        value = freeze(compute())
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self._data), self.maxsize)
+
+
+# -----------------------------------------------------------------------------
+# Process-wide opt-in cache (disabled by default)
+# -----------------------------------------------------------------------------
+_ACTIVE: Optional[ResultCache] = None
+_REBUILD_HOOKS: List[Callable[[], None]] = []
+
+
+def enable_result_cache(maxsize: int = 4096) -> ResultCache:
+    global _ACTIVE
+    _ACTIVE = ResultCache(maxsize)
+    return _ACTIVE
+
+
+def disable_result_cache() -> None:
+    global _ACTIVE
+    _ACTIVE = None
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    return _ACTIVE
+
+
+def lookup(key: Hashable, compute: Callable[[], Any]) -> Any:
+    """compute() through the active cache (if any); always returns plain, unshared values."""
+    cache = _ACTIVE
+    if cache is None:
+        return compute()
+    return thaw(cache.get_or_compute(key, compute))
+
+
+def register_rebuild_hook(hook: Callable[[], None]) -> Callable[[], None]:
+    """Register a matcher rebuild to run on invalidate_result_cache() (usable as a decorator)."""
+    _REBUILD_HOOKS.append(hook)
+    return hook
+
+
+def invalidate_result_cache() -> None:
+    """
+    Call after changing CONTEXT_NEGATORS / emotion dictionaries at runtime:
+    rebuilds the lexicon matchers, then drops cached results (even when the
+    cache is disabled, the matchers are rebuilt).
+    """
+    for hook in list(_REBUILD_HOOKS):
+        hook()
+    if _ACTIVE is not None:
+        _ACTIVE.invalidate()
+
+
+__all__ = [
+    "CacheStats",
+    "ResultCache",
+    "FrozenList",
+    "freeze",
+    "thaw",
+    "lookup",
+    "register_rebuild_hook",
+    "enable_result_cache",
+    "disable_result_cache",
+    "get_result_cache",
+    "invalidate_result_cache",
+]
@@ -0,0 +1,100 @@
+# cabsaia/processing/text_analysis.py
+"""
+Per-utterance text analysis shared by every stage of a turn.
+
+A TextAnalysis wraps one raw user message and computes each derived view
+(cleaned / normalised text, tokens, negator hits, emotion keywords,
+hard-stop status, feedback score) lazily and at most once. The public
+functions in processing.emotion_classifier accept either a plain string
+or a TextAnalysis, so callers that hold one never re-scan the message.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from processing.context_negators import detect_negators_normalised, normalise_text
+from processing.result_cache import lookup
+
+
+def clean_text(raw: str) -> str:
+    """Lowercase, normalise apostrophes, remove punctuation (keep apostrophes), collapse whitespace."""
+    text = (raw or "").lower().strip()
+    text = text.replace("\u2019", "'").replace("\u2018", "'").replace("`", "'")
+    text = re.sub(r"[^\w\s']", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+class TextAnalysis:
+    """
+    Lazily evaluated analysis of a single utterance.
+
+    Every property is computed on first access and then cached on the
+    instance, so a turn that consults hard-stop, emotion and feedback only
+    cleans, normalises and scans the message once. If the process-wide
+    result cache is enabled (processing.result_cache), the lexicon stages
+    are also shared across utterances with the same normalised text; the
+    values returned are plain dicts / lists either way.
+    """
+
+    def __init__(self, raw: str):
+        self.raw: str = raw or ""
+
+    @classmethod
+    def of(cls, text: "TextLike") -> "TextAnalysis":
+        """Return `text` unchanged if it is already an analysis, otherwise wrap it."""
+        return text if isinstance(text, cls) else cls(text)  # type: ignore[arg-type]
+
+    def __repr__(self) -> str:
+        return f"TextAnalysis({self.raw!r})"
+
+    # ---- text views -----------------------------------------------------
+    @cached_property
+    def cleaned(self) -> str:
+        return clean_text(self.raw)
+
+    @cached_property
+    def normalised(self) -> str:
+        return normalise_text(self.raw)
+
+    @cached_property
+    def tokens(self) -> Tuple[str, ...]:
+        return tuple(self.cleaned.split())
+
+    def _stage(self, name: str, compute: Callable[[], Any]) -> Any:
+        return lookup((name, self.cleaned, self.normalised), compute)
+
+    # ---- lexicon hits ---------------------------------------------------
+    @cached_property
+    def negators(self) -> Dict[str, List[str]]:
+        return detect_negators_normalised(self.normalised)
+
+    @cached_property
+    def emotion(self) -> Dict[str, Any]:
+        from processing.emotion_classifier import _analyse_emotion
+        return self._stage("emotion", lambda: _analyse_emotion(self))
+
+    @property
+    def keywords(self) -> List[Tuple[str, str]]:
+        return self.emotion["keywords"]
+
+    # ---- decisions ------------------------------------------------------
+    @cached_property
+    def hard_stop(self) -> bool:
+        # Cheaper than a cache lookup (which would also normalise): never cached.
+        from processing.emotion_classifier import _detect_hard_stop
+        return _detect_hard_stop(self)
+
+    @cached_property
+    def feedback_score(self) -> float:
+        from processing.emotion_classifier import _infer_feedback_score
+        return self._stage("feedback_score", lambda: _infer_feedback_score(self))
+
+
+TextLike = Union[str, TextAnalysis]
+
+
+__all__ = ["TextAnalysis", "TextLike", "clean_text"]
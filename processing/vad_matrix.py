@@ -0,0 +1,122 @@
+# cabsaia/processing/vad_matrix.py
+"""
+Vectorised VAD scoring for batches of LLM replies.
+
+The emotion_infer lexicon is compiled once into arrays:
+
+- cue -> category (`cue_category`; each keyword cue belongs to exactly one
+  category, so this vector *is* the sparse cue x category incidence matrix)
+- category -> (VAD dimension, base score)
+- cue -> intensity level, as a separate vector (`intensity_level`)
+
+A batch of messages becomes a sparse bag-of-cues in COO form
+(row = message, col = cue id). Scoring is then a handful of NumPy array
+operations over the whole batch instead of a Python loop per message: the
+bag x incidence product is one bincount into per-message category counts.
+The weights are applied in factored form (counts per category, then base
+score, then intensity) rather than through a precomputed cue -> VAD weight
+matrix, because that is the order in which
+processing.emotion_infer.infer_emotion_from_text multiplies and sums, so
+every row is bit-identical to it.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from processing import emotion_infer
+
+DIMENSIONS: Tuple[str, ...] = ("valence", "arousal", "dominance")
+
+
+class VADMatrixScorer:
+    def __init__(self):
+        categories = emotion_infer._CATEGORIES
+        levels = emotion_infer._LEVELS
+        entries = emotion_infer._ENTRIES
+
+        self._index = emotion_infer._INDEX
+        self.n_cues = len(entries)
+        self.n_categories = len(categories)
+        self.n_levels = len(levels)
+
+        # cue -> category (-1 for intensity cues) / level (n_levels for keyword cues)
+        self.cue_category = np.full(self.n_cues, -1, dtype=np.int64)
+        self.intensity_level = np.full(self.n_cues, self.n_levels, dtype=np.int64)
+        for cue_id, (kind, i) in enumerate(entries):
+            if kind == "category":
+                self.cue_category[cue_id] = i
+            else:
+                self.intensity_level[cue_id] = i
+
+        # category -> (dimension column, base score)
+        self.category_dim = np.array(
+            [DIMENSIONS.index(emotion_infer._DIM_MAPPING[c][0]) for c in categories], dtype=np.int64
+        )
+        self.category_base = np.array([emotion_infer._DIM_MAPPING[c][1] for c in categories], dtype=np.float64)
+
+        # level index -> multiplier; trailing entry = "no intensity cue"
+        self.level_score = np.array(
+            [emotion_infer._INTENSITY_SCORE.get(lv, 1.0) for lv in levels] + [1.0], dtype=np.float64
+        )
+
+    def bag(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Sparse bag-of-cues in COO form: (rows, cue_ids, n_messages). Each cue counts once per message."""
+        rows: List[int] = []
+        cols: List[int] = []
+        n = 0
+        for n, text in enumerate(texts, start=1):
+            hits = self._index.lookup((text or "").lower())
+            rows.extend([n - 1] * len(hits))
+            cols.extend(hits)
+        return np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64), n
+
+    def score_bag(self, rows: np.ndarray, cols: np.ndarray, n: int) -> np.ndarray:
+        """(n, 3) array of clamped valence/arousal/dominance deltas."""
+        out = np.zeros((n, len(DIMENSIONS)), dtype=np.float64)
+        if n == 0:
+            return out
+
+        cat = self.cue_category[cols]
+        is_kw = cat >= 0
+
+        # per-message category counts: sparse incidence product via bincount
+        counts = np.bincount(
+            rows[is_kw] * self.n_categories + cat[is_kw], minlength=n * self.n_categories
+        ).reshape(n, self.n_categories)
+
+        # per-message intensity = highest-priority (lowest index) level present
+        level = np.full(n, self.n_levels, dtype=np.int64)
+        np.minimum.at(level, rows[~is_kw], self.intensity_level[cols[~is_kw]])
+        scale = self.level_score[level]
+
+        contrib = (counts * self.category_base) * scale[:, None]
+        for c in range(self.n_categories):
+            out[:, self.category_dim[c]] += contrib[:, c]
+
+        np.clip(out[:, 0], -1.0, 1.0, out=out[:, 0])
+        np.clip(out[:, 1:], 0.0, 1.0, out=out[:, 1:])
+        return out
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        return self.score_bag(*self.bag(texts))
+
+
+_SCORER: VADMatrixScorer | None = None
+
+
+def get_scorer() -> VADMatrixScorer:
+    global _SCORER
+    if _SCORER is None:
+        _SCORER = VADMatrixScorer()
+    return _SCORER
+
+
+def score_texts(texts: Sequence[str]) -> np.ndarray:
+    """Vectorised infer_emotion_from_text over a batch: (len(texts), 3) array."""
+    return get_scorer().score(texts)
+
+
+__all__ = ["DIMENSIONS", "VADMatrixScorer", "get_scorer", "score_texts"]
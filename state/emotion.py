@@ -1,19 +1,29 @@
 # cabsaia/state/emotion.py
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import math
 import random
-from typing import Dict
+import time
+from typing import Callable, Dict, Optional, Tuple
 
 THRESHOLDS = {
     'burnout': 5.0,                # 超过此债务阈值即进入情绪耗竭状态
     'resilience_floor': 0.2        # 弹性最低保护限
 }
 
+# 惰性衰减的时间换算：墙钟多少秒折合 apply_emotional_maintenance 的 1 个 time_passed 单位
+SECONDS_PER_TIME_UNIT = 60.0
+
 @dataclass
 class EmotionalState:
     """
     增强型情绪状态类：支持动态恢复、人格建模、应对策略选择
+
+    自然恢复是惰性的：字段保存的是 last_update 时刻的锚点值（不是当前值），读取（current /
+    投影 / 策略选择 / 耗竭检查）时按闭式解算出经过 now - last_update 后的衰减结果，
+    不写回字段；只有真实事件（update / apply_* / 触发应对机制）才先结算再落盘。
+    arousal 的线性插值规律不可分段叠加，因此检查的调用频率不会影响状态；
+    需要当前数值时请用 current()，不要直接读字段。
     """
     valence: float = 0.0            # 情绪正负性（-1~1）
     arousal: float = 0.0            # 激活水平（0~1）
@@ -21,12 +31,15 @@ class EmotionalState:
     resilience: float = 1.0         # 情绪弹性（越高越易恢复）
     emotion_debt: float = 0.0       # 情绪负荷（累计的负面影响）
     personality_type: str = "neutral"  # 人格类型
-    last_update: float = 0.0        # 最近一次更新时间（未来拓展用）
+    last_update: float = 0.0        # 字段值对应的时间（epoch 秒）；0 表示取构造时刻
+    clock: Callable[[], float] = field(default=time.time, repr=False, compare=False)
 
     def __post_init__(self):
         """初始化后载入人格配置和恢复模型参数"""
         self._load_personality_params()
         self._init_recovery_model()
+        if not self.last_update:
+            self.last_update = self.clock()
 
     def _load_personality_params(self):
         """加载人格类型对应的情绪恢复参数"""
@@ -42,9 +55,49 @@ class EmotionalState:
         """初始化恢复模型的时间影响系数"""
         self.time_factor = 0.1
         self.debt_recovery_rate = 0.05
-    
+
+    # ------------------------------------------------------------------
+    # 惰性恢复
+    # ------------------------------------------------------------------
+    def _recovered(self, time_passed: float) -> Tuple[float, float, float, float]:
+        """
+        恢复规律的闭式解：(valence, arousal, emotion_debt, resilience) 经过 time_passed 后的值。
+        arousal 的插值系数封顶为 1（长时间闲置后回到人格基线，不越过）。
+        """
+        if time_passed <= 0:
+            return self.valence, self.arousal, self.emotion_debt, self.resilience
+        rate = self.params['recovery_rate']
+        return (
+            self._exponential_decay(self.valence, rate * time_passed),
+            self._linear_interpolate(self.arousal, self.params['arousal_base'], min(1.0, rate * time_passed)),
+            max(0, self.emotion_debt - time_passed * self.debt_recovery_rate),
+            min(1.0, self.resilience + time_passed * rate * 0.1),
+        )
+
+    def _elapsed_units(self, now: Optional[float]) -> float:
+        now = self.clock() if now is None else now
+        return (now - self.last_update) / SECONDS_PER_TIME_UNIT
+
+    def current(self, now: Optional[float] = None) -> Dict[str, float]:
+        """读取 now（默认当前时间）时刻的情绪状态，不修改字段"""
+        valence, arousal, debt, resilience = self._recovered(self._elapsed_units(now))
+        return dict(valence=valence, arousal=arousal, dominance=self.dominance,
+                    resilience=resilience, emotion_debt=debt)
+
+    def settle(self, now: Optional[float] = None) -> None:
+        """把截至 now 的自然恢复写回字段，并把 last_update 推进到 now"""
+        now = self.clock() if now is None else now
+        self.valence, self.arousal, self.emotion_debt, self.resilience = self._recovered(
+            self._elapsed_units(now)
+        )
+        self.last_update = now
+
+    # ------------------------------------------------------------------
+    # 事件
+    # ------------------------------------------------------------------
     def apply_valence_arousal(self, valence: float, arousal: float, dominance: float = 0.0, weight: float = 1.0):
         """直接设置 valence/arousal/dominance（可选）为新值（带权重），用于与LLM等外部模块交互"""
+        self.settle()
         self.valence = self._clamp(self.valence * (1 - weight) + valence * weight, -1.0, 1.0)
         self.arousal = self._clamp(self.arousal * (1 - weight) + arousal * weight, 0.0, 1.0)
         self.dominance = self._clamp(self.dominance * (1 - weight) + dominance * weight, 0.0, 1.0)
@@ -53,6 +106,7 @@ class EmotionalState:
         """
         应用一次情绪变化事件：更新valence/arousal/dominance 并计算债务与弹性
         """
+        self.settle()
         self.valence = self._clamp(self.valence + delta_valence, -1.0, 1.0)
         self.arousal = self._clamp(self.arousal + delta_arousal, 0.0, 1.0)
         self.dominance = self._clamp(self.dominance + delta_dominance, 0.0, 1.0)
@@ -67,16 +121,15 @@ class EmotionalState:
 
     def apply_emotional_maintenance(self, time_passed: float):
         """
-        应用一段时间过去后的情绪自然恢复过程
+        额外施加 time_passed 个单位的自然恢复（模拟/测试用；真实时间的恢复已由惰性衰减覆盖）
         """
-        self.valence = self._exponential_decay(self.valence, self.params['recovery_rate'] * time_passed)
-        self.arousal = self._linear_interpolate(self.arousal, self.params['arousal_base'], self.params['recovery_rate'] * time_passed)
-        self.emotion_debt = max(0, self.emotion_debt - time_passed * self.debt_recovery_rate)
-        self.resilience = min(1.0, self.resilience + time_passed * self.params['recovery_rate'] * 0.1)
+        self.settle()
+        self.valence, self.arousal, self.emotion_debt, self.resilience = self._recovered(time_passed)
 
     def check_burnout_risk(self) -> bool:
-        """情绪负荷是否已达到耗竭风险阈值"""
-        if self.emotion_debt > THRESHOLDS['burnout']:
+        """情绪负荷是否已达到耗竭风险阈值（未达阈值时只读，不推进锚点）"""
+        if self.current()["emotion_debt"] > THRESHOLDS['burnout']:
+            self.settle()  # 触发应对机制是一次真实事件
             self._trigger_coping_mechanism()
             return True
         return False
@@ -96,18 +149,21 @@ class EmotionalState:
 
     def select_coping_strategy(self) -> str:
         """策略选择逻辑：根据当前 valence / dominance / arousal 决定应对类型"""
-        if self.valence < -0.5 and self.dominance > 0.5:
+        now = self.current()
+        valence, dominance = now["valence"], now["dominance"]
+        if valence < -0.5 and dominance > 0.5:
             return "problem_focused"
-        elif self.valence < -0.5 and self.dominance < 0.5:
+        elif valence < -0.5 and dominance < 0.5:
             return "emotion_focused"
-        elif self.arousal > 0.8:
+        elif now["arousal"] > 0.8:
             return "relaxation"
         return "none"
 
     def get_2d_projection(self) -> Dict[str, float]:
         """将当前情绪状态映射到二维空间（用于可视化）"""
-        x = self.valence * self.arousal
-        y = self.dominance * (1 - abs(self.valence))
+        now = self.current()
+        x = now["valence"] * now["arousal"]
+        y = now["dominance"] * (1 - abs(now["valence"]))
         return {"x": x, "y": y}
 
     def reset(self):
@@ -117,6 +173,7 @@ class EmotionalState:
         self.dominance = 0.0
         self.resilience = 1.0
         self.emotion_debt = 0.0
+        self.last_update = self.clock()
 
     # 工具函数
     def _clamp(self, value: float, min_val: float, max_val: float) -> float:
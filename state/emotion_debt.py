@@ -1,12 +1,16 @@
 # 文件：cabsaia/state/emotion_debt.py
 
+DEBT_THRESHOLD = 5.0     # θ：债务饱和点
+DEBT_BASE_GROWTH = 0.5   # α：基础增长率
+
+
 def calculate_nonlinear_debt(current_debt: float, feedback_strength: float) -> float:
     """
     非线性情绪债务累积模型：
     Dₙ = Dₙ₋₁ + (1 - Dₙ₋₁/θ) * α * S
     """
-    threshold = 5.0
-    base_growth = 0.5
+    threshold = DEBT_THRESHOLD
+    base_growth = DEBT_BASE_GROWTH
     intensity_coeff = 0.5 + abs(feedback_strength) * 1.0
     return current_debt + (1 - current_debt / threshold) * base_growth * intensity_coeff
 
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import math
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from state.emotion_debt import calculate_nonlinear_debt
+from state.emotion_debt import DEBT_BASE_GROWTH, DEBT_THRESHOLD, calculate_nonlinear_debt
+from state.feedback_history import DEFAULT_HISTORY_RETENTION, FeedbackRing, HistoryStore
+from state.session_locks import lock_for
+from state.strategy_log import emit
 
 # Default threshold baselines (can be expanded later)
 BASE_THRESHOLDS: Dict[str, float] = {
@@ -13,6 +17,16 @@ BASE_THRESHOLDS: Dict[str, float] = {
 }
 
 
+def _history_store(state: "FRRState") -> HistoryStore:
+    """Wrap state.history with the state's retention / forgetting / rollup settings."""
+    return HistoryStore(
+        state.history,
+        retention=state.history_retention,
+        forgetting=state.stats_forgetting,
+        rollup=getattr(state, "history_rollup", False),
+    )
+
+
 class UserProfile:
     """Minimal user profile; extendable."""
     def __init__(self, personality: str = "neutral"):
@@ -26,14 +40,16 @@ class FRRState:
 
     Design goals:
     - Maintain stable, simple state variables (debt/resilience/energy).
-    - Log feedback history with timestamps for short-window statistics.
+    - Log feedback history with timestamps for short-window statistics
+      (bounded per-strategy ring buffers, see state/feedback_history.py).
     - Provide a *method* recent_avg_feedback() consumed by RoleEngine.
     """
     emotion_debt: float = 0.0
     resilience: float = 1.0
 
-    # History bucketed by strategy (backward compatible with your current code/tests)
-    history: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    # History bucketed by strategy (backward compatible with your current code/tests):
+    # each bucket is a FeedbackRing that reads like a list of event dicts.
+    history: Dict[str, FeedbackRing] = field(default_factory=HistoryStore)
 
     energy: float = 1.0
     time_active: int = 0
@@ -44,15 +60,27 @@ class FRRState:
 
     user_profile: UserProfile = field(default_factory=UserProfile)
 
-    # NOTE: last_style should be coping style token, not burst key.
-    last_style: str = "baseline"
+    # NOTE: last_style should be coping style token, not burst key
+    # ("emotion_focused" is what RoleEngine picks for the baseline burst level).
+    last_style: str = "emotion_focused"
     last_switch_time: float = 0.0  # epoch seconds (used for prompt tone cooldown)
+    # RoleEngine decision state (kept here so one shared engine can serve many sessions)
+    last_burst_level: str = "baseline"
+    last_prompt_style: str = "baseline"
 
     strategy_state: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
+    # Max events kept per strategy bucket (older ones are overwritten)
+    history_retention: int = DEFAULT_HISTORY_RETENTION
+    # Exponential forgetting for per-strategy feedback stats (1.0 = no forgetting)
+    stats_forgetting: float = 1.0
+    # Compact overwritten events into minute/hour/day buckets instead of dropping them
+    history_rollup: bool = False
+
     burst_thresholds: Dict[str, float] = field(init=False)
 
     def __post_init__(self) -> None:
+        self.history = _history_store(self)
         self.burst_thresholds = {
             "energy": self._calc_threshold("energy"),
             "debt": self._calc_threshold("debt"),
@@ -74,20 +102,27 @@ class FRRState:
         IMPORTANT:
         - Uses epoch timestamps (float) to avoid datetime/float subtraction bugs.
         - Expects history[strategy] entries to have {"feedback": float, "timestamp": float}.
+        - O(log retention): binary search on timestamps + running-sum difference.
         """
-        events = self.history.get(strategy, [])
+        events = self.history.get(strategy)
         if not events:
             return 0.0
+        if not isinstance(events, FeedbackRing):
+            events = FeedbackRing(max(1, len(events)), events)
+        return events.mean_since(time.time() - window_secs)
 
-        now = time.time()
-        recent_scores: List[float] = []
-        for item in events:
-            ts = item.get("timestamp")
-            fb = item.get("feedback", 0.0)
-            if isinstance(ts, (int, float)) and (now - float(ts)) <= window_secs:
-                recent_scores.append(float(fb))
-
-        return (sum(recent_scores) / len(recent_scores)) if recent_scores else 0.0
+    def feedback_window(self, strategy: str, window_secs: float) -> Dict[str, float]:
+        """
+        count / mean / std_dev / min / max / energy_mean of a strategy's feedback
+        over the last window_secs. With history_rollup the window may reach past
+        the raw ring into the minute/hour/day buckets (bucket-width resolution).
+        """
+        events = self.history.get(strategy)
+        if events is None:
+            events = ()
+        if not isinstance(events, FeedbackRing):
+            events = FeedbackRing(max(1, len(events)), events)
+        return events.window_stats(time.time() - window_secs)
 
 
 # Optional global state instance (as in your original file)
@@ -98,6 +133,18 @@ def _clamp(x: float, lo: float = 0.0, hi: float = 1.0) -> float:
     return max(lo, min(hi, x))
 
 
+# Coefficients of _update_energy_internal (also read by fast_forward_frr / FRRPopulation)
+ENERGY_COEFFS: Dict[str, float] = {
+    "drain_base": 0.10,          # negative feedback: drain = base + scale * |fb| ...
+    "drain_scale": 0.10,
+    "drain_resilience": 0.60,    # ... times (1 + k * (1 - resilience))
+    "recover_scale": 0.04,       # positive feedback: scale * fb + k * resilience
+    "recover_resilience": 0.02,
+    "fatigue": 0.01,             # neutral feedback: fatigue * (1 + k * (1 - resilience))
+    "fatigue_resilience": 0.30,
+}
+
+
 def _update_energy_internal(state: FRRState, feedback_score: float, external_energy: Optional[float]) -> float:
     """
     P0.2: Energy must be a real state variable, not a constant passthrough.
@@ -111,29 +158,46 @@ def _update_energy_internal(state: FRRState, feedback_score: float, external_ene
 
     fb = float(feedback_score)
     res = float(state.resilience)
+    c = ENERGY_COEFFS
 
     if fb < 0:
         # Drain: stronger when resilience is low.
         # fb in [-1,0): abs(fb) in (0,1]
-        drain = 0.10 + 0.10 * abs(fb)          # -1 => 0.20
-        mod = 1.0 + 0.60 * (1.0 - res)         # res=1 => 1.0, res=0.2 => 1.48
+        drain = c["drain_base"] + c["drain_scale"] * abs(fb)  # -1 => 0.20
+        mod = 1.0 + c["drain_resilience"] * (1.0 - res)      # res=1 => 1.0, res=0.2 => 1.48
         base -= drain * mod
     elif fb > 0:
         # Recover: slower than drain.
-        recover = 0.04 * fb + 0.02 * res       # +1 => up to 0.06
+        recover = c["recover_scale"] * fb + c["recover_resilience"] * res  # +1 => up to 0.06
         base += recover
     else:
         # Mild fatigue drift; slightly worse if resilience is low.
-        base -= 0.01 * (1.0 + 0.30 * (1.0 - res))
+        base -= c["fatigue"] * (1.0 + c["fatigue_resilience"] * (1.0 - res))
 
     return _clamp(base, 0.0, 1.0)
 
 
+# Per-event resilience step by feedback sign: (delta, clamp bound)
+RESILIENCE_STEPS: Dict[int, Tuple[float, float]] = {1: (0.05, 1.0), -1: (-0.03, 0.2), 0: (-0.005, 0.2)}
+
+
+def _sign(x: float) -> int:
+    return (x > 0) - (x < 0)
+
+
+def _next_resilience(resilience: float, feedback: float) -> float:
+    step, bound = RESILIENCE_STEPS[_sign(feedback)]
+    if step > 0:
+        return min(bound, resilience + step)
+    return max(bound, resilience + step)
+
+
 def update_frr(
     state: FRRState,
     strategy: str,
     feedback_score: float,
     system_energy: Optional[float] = None,
+    timestamp: Optional[float] = None,
 ) -> None:
     """
     Update FRR state with a new feedback sample.
@@ -144,37 +208,115 @@ def update_frr(
     - kept signature backward compatible: system_energy is optional.
 
     Notes:
-    - Stores timestamps as epoch seconds (float) for consistency.
+    - Stores timestamps as epoch seconds (float) for consistency; timestamp
+      overrides time.time() (used when replaying strategy_log.jsonl).
     - Keeps history bucketed by strategy to preserve existing behaviour.
     """
-    # Ensure bucket
-    if strategy not in state.history:
-        state.history[strategy] = []
+    with lock_for(state):
+        # Ensure bucket (re-wrap if a caller replaced history with a plain dict)
+        if not isinstance(state.history, HistoryStore):
+            state.history = _history_store(state)
+        bucket = state.history.bucket(strategy)
 
-    fb = float(feedback_score)
+        fb = float(feedback_score)
+
+        # Update resilience FIRST (so energy modulation can read the updated resilience if you prefer)
+        state.resilience = _next_resilience(state.resilience, fb)
+
+        # Update energy (dynamic)
+        state.energy = _update_energy_internal(state, fb, system_energy)
+
+        # Update emotion debt (delegate to your debt function)
+        state.emotion_debt = calculate_nonlinear_debt(state.emotion_debt, fb)
 
-    # Update resilience FIRST (so energy modulation can read the updated resilience if you prefer)
-    if fb > 0:
-        state.resilience = min(1.0, state.resilience + 0.05)
-    elif fb < 0:
-        state.resilience = max(0.2, state.resilience - 0.03)
+        # Log event (store UPDATED energy); also advances the bucket's OnlineStats in O(1)
+        ts = float(time.time() if timestamp is None else timestamp)
+        bucket.record(fb, ts, float(state.energy))
+        emit(state, "update_frr", strategy=strategy, feedback=fb, system_energy=system_energy, ts=ts)
+
+
+def _resilience_run(resilience: float, feedback: float, n: int) -> Tuple[float, float]:
+    """
+    Closed form for n resilience steps with the same feedback sign.
+    Returns (resilience after n steps, sum of the resilience values after each step).
+    """
+    step, bound = RESILIENCE_STEPS[_sign(feedback)]
+    # number of steps before the clamp bound is reached
+    free = max(0, min(n, math.floor((bound - resilience) / step)))
+    total = free * resilience + step * free * (free + 1) / 2 + (n - free) * bound
+    final = resilience + step * n if free == n else bound
+    return final, total
+
+
+def _energy_run(energy: float, feedback: float, res_total: float, n: int) -> float:
+    """
+    Energy after n steps of _update_energy_internal (no external energy), given
+    the sum of the per-step resilience values. Every step moves energy in the
+    same direction, so the clamp only needs applying once at the end.
+    """
+    fb = float(feedback)
+    c = ENERGY_COEFFS
+    if fb < 0:
+        k = c["drain_resilience"]
+        delta = -(c["drain_base"] + c["drain_scale"] * abs(fb)) * ((1.0 + k) * n - k * res_total)
+    elif fb > 0:
+        delta = c["recover_scale"] * fb * n + c["recover_resilience"] * res_total
     else:
-        state.resilience = max(0.2, state.resilience - 0.005)
+        k = c["fatigue_resilience"]
+        delta = -c["fatigue"] * ((1.0 + k) * n - k * res_total)
+    return _clamp(energy + delta, 0.0, 1.0)
 
-    # Update energy (dynamic)
-    state.energy = _update_energy_internal(state, fb, system_energy)
 
-    # Update emotion debt (delegate to your debt function)
-    state.emotion_debt = calculate_nonlinear_debt(state.emotion_debt, fb)
+def fast_forward_frr(
+    state: FRRState,
+    strategy: str,
+    feedback_score: float,
+    n: int,
+    system_energy: Optional[float] = None,
+    timestamp: Optional[float] = None,
+) -> None:
+    """
+    Equivalent of calling update_frr n times with the same feedback, in O(log n).
 
-    # Log event (store UPDATED energy)
-    state.history[strategy].append(
-        {
-            "feedback": fb,
-            "timestamp": float(time.time()),
-            "energy": float(state.energy),
-        }
-    )
+    - debt follows the affine map D' = a*D + b (a = 1 - c/θ, b = c); n steps
+      collapse to D_n = θ + (D - θ) * a**n.
+    - resilience moves linearly until its clamp bound; energy then depends only
+      on the sum of the resilience values along the way.
+    - a single aggregated history record is written (feedback, final energy);
+      the bucket's OnlineStats still counts n samples.
+
+    Results match the step-by-step loop up to float rounding.
+    """
+    n = int(n)
+    if n <= 0:
+        return
+    with lock_for(state):
+        if not isinstance(state.history, HistoryStore):
+            state.history = _history_store(state)
+        bucket = state.history.bucket(strategy)
+        fb = float(feedback_score)
+
+        # First step exactly as update_frr (brings out-of-range values inside the clamps)
+        state.resilience = _next_resilience(state.resilience, fb)
+        state.energy = _update_energy_internal(state, fb, system_energy)
+        state.emotion_debt = calculate_nonlinear_debt(state.emotion_debt, fb)
+
+        rest = n - 1
+        if rest:
+            state.resilience, res_total = _resilience_run(state.resilience, fb, rest)
+            if system_energy is None:
+                state.energy = _energy_run(state.energy, fb, res_total, rest)
+            else:
+                # each step restarts from the external baseline: only the last one counts
+                state.energy = _update_energy_internal(state, fb, system_energy)
+
+            c = DEBT_BASE_GROWTH * (0.5 + abs(fb) * 1.0)
+            a = 1 - c / DEBT_THRESHOLD
+            state.emotion_debt = DEBT_THRESHOLD + (state.emotion_debt - DEBT_THRESHOLD) * a ** rest
+
+        ts = float(time.time() if timestamp is None else timestamp)
+        bucket.record(fb, ts, float(state.energy), repeat=n)
+        emit(state, "fast_forward", strategy=strategy, feedback=fb, n=n, system_energy=system_energy, ts=ts)
 
 
 def recent_avg_feedback(events: List[Dict[str, Any]], window: int = 3) -> float:
@@ -0,0 +1,195 @@
+# cabsaia/state/emotion_simulator.py
+"""
+Vectorised Monte-Carlo simulator for EmotionalState trajectories.
+
+simulate_trajectories() runs M independent trajectories for T steps at once.
+Every step mirrors one iteration of the scalar loop in emotion_demo.py:
+
+    state.update(dv, da, dd)
+    state.apply_emotional_maintenance(time_step)
+    state.check_burnout_risk()          # may trigger a coping mechanism
+
+Personality parameters are gathered per trajectory from the same
+personality_params table EmotionalState uses, so a single batch can mix
+introvert / extrovert / neurotic / neutral runs. The arithmetic follows the
+scalar methods operation for operation (NumPy exp may differ from math.exp
+in the last ulp).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from state.emotion import THRESHOLDS, EmotionalState
+
+PERSONALITIES: Tuple[str, ...] = ("introvert", "extrovert", "neurotic", "neutral")
+COPING_STRATEGIES: Tuple[str, ...] = ("none", "problem_focused", "emotion_focused", "relaxation")
+
+
+def _param_table() -> Tuple[Dict[str, np.ndarray], float]:
+    """personality_params as arrays indexed like PERSONALITIES, plus the debt recovery rate."""
+    probe = EmotionalState(clock=lambda: 1.0)
+    table = probe.personality_params
+    columns = {
+        key: np.array([table[p][key] for p in PERSONALITIES], dtype=np.float64)
+        for key in ("recovery_rate", "arousal_base", "dominance_decay")
+    }
+    return columns, probe.debt_recovery_rate
+
+
+@dataclass
+class SimulationResult:
+    personality: np.ndarray          # (M,) index into PERSONALITIES
+    valence: Optional[np.ndarray]    # (M, T) values after each step; None if not recorded
+    arousal: Optional[np.ndarray]
+    dominance: Optional[np.ndarray]
+    emotion_debt: Optional[np.ndarray]
+    coping: Optional[np.ndarray]     # (M, T) index into COPING_STRATEGIES, -1 = no burnout
+    final: Dict[str, np.ndarray]     # (M,) state after the last step
+    burnout_steps: np.ndarray        # (M,) number of steps with burnout
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-personality means of the final state plus burnout rate (share of runs with ≥1 burnout)."""
+        out: Dict[str, Dict[str, float]] = {}
+        for i, name in enumerate(PERSONALITIES):
+            mask = self.personality == i
+            if not mask.any():
+                continue
+            stats = {f"mean_{k}": float(v[mask].mean()) for k, v in self.final.items()}
+            stats["std_valence"] = float(self.final["valence"][mask].std())
+            stats["burnout_rate"] = float((self.burnout_steps[mask] > 0).mean())
+            stats["mean_burnout_steps"] = float(self.burnout_steps[mask].mean())
+            stats["runs"] = float(mask.sum())
+            out[name] = stats
+        return out
+
+
+def random_events(
+    m: int,
+    t: int,
+    rng: Optional[np.random.Generator] = None,
+    valence_scale: float = 0.3,
+    arousal_scale: float = 0.15,
+    dominance_scale: float = 0.05,
+    negative_bias: float = 0.05,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gaussian event stream (delta_valence, delta_arousal, delta_dominance), each (m, t)."""
+    rng = np.random.default_rng() if rng is None else rng
+    dv = rng.normal(-negative_bias, valence_scale, (m, t))
+    da = rng.normal(0.0, arousal_scale, (m, t))
+    dd = rng.normal(0.0, dominance_scale, (m, t))
+    return dv, da, dd
+
+
+def simulate_trajectories(
+    personality: Union[str, Sequence[str], np.ndarray],
+    delta_valence: np.ndarray,
+    delta_arousal: Optional[np.ndarray] = None,
+    delta_dominance: Optional[np.ndarray] = None,
+    time_step: float = 1.0,
+    initial: Optional[Dict[str, float]] = None,
+    record: bool = True,
+) -> SimulationResult:
+    """
+    Run M trajectories × T steps of update + maintenance + burnout check.
+
+    personality: one name for every run, or M names / PERSONALITIES indices.
+    delta_*: (M, T) event arrays; arousal/dominance deltas default to zero.
+    initial: optional starting valence/arousal/dominance/resilience/emotion_debt.
+    record: keep full (M, T) trajectories; set False for very large M to keep
+            only final states and burnout counts.
+    """
+    dv = np.asarray(delta_valence, dtype=np.float64)
+    if dv.ndim != 2:
+        raise ValueError("delta_valence must be an (M, T) array")
+    m, t = dv.shape
+    da = np.zeros_like(dv) if delta_arousal is None else np.asarray(delta_arousal, dtype=np.float64)
+    dd = np.zeros_like(dv) if delta_dominance is None else np.asarray(delta_dominance, dtype=np.float64)
+    if da.shape != dv.shape or dd.shape != dv.shape:
+        raise ValueError("event arrays must share one (M, T) shape")
+
+    if isinstance(personality, str):
+        pidx = np.full(m, PERSONALITIES.index(personality), dtype=np.int64)
+    else:
+        seq = np.asarray(personality)
+        pidx = (np.array([PERSONALITIES.index(p) for p in seq], dtype=np.int64)
+                if seq.dtype.kind in "US" else seq.astype(np.int64))
+        if pidx.shape != (m,):
+            raise ValueError("personality must name one type per trajectory")
+
+    params, debt_rate = _param_table()
+    rate = params["recovery_rate"][pidx]
+    arousal_base = params["arousal_base"][pidx]
+    dom_decay = params["dominance_decay"][pidx]
+
+    init = dict(valence=0.0, arousal=0.0, dominance=0.0, resilience=1.0, emotion_debt=0.0)
+    init.update(initial or {})
+    v = np.full(m, init["valence"], dtype=np.float64)
+    a = np.full(m, init["arousal"], dtype=np.float64)
+    d = np.full(m, init["dominance"], dtype=np.float64)
+    res = np.full(m, init["resilience"], dtype=np.float64)
+    debt = np.full(m, init["emotion_debt"], dtype=np.float64)
+
+    traj = {k: np.empty((m, t), dtype=np.float64) for k in ("valence", "arousal", "dominance", "emotion_debt")} \
+        if record else None
+    coping = np.full((m, t), -1, dtype=np.int8) if record else None
+    burnout_steps = np.zeros(m, dtype=np.int64)
+
+    floor = THRESHOLDS["resilience_floor"]
+    burnout = THRESHOLDS["burnout"]
+    step_rate = rate * time_step
+
+    for k in range(t):
+        # update()
+        v = np.maximum(-1.0, np.minimum(v + dv[:, k], 1.0))
+        a = np.maximum(0.0, np.minimum(a + da[:, k], 1.0))
+        d = np.maximum(0.0, np.minimum(d + dd[:, k], 1.0))
+        debt = debt + np.abs(dv[:, k])
+        res = np.maximum(floor, 1.0 - (debt / 10) * (1.0 - dom_decay))
+
+        # apply_emotional_maintenance(time_step)
+        if time_step > 0:
+            v = v * np.exp(-step_rate)
+            a = a + (arousal_base - a) * np.minimum(1.0, step_rate)
+            debt = np.maximum(0, debt - time_step * debt_rate)
+            res = np.minimum(1.0, res + time_step * rate * 0.1)
+
+        # check_burnout_risk() -> select_coping_strategy() -> _trigger_coping_mechanism()
+        burnt = debt > burnout
+        low = v < -0.5
+        problem = burnt & low & (d > 0.5)
+        emotional = burnt & low & (d < 0.5)
+        relax = burnt & ~problem & ~emotional & (a > 0.8)
+
+        v = np.where(problem, v * 0.5, np.where(emotional, v * np.exp(-0.2), v))
+        d = np.where(problem, d * 0.7, d)
+        res = np.where(emotional, res * 0.8, res)
+        a = np.where(relax, a * np.exp(-0.3), a)
+        debt = np.where(relax, np.maximum(0, debt - 1.0), debt)
+        burnout_steps += burnt
+
+        if record:
+            traj["valence"][:, k] = v
+            traj["arousal"][:, k] = a
+            traj["dominance"][:, k] = d
+            traj["emotion_debt"][:, k] = debt
+            strategy = np.select([problem, emotional, relax], [1, 2, 3], default=0)
+            coping[:, k] = np.where(burnt, strategy, -1)
+
+    final = dict(valence=v, arousal=a, dominance=d, resilience=res, emotion_debt=debt)
+    return SimulationResult(
+        personality=pidx,
+        valence=traj["valence"] if record else None,
+        arousal=traj["arousal"] if record else None,
+        dominance=traj["dominance"] if record else None,
+        emotion_debt=traj["emotion_debt"] if record else None,
+        coping=coping,
+        final=final,
+        burnout_steps=burnout_steps,
+    )
+
+
+__all__ = ["COPING_STRATEGIES", "PERSONALITIES", "SimulationResult", "random_events", "simulate_trajectories"]
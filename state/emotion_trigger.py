@@ -17,6 +17,9 @@ from statistics import pstdev
 from typing import List, Dict
 
 from state.emotion_frr import FRRState
+from state.feedback_history import FeedbackRing
+from state.session_locks import lock_for
+from state.strategy_log import emit
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -58,6 +61,14 @@ def _calculate_std_dev(data: List[float]) -> float:
     return pstdev(data) if len(data) >= 2 else 0.0
 
 
+def _strategy_ring(state: FRRState, strategy: str) -> FeedbackRing:
+    """取策略的反馈缓冲区；history 被替换成普通 dict/list 时临时包装一份"""
+    events = state.history.get(strategy, ())
+    if isinstance(events, FeedbackRing):
+        return events
+    return FeedbackRing(max(1, len(events)), events)
+
+
 def get_recent_feedback_avg(
     state: FRRState,
     strategy: str,
@@ -76,12 +87,11 @@ def get_recent_feedback_avg(
         logging.error(f"[FRR] 无效策略类型: {type(strategy)}")
         return 0.0
 
-    history = state.history.get(strategy, [])[-window:]
-    if not history:
+    # 直接读缓冲区的反馈列，只取最近 window 条（不构造事件字典）
+    fb_vals = _strategy_ring(state, strategy).feedback_values(last=window)
+    if not fb_vals:
         return 0.0
 
-    # 取 feedback 列表
-    fb_vals = [item["feedback"] for item in history]
     weights = [0.6, 0.3, 0.1][: len(fb_vals)]
     weighted_avg = sum(v * w for v, w in zip(fb_vals, weights))
 
@@ -133,25 +143,33 @@ def trigger_burst(state: FRRState, strategy: str) -> str:
 # ──────────────────────────────────────────────────────────────────────
 # 4. 爆发后恢复机制
 # ──────────────────────────────────────────────────────────────────────
+# 各爆发等级的恢复参数：能量回升量 / 债务衰减系数
+BURST_RECOVERY = {
+    "mild": {"energy_rec": 0.2, "debt_decay": 0.7},
+    "moderate": {"energy_rec": 0.1, "debt_decay": 0.5},
+    "severe": {"energy_rec": 0.05, "debt_decay": 0.3},
+}
+
+# 爆发后的冷却轮数
+COOLING_PERIODS = {"mild": 1, "moderate": 2, "severe": 3}
+
+
 def apply_burst_recovery(state: FRRState, burst_level: str) -> None:
     """
     根据爆发等级恢复能量 & 衰减债务，并记录冷却期标记。
     """
-    recovery_map = {
-        "mild": {"energy_rec": 0.2, "debt_decay": 0.7},
-        "moderate": {"energy_rec": 0.1, "debt_decay": 0.5},
-        "severe": {"energy_rec": 0.05, "debt_decay": 0.3},
-    }
-    if burst_level not in recovery_map:
+    if burst_level not in BURST_RECOVERY:
         return
 
-    rec = recovery_map[burst_level]
-    state.energy = min(1.0, state.energy + rec["energy_rec"])
-    state.emotion_debt *= rec["debt_decay"]
+    with lock_for(state):  # 状态修改与日志事件原子化（见 state/session_locks.py）
+        rec = BURST_RECOVERY[burst_level]
+        state.energy = min(1.0, state.energy + rec["energy_rec"])
+        state.emotion_debt *= rec["debt_decay"]
 
-    # 标记冷却周期
-    cooling = {"mild": 1, "moderate": 2, "severe": 3}[burst_level]
-    setattr(state, "cooling_period", cooling)  # 动态注入字段
+        # 标记冷却周期
+        cooling = COOLING_PERIODS[burst_level]
+        setattr(state, "cooling_period", cooling)  # 动态注入字段
+        emit(state, "burst_recovery", level=burst_level)
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -161,15 +179,17 @@ def evaluate_strategy(state: FRRState, strategy: str) -> Dict[str, float]:
     """
     返回策略效能综合评分，用于未来多策略竞争。
     composite = efficacy*0.6 + stability*0.2 + trend*0.2
+
+    波动与趋势读取缓冲区上随 update_frr 增量维护的 OnlineStats，单策略 O(1)。
     """
-    history = [item["feedback"] for item in state.history.get(strategy, [])]
-    if not history:
+    stats = _strategy_ring(state, strategy).stats
+    if not stats.count:
         return dict(efficacy=0.0, stability=0.0, trend=0.0, composite=0.0)
 
     efficacy = get_recent_feedback_avg(state, strategy)
-    volatility = _calculate_std_dev(history)
+    volatility = stats.std_dev
     stability = 1 - min(1.0, volatility)  # 映射到 [0,1]
-    trend = math.tanh(_calculate_regression_slope(list(range(len(history))), history))  # [-1,1]
+    trend = math.tanh(stats.slope)  # [-1,1]
 
     composite = efficacy * 0.6 + stability * 0.2 + (trend + 1) / 2 * 0.2
     return dict(efficacy=efficacy, stability=stability, trend=trend, composite=composite)
@@ -0,0 +1,358 @@
+"""
+feedback_history.py
+-------------------
+FRRState.history 的定长存储：每个策略一个环形缓冲区。
+
+- 时间戳 / 反馈 / 能量存放在三个平行的 array('d') 中，超出保留长度时覆盖最旧记录；
+- 维护反馈的前缀和（running sum），因此：
+    * 最近 k 条平均  → O(1)
+    * 最近 N 秒平均  → 时间戳单调时二分定位起点 O(log retention)，再 O(1) 求和；
+      时间戳乱序（测试直接赋值、系统时钟回拨）时退化为线性扫描，结果与旧实现一致；
+- 每个缓冲区附带一个 OnlineStats（state/online_stats.py），record 时 O(1) 更新
+  count / mean / variance / slope，供 evaluate_strategy 直接读取；
+  它覆盖自创建（或 clear）以来记录的全部反馈，不随环形覆盖而回退；
+- rollup=True 时被覆盖的旧事件不直接丢弃，而是并入 FeedbackRollup
+  （state/feedback_rollup.py）的 minute / hour / day 聚合桶，
+  mean_since / window_stats 合并聚合桶与原始尾部回答任意跨度的窗口；
+- 兼容视图：len / 下标 / 切片 / 迭代 / append 都以 {"feedback", "timestamp", "energy"} 映射形式
+  读写，现有调用方与测试（history[s] = [...]，history[s][0]["feedback"]）无需改动；
+  读出的是只读映射（MappingProxyType），history[s][i]["feedback"] = x 会直接抛 TypeError
+  而不是静默失效——修改历史请重新赋值整个序列；
+  写入时只保留这三个键，事件里的其他键会被丢弃并发出 UserWarning。
+"""
+
+from __future__ import annotations
+
+import math
+import warnings
+from array import array
+from itertools import accumulate
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from state.feedback_rollup import FeedbackRollup, point_bucket, summarize
+from state.online_stats import OnlineStats
+
+DEFAULT_HISTORY_RETENTION = 1024
+_INITIAL_SLOTS = 16  # 列按需倍增到 capacity，短历史不必预占整段内存
+
+_NAN = float("nan")
+_EVENT_KEYS = frozenset(("feedback", "timestamp", "energy"))
+
+
+def _as_float(value: Any, default: float) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return default
+
+
+class FeedbackRing:
+    """单个策略的反馈环形缓冲区（最多保留 capacity 条）。"""
+
+    __slots__ = ("capacity", "_ts", "_fb", "_en", "_cum", "_desc", "_start", "_len", "_total", "_n_desc",
+                 "stats", "rollup")
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_HISTORY_RETENTION,
+        events: Iterable[Mapping[str, Any]] = (),
+        forgetting: float = 1.0,
+        rollup: bool = False,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = int(capacity)
+        self.stats = OnlineStats(forgetting)  # 反馈的流式统计量
+        self.rollup = FeedbackRollup() if rollup else None  # 被覆盖事件的聚合桶
+        slots = min(self.capacity, _INITIAL_SLOTS)
+        zeros = bytes(8 * slots)
+        self._ts = array("d", zeros)
+        self._fb = array("d", zeros)
+        self._en = array("d", zeros)
+        self._cum = array("d", zeros)  # 截至该条（含）的反馈累计和
+        self._desc = bytearray(slots)  # 1 = 该条时间戳不晚于前一条（或缺失）
+        self._start = 0
+        self._len = 0
+        self._total = 0.0
+        self._n_desc = 0
+        for event in events:
+            self.append(event)
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+    def record(self, feedback: float, timestamp: float, energy: float = _NAN, repeat: int = 1) -> None:
+        """
+        记录一条反馈。repeat > 1 表示这条记录代表 repeat 个相同事件的聚合：
+        缓冲区只占一格，OnlineStats 则按 repeat 个样本计入。
+        """
+        cap = self.capacity
+        if self._len == cap:
+            # 覆盖最旧一条（开启 rollup 时先并入聚合桶）；其后继不再有“前一条”，清掉乱序标记
+            if self.rollup is not None:
+                p = self._start
+                self.rollup.add(self._ts[p], self._fb[p], self._en[p])
+            self._start = (self._start + 1) % cap
+            self._len -= 1
+            if self._desc[self._start]:
+                self._desc[self._start] = 0
+                self._n_desc -= 1
+
+        i = (self._start + self._len) % cap
+        if i == len(self._fb):
+            self._grow()
+        if self._len:
+            prev = self._ts[(i - 1) % cap]
+            unordered = not (timestamp >= prev)  # NaN 也算乱序
+        else:
+            unordered = math.isnan(timestamp)
+        self._desc[i] = unordered
+        self._n_desc += unordered
+
+        self._total += feedback
+        self._ts[i] = timestamp
+        self._fb[i] = feedback
+        self._en[i] = energy
+        self._cum[i] = self._total
+        self._len += 1
+        self.stats.push_repeated(feedback, repeat)
+
+    def _grow(self) -> None:
+        """未写满前 _start 恒为 0，直接在尾部补零扩容（至多到 capacity）。"""
+        slots = len(self._fb)
+        extra = min(self.capacity, 2 * slots) - slots
+        zeros = bytes(8 * extra)
+        for column in (self._ts, self._fb, self._en, self._cum):
+            column.frombytes(zeros)
+        self._desc.extend(bytes(extra))
+
+    def append(self, event: Mapping[str, Any]) -> None:
+        """兼容 list.append：接受 {"feedback", "timestamp", "energy"} 字典，其他键丢弃并告警。"""
+        extra = event.keys() - _EVENT_KEYS
+        if extra:
+            warnings.warn(
+                f"FeedbackRing keeps only feedback/timestamp/energy; dropped keys {sorted(map(str, extra))}",
+                UserWarning,
+                stacklevel=2,
+            )
+        self.record(
+            _as_float(event.get("feedback"), 0.0),
+            _as_float(event.get("timestamp"), _NAN),
+            _as_float(event.get("energy"), _NAN),
+        )
+
+    def extend(self, events: Iterable[Mapping[str, Any]]) -> None:
+        for event in events:
+            self.append(event)
+
+    def clear(self) -> None:
+        self._desc[:] = bytes(len(self._desc))
+        self._start = self._len = self._n_desc = 0
+        self._total = 0.0
+        self.stats.reset()
+        if self.rollup is not None:
+            self.rollup.clear()
+
+    # ------------------------------------------------------------------
+    # 列式导出 / 恢复（快照用）
+    # ------------------------------------------------------------------
+    def _logical(self, column: array) -> array:
+        start, n = self._start, self._len
+        if start + n <= len(column):
+            return column[start:start + n]
+        return column[start:] + column[:start + n - len(column)]
+
+    def columns(self) -> Tuple[array, array, array]:
+        """按时间顺序导出 (timestamp, feedback, energy) 三列的副本。"""
+        return self._logical(self._ts), self._logical(self._fb), self._logical(self._en)
+
+    @classmethod
+    def from_columns(cls, capacity: int, ts: array, fb: array, en: array, stats: OnlineStats) -> "FeedbackRing":
+        """由 columns() 导出的三列和对应的 OnlineStats 直接重建，不逐条 record。"""
+        ring = cls.__new__(cls)
+        ring.capacity = capacity = int(capacity)
+        n = min(len(fb), capacity)
+        if not n:
+            ring.__init__(capacity, forgetting=stats.forgetting)
+        else:
+            # 列长恰为 n，之后的写入由 _grow() 扩容
+            ring._ts, ring._fb, ring._en = ts[len(ts) - n:], fb[len(fb) - n:], en[len(en) - n:]
+            ring._cum = array("d", accumulate(ring._fb))
+            ts = ring._ts.tolist()
+            if ts == sorted(ts) and not any(map(math.isnan, ts)):  # 单调且无 NaN：无乱序标记
+                ring._desc = bytearray(n)
+            else:
+                ring._desc = bytearray([math.isnan(ts[0])])
+                ring._desc += bytes(not (b >= a) for a, b in zip(ts, ts[1:]))
+            ring._n_desc = ring._desc.count(1)
+            ring._total = ring._cum[n - 1]
+            ring._start = 0
+            ring._len = n
+        ring.stats = stats
+        ring.rollup = None
+        return ring
+
+    # ------------------------------------------------------------------
+    # 窗口统计
+    # ------------------------------------------------------------------
+    def _phys(self, j: int) -> int:
+        return (self._start + j) % self.capacity
+
+    def _sum_from(self, j: int) -> float:
+        """逻辑下标 j..末尾 的反馈和（前缀和之差）。"""
+        p = self._phys(j)
+        return self._cum[self._phys(self._len - 1)] - (self._cum[p] - self._fb[p])
+
+    def mean_last(self, k: int) -> float:
+        """最近 k 条反馈的平均；无数据返回 0.0。"""
+        k = min(int(k), self._len)
+        if k <= 0:
+            return 0.0
+        return self._sum_from(self._len - k) / k
+
+    def _raw_since(self, threshold: float) -> Tuple[int, float]:
+        """原始尾部中时间戳 >= threshold 的 (条数, 反馈和)。"""
+        n = self._len
+        if not n:
+            return 0, 0.0
+
+        if self._n_desc:
+            ts, fb = self._ts, self._fb
+            total, count = 0.0, 0
+            for j in range(n):
+                p = self._phys(j)
+                if ts[p] >= threshold:
+                    total += fb[p]
+                    count += 1
+            return count, total
+
+        lo, hi = 0, n
+        ts = self._ts
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ts[self._phys(mid)] < threshold:
+                lo = mid + 1
+            else:
+                hi = mid
+        return n - lo, (self._sum_from(lo) if lo < n else 0.0)
+
+    def mean_since(self, threshold: float) -> float:
+        """时间戳 >= threshold 的反馈平均（含 rollup 中与窗口相交的聚合桶）；无数据返回 0.0。"""
+        count, total = self._raw_since(threshold)
+        if self.rollup is not None:
+            r_total, r_count = self.rollup.sum_count_since(threshold)
+            total += r_total
+            count += r_count
+        return total / count if count else 0.0
+
+    def window_stats(self, threshold: float) -> Dict[str, float]:
+        """
+        时间戳 >= threshold 的 count / mean / std_dev / min / max / energy_mean：
+        原始尾部逐条计入，更早的部分取 rollup 中与窗口相交的聚合桶。
+        """
+        buckets = self.rollup.since(threshold) if self.rollup is not None else []
+        for j in range(self._len):
+            p = self._phys(j)
+            if self._ts[p] >= threshold:
+                buckets.append(point_bucket(self._ts[p], self._fb[p], self._en[p]))
+        return summarize(buckets)
+
+    def feedback_values(self, last: Optional[int] = None) -> List[float]:
+        """按时间顺序返回（最近 last 条）反馈值。"""
+        n = self._len
+        first = 0 if last is None else max(0, n - int(last))
+        return [self._fb[self._phys(j)] for j in range(first, n)]
+
+    # ------------------------------------------------------------------
+    # list-of-dicts 兼容视图
+    # ------------------------------------------------------------------
+    def _event(self, j: int) -> Mapping[str, float]:
+        """只读视图：缓冲区存的是平行列，改这里的字典不会回写，所以干脆禁止修改。"""
+        p = self._phys(j)
+        event = {"feedback": self._fb[p]}
+        if not math.isnan(self._ts[p]):
+            event["timestamp"] = self._ts[p]
+        if not math.isnan(self._en[p]):
+            event["energy"] = self._en[p]
+        return MappingProxyType(event)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Mapping[str, float]]:
+        for j in range(self._len):
+            yield self._event(j)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Mapping[str, float], List[Mapping[str, float]]]:
+        if isinstance(index, slice):
+            return [self._event(j) for j in range(*index.indices(self._len))]
+        j = index + self._len if index < 0 else index
+        if not 0 <= j < self._len:
+            raise IndexError("history index out of range")
+        return self._event(j)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (FeedbackRing, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"FeedbackRing({[dict(e) for e in self]!r}, capacity={self.capacity})"
+
+
+class HistoryStore(dict):
+    """
+    strategy -> FeedbackRing。赋值 list（或任何事件序列）时自动转换为环形缓冲区，
+    超出 retention 的旧记录被丢弃（rollup=True 时并入聚合桶）；
+    forgetting 为各缓冲区 OnlineStats 的遗忘因子。
+    """
+
+    # 类属性兜底：反序列化时 items 先于 __dict__ 恢复
+    retention = DEFAULT_HISTORY_RETENTION
+    forgetting = 1.0
+    rollup = False
+
+    def __init__(
+        self,
+        *args: Any,
+        retention: Optional[int] = None,
+        forgetting: Optional[float] = None,
+        rollup: Optional[bool] = None,
+        **kwargs: Any,
+    ):
+        super().__init__()
+        if retention is not None:
+            self.retention = int(retention)
+        if forgetting is not None:
+            self.forgetting = float(forgetting)
+        if rollup is not None:
+            self.rollup = bool(rollup)
+        self.update(*args, **kwargs)
+
+    def _coerce(self, events: Any) -> FeedbackRing:
+        if isinstance(events, FeedbackRing):
+            return events
+        return FeedbackRing(self.retention, events, self.forgetting, self.rollup)
+
+    def __setitem__(self, strategy: str, events: Any) -> None:
+        super().__setitem__(strategy, self._coerce(events))
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for strategy, events in dict(*args, **kwargs).items():
+            self[strategy] = events
+
+    def setdefault(self, strategy: str, default: Any = ()) -> FeedbackRing:
+        if strategy not in self:
+            self[strategy] = default
+        return self[strategy]
+
+    def bucket(self, strategy: str) -> FeedbackRing:
+        """取出（必要时新建）某策略的缓冲区。"""
+        ring = self.get(strategy)
+        if ring is None:
+            ring = FeedbackRing(self.retention, forgetting=self.forgetting, rollup=self.rollup)
+            super().__setitem__(strategy, ring)
+        return ring
+
+
+__all__ = ["DEFAULT_HISTORY_RETENTION", "FeedbackRing", "HistoryStore"]
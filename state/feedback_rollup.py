@@ -0,0 +1,192 @@
+"""
+feedback_rollup.py
+------------------
+FeedbackRing 被覆盖掉的旧事件的分层聚合（minute → hour → day → older）。
+
+- 每个桶保存 first / last 时间戳、count、sum、sum of squares、min、max、
+  能量和与能量计数，足以合并并回答均值 / 方差 / 极值；
+- 事件按其所在的分钟落入 minute 层；某层桶数超过上限时，最旧的桶并入上一层
+  （按小时 / 天重新对齐），day 层溢出的部分并入单个 older 桶；
+  没有时间戳（NaN）的事件进入 untimed 桶，只计入 total()；
+- 各层桶数有上限，单个缓冲区的内存随运行时长只按层数（对数级）增长，
+  不再随事件数线性增长；
+- 窗口查询 since(threshold) 合并所有 last >= threshold 的桶：
+  窗口边界处的精度等于边界所落桶的宽度。
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+# (层名, 桶宽秒数, 最多保留的桶数)
+TIERS: Tuple[Tuple[str, float, int], ...] = (
+    ("minute", 60.0, 60),
+    ("hour", 3600.0, 48),
+    ("day", 86400.0, 60),
+)
+
+# 单个桶的字段（list 下标）
+BUCKET_FIELDS = ("first", "last", "count", "sum", "sum_sq", "min", "max", "energy_sum", "energy_count")
+_FIRST, _LAST, _COUNT, _SUM, _SQ, _MIN, _MAX, _EN_SUM, _EN_COUNT = range(len(BUCKET_FIELDS))
+
+Bucket = List[float]
+
+
+def point_bucket(timestamp: float, feedback: float, energy: float) -> Bucket:
+    """单个事件对应的桶。"""
+    has_energy = not math.isnan(energy)
+    return [timestamp, timestamp, 1.0, feedback, feedback * feedback, feedback, feedback,
+            energy if has_energy else 0.0, float(has_energy)]
+
+
+def _merge_into(dst: Bucket, src: Bucket) -> None:
+    dst[_FIRST] = min(dst[_FIRST], src[_FIRST])
+    dst[_LAST] = max(dst[_LAST], src[_LAST])
+    dst[_COUNT] += src[_COUNT]
+    dst[_SUM] += src[_SUM]
+    dst[_SQ] += src[_SQ]
+    dst[_MIN] = min(dst[_MIN], src[_MIN])
+    dst[_MAX] = max(dst[_MAX], src[_MAX])
+    dst[_EN_SUM] += src[_EN_SUM]
+    dst[_EN_COUNT] += src[_EN_COUNT]
+
+
+def summarize(buckets: Iterable[Bucket]) -> Dict[str, float]:
+    """合并若干桶：count / mean / std_dev / min / max / energy_mean（无数据时全为 0）。"""
+    acc: Optional[Bucket] = None
+    for b in buckets:
+        if acc is None:
+            acc = list(b)
+        else:
+            _merge_into(acc, b)
+    if acc is None or not acc[_COUNT]:
+        return dict(count=0, mean=0.0, std_dev=0.0, min=0.0, max=0.0, energy_mean=0.0)
+    n = acc[_COUNT]
+    mean = acc[_SUM] / n
+    return dict(
+        count=int(n),
+        mean=mean,
+        std_dev=math.sqrt(max(0.0, acc[_SQ] / n - mean * mean)),
+        min=acc[_MIN],
+        max=acc[_MAX],
+        energy_mean=acc[_EN_SUM] / acc[_EN_COUNT] if acc[_EN_COUNT] else 0.0,
+    )
+
+
+class FeedbackRollup:
+    """分层聚合桶；由 FeedbackRing 在覆盖旧事件时调用 add()。"""
+
+    __slots__ = ("tiers", "older", "untimed")
+
+    def __init__(self) -> None:
+        self.tiers: List[Deque[Bucket]] = [deque() for _ in TIERS]
+        self.older: Optional[Bucket] = None
+        self.untimed: Optional[Bucket] = None
+
+    def add(self, timestamp: float, feedback: float, energy: float = math.nan) -> None:
+        if math.isnan(timestamp):
+            point = point_bucket(timestamp, feedback, energy)
+            if self.untimed is None:
+                self.untimed = point
+            else:
+                _merge_into(self.untimed, point)
+            return
+        self._insert(0, point_bucket(timestamp, feedback, energy))
+
+    def _insert(self, level: int, bucket: Bucket) -> None:
+        if level == len(TIERS):
+            if self.older is None:
+                self.older = list(bucket)
+            else:
+                _merge_into(self.older, bucket)
+            return
+
+        width, keep = TIERS[level][1], TIERS[level][2]
+        tier = self.tiers[level]
+        slot = math.floor(bucket[_FIRST] / width)
+        if not tier or slot > math.floor(tier[-1][_FIRST] / width):
+            tier.append(list(bucket))
+        elif slot < math.floor(tier[0][_FIRST] / width):
+            # 比本层最旧的桶还旧（乱序到达）：直接交给上一层
+            self._insert(level + 1, bucket)
+            return
+        else:
+            for b in reversed(tier):
+                b_slot = math.floor(b[_FIRST] / width)
+                if b_slot == slot:
+                    _merge_into(b, bucket)
+                    break
+                if b_slot < slot:
+                    # 落在两个已有桶之间：插入并保持有序
+                    tier.insert(tier.index(b) + 1, list(bucket))
+                    break
+        while len(tier) > keep:
+            self._insert(level + 1, tier.popleft())
+
+    def clear(self) -> None:
+        for tier in self.tiers:
+            tier.clear()
+        self.older = self.untimed = None
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def buckets(self) -> Iterable[Bucket]:
+        """所有带时间戳的桶（older 在前，minute 层在后）。"""
+        if self.older is not None:
+            yield self.older
+        for tier in reversed(self.tiers):
+            yield from tier
+
+    def since(self, threshold: float) -> List[Bucket]:
+        """与 [threshold, +inf) 有交集的桶（last >= threshold）。"""
+        return [b for b in self.buckets() if b[_LAST] >= threshold]
+
+    def sum_count_since(self, threshold: float) -> Tuple[float, int]:
+        total, count = 0.0, 0.0
+        for b in self.since(threshold):
+            total += b[_SUM]
+            count += b[_COUNT]
+        return total, int(count)
+
+    def total(self) -> Dict[str, float]:
+        """全部聚合事件（含 untimed）的汇总。"""
+        extra = [self.untimed] if self.untimed is not None else []
+        return summarize(list(self.buckets()) + extra)
+
+    def __len__(self) -> int:
+        """桶的个数（内存占用的量度）。"""
+        return sum(len(t) for t in self.tiers) + (self.older is not None) + (self.untimed is not None)
+
+    # ------------------------------------------------------------------
+    # 扁平导出 / 恢复（快照用）
+    # ------------------------------------------------------------------
+    def to_flat(self) -> Tuple[List[int], List[float]]:
+        """(各层桶数 + older/untimed 标记, 依次拼接的桶字段)。"""
+        sizes = [len(t) for t in self.tiers] + [self.older is not None, self.untimed is not None]
+        flat: List[float] = []
+        for tier in self.tiers:
+            for b in tier:
+                flat.extend(b)
+        for b in (self.older, self.untimed):
+            if b is not None:
+                flat.extend(b)
+        return [int(s) for s in sizes], flat
+
+    @classmethod
+    def from_flat(cls, sizes: List[int], flat: List[float]) -> "FeedbackRollup":
+        rollup = cls()
+        width = len(BUCKET_FIELDS)
+        rows = iter([list(flat[i:i + width]) for i in range(0, len(flat), width)])
+        for tier, n in zip(rollup.tiers, sizes):
+            tier.extend(next(rows) for _ in range(n))
+        if sizes[len(TIERS)]:
+            rollup.older = next(rows)
+        if sizes[len(TIERS) + 1]:
+            rollup.untimed = next(rows)
+        return rollup
+
+
+__all__ = ["BUCKET_FIELDS", "TIERS", "FeedbackRollup", "point_bucket", "summarize"]
@@ -0,0 +1,216 @@
+# cabsaia/state/frr_population.py
+"""
+Struct-of-arrays FRR engine for many concurrent sessions.
+
+FRRPopulation keeps the per-session scalars of FRRState (resilience, energy,
+emotion debt) as NumPy columns, plus, for every (session, strategy) pair, the
+last RECENT_WINDOW feedback values that get_recent_feedback_avg reads. A batch
+of (session_id, strategy, feedback) events is applied column-wise:
+
+- events are replayed in "rounds": round k holds the k-th event of every
+  session in the batch, so each round touches a session at most once and the
+  per-session event order is preserved
+- resilience / energy / debt use the same expressions, in the same operation
+  order, as update_frr, _update_energy_internal and calculate_nonlinear_debt
+- BURST_LEVELS are then evaluated for every affected session against the
+  strategy of its last event, exactly like trigger_burst
+
+Every value is bit-identical to running the scalar path session by session.
+Timestamps and full histories are not kept; use FRRState where those matter.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from state.emotion_debt import DEBT_BASE_GROWTH, DEBT_THRESHOLD
+from state.emotion_frr import ENERGY_COEFFS, RESILIENCE_STEPS
+from state.emotion_trigger import BURST_LEVELS
+
+# get_recent_feedback_avg defaults: last 3 events, weights from oldest to newest
+RECENT_WINDOW = 3
+RECENT_WEIGHTS: Tuple[float, ...] = (0.6, 0.3, 0.1)
+TREND_COEFF = 0.3
+
+# trigger_burst checks the highest debt threshold first
+LEVEL_NAMES: Tuple[str, ...] = tuple(
+    sorted(BURST_LEVELS, key=lambda lv: BURST_LEVELS[lv]["debt_threshold"], reverse=True)
+)
+NO_BURST = -1
+
+
+@dataclass
+class BurstResult:
+    """Burst verdicts for the sessions touched by one batch."""
+    session_ids: np.ndarray   # unique, ascending
+    levels: np.ndarray        # index into LEVEL_NAMES, NO_BURST if none
+    recent_avg: np.ndarray    # get_recent_feedback_avg for each session's last strategy
+
+    def labels(self) -> List[str]:
+        """Level names as trigger_burst returns them ("" for no burst)."""
+        return [LEVEL_NAMES[lv] if lv != NO_BURST else "" for lv in self.levels]
+
+
+class FRRPopulation:
+    def __init__(self, n_sessions: int, energy: float = 1.0, resilience: float = 1.0, emotion_debt: float = 0.0):
+        if n_sessions < 1:
+            raise ValueError("n_sessions must be >= 1")
+        self.n_sessions = int(n_sessions)
+        self.resilience = np.full(self.n_sessions, resilience, dtype=np.float64)
+        self.energy = np.full(self.n_sessions, energy, dtype=np.float64)
+        self.emotion_debt = np.full(self.n_sessions, emotion_debt, dtype=np.float64)
+
+        self.strategies: List[str] = []
+        self._strategy_ids: Dict[str, int] = {}
+        # (session, strategy, slot): last RECENT_WINDOW feedback values, oldest first
+        self.recent = np.zeros((self.n_sessions, 0, RECENT_WINDOW), dtype=np.float64)
+        self.recent_len = np.zeros((self.n_sessions, 0), dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # strategy columns
+    # ------------------------------------------------------------------
+    def strategy_id(self, strategy: str) -> int:
+        """Column index of a strategy, adding the column on first use."""
+        sid = self._strategy_ids.get(strategy)
+        if sid is None:
+            sid = len(self.strategies)
+            self._strategy_ids[strategy] = sid
+            self.strategies.append(strategy)
+            self.recent = np.concatenate(
+                [self.recent, np.zeros((self.n_sessions, 1, RECENT_WINDOW), dtype=np.float64)], axis=1
+            )
+            self.recent_len = np.concatenate(
+                [self.recent_len, np.zeros((self.n_sessions, 1), dtype=np.int64)], axis=1
+            )
+        return sid
+
+    def _strategy_ids_for(self, strategies: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.strategy_id(s) for s in strategies), dtype=np.int64, count=len(strategies))
+
+    # ------------------------------------------------------------------
+    # batch update
+    # ------------------------------------------------------------------
+    def apply_events(
+        self,
+        session_ids: Sequence[int],
+        strategies: Sequence[str],
+        feedback: Sequence[float],
+        system_energy: Optional[Sequence[float]] = None,
+    ) -> BurstResult:
+        """
+        Apply a batch of feedback events in order and evaluate bursts.
+
+        system_energy mirrors update_frr's optional argument per event; NaN
+        (or omitting the array) means "use the session's own energy".
+        """
+        sessions = np.asarray(session_ids, dtype=np.int64)
+        fb = np.asarray(feedback, dtype=np.float64)
+        if not (len(sessions) == len(strategies) == len(fb)):
+            raise ValueError("session_ids, strategies and feedback must have the same length")
+        if len(sessions) and (sessions.min() < 0 or sessions.max() >= self.n_sessions):
+            raise IndexError("session id out of range")
+        ext = (np.full(len(fb), np.nan) if system_energy is None
+               else np.asarray(system_energy, dtype=np.float64))
+        cols = self._strategy_ids_for(strategies)
+
+        if not len(sessions):
+            empty = np.zeros(0, dtype=np.int64)
+            return BurstResult(empty, empty.copy(), np.zeros(0, dtype=np.float64))
+
+        # Rank of each event within its session (0 = first), keeping batch order
+        order = np.argsort(sessions, kind="stable")
+        sorted_sessions = sessions[order]
+        positions = np.arange(len(order))
+        starts = np.r_[True, sorted_sessions[1:] != sorted_sessions[:-1]]
+        rank = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+
+        for k in range(int(rank.max()) + 1):
+            idx = order[rank == k]
+            self._apply_round(sessions[idx], cols[idx], fb[idx], ext[idx])
+
+        ends = np.r_[starts[1:], True]
+        last = order[ends]
+        return self.evaluate_bursts(sessions[last], cols[last])
+
+    def _apply_round(self, rows: np.ndarray, cols: np.ndarray, fb: np.ndarray, ext: np.ndarray) -> None:
+        """One event per session: same arithmetic as update_frr."""
+        pos, neg = fb > 0, fb < 0
+
+        res = self.resilience[rows]
+        (up, top), (down, floor), (idle, idle_floor) = (RESILIENCE_STEPS[k] for k in (1, -1, 0))
+        res = np.where(pos, np.minimum(top, res + up),
+                       np.where(neg, np.maximum(floor, res + down), np.maximum(idle_floor, res + idle)))
+        self.resilience[rows] = res
+
+        base = np.where(np.isnan(ext), self.energy[rows], ext)
+        c = ENERGY_COEFFS
+        drain = (c["drain_base"] + c["drain_scale"] * np.abs(fb)) * (1.0 + c["drain_resilience"] * (1.0 - res))
+        recover = c["recover_scale"] * fb + c["recover_resilience"] * res
+        fatigue = c["fatigue"] * (1.0 + c["fatigue_resilience"] * (1.0 - res))
+        base = np.where(neg, base - drain, np.where(pos, base + recover, base - fatigue))
+        self.energy[rows] = np.maximum(0.0, np.minimum(1.0, base))
+
+        debt = self.emotion_debt[rows]
+        intensity = 0.5 + np.abs(fb) * 1.0
+        self.emotion_debt[rows] = debt + (1 - debt / DEBT_THRESHOLD) * DEBT_BASE_GROWTH * intensity
+
+        # Push into the (session, strategy) window, shifting out the oldest when full
+        n = self.recent_len[rows, cols]
+        vals = self.recent[rows, cols]
+        full = n == RECENT_WINDOW
+        vals[full] = np.column_stack([vals[full, 1:], fb[full]])
+        vals[~full, n[~full]] = fb[~full]
+        self.recent[rows, cols] = vals
+        self.recent_len[rows, cols] = np.minimum(n + 1, RECENT_WINDOW)
+
+    # ------------------------------------------------------------------
+    # read side
+    # ------------------------------------------------------------------
+    def recent_feedback_avg(self, session_ids: Sequence[int], strategy_cols: Sequence[int]) -> np.ndarray:
+        """get_recent_feedback_avg(state, strategy) with its defaults, column-wise."""
+        rows = np.asarray(session_ids, dtype=np.int64)
+        cols = np.asarray(strategy_cols, dtype=np.int64)
+        ys = self.recent[rows, cols]
+        n = self.recent_len[rows, cols]
+
+        # sum(v * w) in the scalar loop's order (0 + v0*w0 + v1*w1 + ...)
+        avg = np.zeros(len(rows), dtype=np.float64)
+        for k, w in enumerate(RECENT_WEIGHTS[:RECENT_WINDOW]):
+            avg = np.where(n > k, avg + ys[:, k] * w, avg)
+
+        # _calculate_regression_slope over x = 0..n-1, same summation order
+        nf = np.maximum(n, 1).astype(np.float64)
+        sum_x = np.zeros(len(rows), dtype=np.float64)
+        sum_y = np.zeros(len(rows), dtype=np.float64)
+        for k in range(RECENT_WINDOW):
+            sum_x = np.where(n > k, sum_x + k, sum_x)
+            sum_y = np.where(n > k, sum_y + ys[:, k], sum_y)
+        mean_x, mean_y = sum_x / nf, sum_y / nf
+        num = np.zeros(len(rows), dtype=np.float64)
+        den = np.zeros(len(rows), dtype=np.float64)
+        for k in range(RECENT_WINDOW):
+            dx = k - mean_x
+            num = np.where(n > k, num + dx * (ys[:, k] - mean_y), num)
+            den = np.where(n > k, den + dx ** 2, den)
+        den = np.where(den == 0, 1e-6, den)
+        trending = n >= 2
+        return np.where(trending, avg + (num / den) * TREND_COEFF, avg)
+
+    def evaluate_bursts(self, session_ids: Sequence[int], strategy_cols: Sequence[int]) -> BurstResult:
+        """trigger_burst for each (session, strategy column) pair."""
+        rows = np.asarray(session_ids, dtype=np.int64)
+        recent_avg = self.recent_feedback_avg(rows, strategy_cols)
+        energy, debt = self.energy[rows], self.emotion_debt[rows]
+
+        levels = np.full(len(rows), NO_BURST, dtype=np.int64)
+        for i, name in reversed(list(enumerate(LEVEL_NAMES))):
+            th = BURST_LEVELS[name]
+            hit = (energy < th["energy_threshold"]) & (recent_avg < 0) & (debt >= th["debt_threshold"])
+            levels = np.where(hit, i, levels)
+        return BurstResult(rows, levels, recent_avg)
+
+
+__all__ = ["BurstResult", "FRRPopulation", "LEVEL_NAMES", "NO_BURST", "RECENT_WINDOW"]
@@ -0,0 +1,407 @@
+# cabsaia/state/frr_sweep.py
+"""
+Parameter sweeps for the FRR burst / recovery model.
+
+run_sweep() replays feedback traces through update_frr + trigger_burst +
+apply_burst_recovery once per parameter set and reports, per set:
+
+- burst_rate       bursts per step (plus bursts_<level> counts)
+- time_in_burst    share of steps inside a burst episode (burst step or cooling)
+- recovery_latency mean episode length in steps, from the burst that opened it
+                   to the first calm step (no burst, no cooling); NaN if none ended
+- unresolved       episodes still open when a trace ended
+
+A parameter set is a flat dict of dotted keys overriding the module tables:
+
+    burst.<level>.energy_threshold / burst.<level>.debt_threshold   BURST_LEVELS
+    recovery.<level>.energy_rec / recovery.<level>.debt_decay       BURST_RECOVERY
+    cooling.<level>                                                 COOLING_PERIODS
+    base_thresholds.energy / base_thresholds.debt                   BASE_THRESHOLDS
+    energy.<coeff>                                                  ENERGY_COEFFS
+    resilience.pos / .neg / .neutral (per-event step),
+    resilience.ceiling / .floor (clamp bounds)                      RESILIENCE_STEPS
+
+Parameter sets are independent, so they are spread over a process pool (traces
+are shipped once per worker through the pool initializer) and throughput grows
+with the core count. Each finished set is appended to a JSONL checkpoint; a
+rerun with the same checkpoint skips sets already recorded, so a long sweep can
+be interrupted and resumed.
+
+Run from the repo root, e.g.:
+    python -m state.frr_sweep --grid burst.mild.debt_threshold=1.5,2,2.5 \\
+        --grid recovery.mild.energy_rec=0.1,0.2 --workers 8 \\
+        --checkpoint sweep.jsonl --csv sweep.csv --npz sweep.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import csv
+import itertools
+import json
+import math
+import os
+import random
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from state import emotion_frr, emotion_trigger
+from state.emotion_frr import FRRState, update_frr
+from state.emotion_trigger import apply_burst_recovery, trigger_burst
+
+Trace = Sequence[float]
+ParamSet = Dict[str, float]
+
+SWEEP_STRATEGY = "reflective_listening"
+# trigger_burst only reads the last 3 events, so replay states keep tiny rings
+_REPLAY_RETENTION = 8
+
+_RESILIENCE_SIGN = {"pos": 1, "neg": -1, "neutral": 0}
+
+
+# ──────────────────────────────────────────────────────────────────────
+# parameter overrides
+# ──────────────────────────────────────────────────────────────────────
+def _tables() -> Dict[str, Dict[Any, Any]]:
+    return {
+        "burst": emotion_trigger.BURST_LEVELS,
+        "recovery": emotion_trigger.BURST_RECOVERY,
+        "cooling": emotion_trigger.COOLING_PERIODS,
+        "base_thresholds": emotion_frr.BASE_THRESHOLDS,
+        "energy": emotion_frr.ENERGY_COEFFS,
+        "resilience": emotion_frr.RESILIENCE_STEPS,
+    }
+
+
+def _set_param(tables: Mapping[str, Dict[Any, Any]], key: str, value: float) -> None:
+    head, _, rest = key.partition(".")
+    if head not in tables or not rest:
+        raise KeyError(f"unknown sweep parameter: {key}")
+    table = tables[head]
+
+    if head == "resilience":
+        steps = table
+        if rest in _RESILIENCE_SIGN:
+            sign = _RESILIENCE_SIGN[rest]
+            steps[sign] = (float(value), steps[sign][1])
+        elif rest == "ceiling":
+            steps[1] = (steps[1][0], float(value))
+        elif rest == "floor":
+            for sign in (-1, 0):
+                steps[sign] = (steps[sign][0], float(value))
+        else:
+            raise KeyError(f"unknown sweep parameter: {key}")
+        return
+
+    if head in ("burst", "recovery"):
+        level, _, field = rest.partition(".")
+        if level not in table or field not in table[level]:
+            raise KeyError(f"unknown sweep parameter: {key}")
+        table[level][field] = float(value)
+    elif rest not in table:
+        raise KeyError(f"unknown sweep parameter: {key}")
+    elif head == "cooling":
+        table[rest] = int(value)
+    else:
+        table[rest] = float(value)
+
+
+@contextmanager
+def parameter_overrides(params: Mapping[str, float]) -> Iterator[None]:
+    """Temporarily apply a parameter set to the module tables (restored on exit)."""
+    tables = _tables()
+    saved = {name: copy.deepcopy(table) for name, table in tables.items()}
+    try:
+        for key, value in params.items():
+            _set_param(tables, key, value)
+        yield
+    finally:
+        for name, table in tables.items():
+            table.clear()
+            table.update(saved[name])
+
+
+def parameter_grid(axes: Mapping[str, Sequence[float]]) -> List[ParamSet]:
+    """Cartesian product of per-parameter value lists."""
+    keys = list(axes)
+    return [dict(zip(keys, values)) for values in itertools.product(*(axes[k] for k in keys))]
+
+
+def random_parameter_sets(
+    ranges: Mapping[str, Tuple[float, float]], n: int, seed: Optional[int] = None
+) -> List[ParamSet]:
+    """n parameter sets drawn uniformly from [lo, hi] per parameter."""
+    rng = random.Random(seed)
+    return [{k: rng.uniform(lo, hi) for k, (lo, hi) in ranges.items()} for _ in range(n)]
+
+
+# ──────────────────────────────────────────────────────────────────────
+# traces
+# ──────────────────────────────────────────────────────────────────────
+def synthetic_traces(n: int, length: int, seed: Optional[int] = None) -> List[List[float]]:
+    """Regime-switching feedback: calm stretches with occasional negative runs."""
+    rng = random.Random(seed)
+    traces = []
+    for _ in range(n):
+        trace, distressed = [], False
+        for _ in range(length):
+            if rng.random() < (0.15 if distressed else 0.05):
+                distressed = not distressed
+            mean = -0.7 if distressed else 0.2
+            trace.append(max(-1.0, min(1.0, rng.gauss(mean, 0.35))))
+        traces.append(trace)
+    return traces
+
+
+def load_traces(path: str) -> List[List[float]]:
+    """
+    Recorded traces: a JSON list of feedback lists, or a CSV with columns
+    `trace,feedback` (rows in replay order).
+    """
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return [[float(x) for x in trace] for trace in json.load(f)]
+    grouped: Dict[str, List[float]] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            grouped.setdefault(row["trace"], []).append(float(row["feedback"]))
+    return list(grouped.values())
+
+
+# ──────────────────────────────────────────────────────────────────────
+# replay
+# ──────────────────────────────────────────────────────────────────────
+@dataclass
+class SweepResult:
+    param_id: int
+    params: ParamSet
+    metrics: Dict[str, float]
+
+
+def replay_trace(trace: Trace, strategy: str = SWEEP_STRATEGY) -> Dict[str, Any]:
+    """Replay one trace with the current module tables; raw counts for aggregation."""
+    state = FRRState(history_retention=_REPLAY_RETENTION)
+    levels = {lv: 0 for lv in emotion_trigger.BURST_LEVELS}
+    in_burst, latencies = 0, []
+    cooling, episode_start = 0, None
+
+    for step, fb in enumerate(trace):
+        update_frr(state, strategy, feedback_score=fb)
+        was_cooling = cooling > 0
+        if was_cooling:
+            cooling -= 1
+            level = ""
+        else:
+            level = trigger_burst(state, strategy)
+        if level:
+            levels[level] += 1
+            apply_burst_recovery(state, level)
+            cooling = getattr(state, "cooling_period", 0)
+            if episode_start is None:
+                episode_start = step
+
+        if episode_start is not None:
+            if level or was_cooling:
+                in_burst += 1
+            else:
+                latencies.append(step - episode_start)
+                episode_start = None
+
+    return dict(steps=len(trace), levels=levels, in_burst=in_burst, latencies=latencies,
+                unresolved=int(episode_start is not None))
+
+
+def evaluate_params(params: ParamSet, traces: Sequence[Trace]) -> Dict[str, float]:
+    """Aggregate sweep metrics for one parameter set over all traces."""
+    with parameter_overrides(params):
+        runs = [replay_trace(trace) for trace in traces]
+
+    steps = sum(r["steps"] for r in runs) or 1
+    latencies = [lat for r in runs for lat in r["latencies"]]
+    bursts = {lv: sum(r["levels"][lv] for r in runs) for lv in runs[0]["levels"]} if runs else {}
+    metrics: Dict[str, float] = dict(
+        steps=float(steps),
+        bursts=float(sum(bursts.values())),
+        burst_rate=sum(bursts.values()) / steps,
+        time_in_burst=sum(r["in_burst"] for r in runs) / steps,
+        recovery_latency=(sum(latencies) / len(latencies)) if latencies else math.nan,
+        unresolved=float(sum(r["unresolved"] for r in runs)),
+    )
+    metrics.update({f"bursts_{lv}": float(n) for lv, n in bursts.items()})
+    return metrics
+
+
+_WORKER_TRACES: Sequence[Trace] = ()
+
+
+def _init_worker(traces: Sequence[Trace]) -> None:
+    global _WORKER_TRACES
+    _WORKER_TRACES = traces
+
+
+def _evaluate_chunk(chunk: List[Tuple[int, ParamSet]]) -> List[SweepResult]:
+    return [SweepResult(pid, params, evaluate_params(params, _WORKER_TRACES)) for pid, params in chunk]
+
+
+# ──────────────────────────────────────────────────────────────────────
+# checkpoint + driver
+# ──────────────────────────────────────────────────────────────────────
+def _read_checkpoint(path: str) -> Dict[int, SweepResult]:
+    done: Dict[int, SweepResult] = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from an interrupted run
+            done[rec["id"]] = SweepResult(rec["id"], rec["params"], rec["metrics"])
+    return done
+
+
+def run_sweep(
+    param_sets: Sequence[ParamSet],
+    traces: Sequence[Trace],
+    workers: Optional[int] = None,
+    checkpoint: Optional[str] = None,
+    chunk_size: int = 1,
+) -> List[SweepResult]:
+    """
+    Evaluate every parameter set; returns results ordered by param_id (= index).
+
+    Args:
+        workers: process count; None -> os.cpu_count(), 0 or 1 -> run in-process.
+        checkpoint: JSONL file; sets already recorded there are not recomputed.
+        chunk_size: parameter sets per task sent to a worker.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+
+    done = _read_checkpoint(checkpoint) if checkpoint else {}
+    for pid, res in done.items():
+        if pid >= len(param_sets) or res.params != dict(param_sets[pid]):
+            raise ValueError(f"checkpoint {checkpoint} does not match parameter set {pid}")
+
+    todo = [(pid, dict(p)) for pid, p in enumerate(param_sets) if pid not in done]
+    chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    sink = open(checkpoint, "a", encoding="utf-8") if checkpoint else None
+
+    def _record(results: List[SweepResult]) -> None:
+        for res in results:
+            done[res.param_id] = res
+            if sink:
+                sink.write(json.dumps({"id": res.param_id, "params": res.params, "metrics": res.metrics}) + "\n")
+        if sink:
+            sink.flush()
+
+    try:
+        n_workers = (os.cpu_count() or 1) if workers is None else int(workers)
+        if n_workers <= 1:
+            _init_worker(traces)
+            for chunk in chunks:
+                _record(_evaluate_chunk(chunk))
+        else:
+            pending: Deque[Future] = deque()
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(list(traces),)) as pool:
+                try:
+                    for chunk in chunks:
+                        pending.append(pool.submit(_evaluate_chunk, chunk))
+                        if len(pending) >= 2 * n_workers:
+                            _record(pending.popleft().result())
+                    while pending:
+                        _record(pending.popleft().result())
+                finally:
+                    for fut in pending:
+                        fut.cancel()
+    finally:
+        if sink:
+            sink.close()
+
+    return [done[pid] for pid in sorted(done)]
+
+
+def write_csv(results: Sequence[SweepResult], path: str) -> None:
+    params = sorted({k for r in results for k in r.params})
+    metrics = sorted({k for r in results for k in r.metrics})
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["param_id", *params, *metrics])
+        for r in results:
+            writer.writerow([r.param_id, *(r.params.get(k, "") for k in params),
+                             *(r.metrics.get(k, "") for k in metrics)])
+
+
+def write_npz(results: Sequence[SweepResult], path: str) -> None:
+    """One float array per parameter / metric column (NaN where missing), plus param_id."""
+    import numpy as np
+
+    params = sorted({k for r in results for k in r.params})
+    metrics = sorted({k for r in results for k in r.metrics})
+    arrays = {"param_id": np.array([r.param_id for r in results], dtype=np.int64)}
+    for prefix, keys, attr in (("param:", params, "params"), ("metric:", metrics, "metrics")):
+        for k in keys:
+            arrays[prefix + k] = np.array([getattr(r, attr).get(k, np.nan) for r in results], dtype=np.float64)
+    np.savez(path, **arrays)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────
+def _parse_axis(spec: str) -> Tuple[str, List[float]]:
+    key, _, values = spec.partition("=")
+    return key, [float(v) for v in values.split(",") if v]
+
+
+def _parse_range(spec: str) -> Tuple[str, Tuple[float, float]]:
+    key, _, bounds = spec.partition("=")
+    lo, _, hi = bounds.partition(":")
+    return key, (float(lo), float(hi))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="FRR burst/recovery parameter sweep")
+    ap.add_argument("--traces", help="recorded traces (.json or trace,feedback .csv); default: synthetic")
+    ap.add_argument("--n-traces", type=int, default=64)
+    ap.add_argument("--length", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--grid", action="append", default=[], metavar="KEY=V1,V2,...")
+    ap.add_argument("--range", action="append", default=[], metavar="KEY=LO:HI")
+    ap.add_argument("--samples", type=int, default=0, help="random parameter sets drawn from --range")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--checkpoint")
+    ap.add_argument("--csv")
+    ap.add_argument("--npz")
+    args = ap.parse_args(argv)
+
+    traces = load_traces(args.traces) if args.traces else synthetic_traces(args.n_traces, args.length, args.seed)
+    param_sets = parameter_grid(dict(map(_parse_axis, args.grid))) if args.grid else []
+    if args.samples:
+        param_sets += random_parameter_sets(dict(map(_parse_range, args.range)), args.samples, args.seed)
+    if not param_sets:
+        param_sets = [{}]  # baseline only
+
+    results = run_sweep(param_sets, traces, workers=args.workers, checkpoint=args.checkpoint)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.npz:
+        write_npz(results, args.npz)
+    for r in results[:20]:
+        m = r.metrics
+        print(f"#{r.param_id:<4} burst_rate={m['burst_rate']:.4f} time_in_burst={m['time_in_burst']:.4f} "
+              f"latency={m['recovery_latency']:.2f} {r.params}")
+
+
+__all__ = [
+    "SweepResult", "evaluate_params", "load_traces", "parameter_grid", "parameter_overrides",
+    "random_parameter_sets", "replay_trace", "run_sweep", "synthetic_traces", "write_csv", "write_npz",
+]
+
+
+if __name__ == "__main__":
+    main()
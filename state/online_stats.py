@@ -0,0 +1,149 @@
+"""
+online_stats.py
+---------------
+策略反馈的流式统计量（O(1) 更新 / O(1) 读取）。
+
+按 Welford / West 的加权递推维护：
+    - count / weight : 样本数与（遗忘加权后的）总权重
+    - mean / variance: 反馈均值与总体方差（等价于 statistics.pstdev 的平方）
+    - slope          : 反馈对样本序号 0..n-1 的最小二乘斜率
+                       （等价于 emotion_trigger._calculate_regression_slope）
+
+push_repeated(y, n) 一次并入 n 个相同样本：块内权重的幂和用对数次倍增求出，
+再按 Chan 的并行合并公式合入，O(log n)。
+
+forgetting < 1.0 时启用指数遗忘：每来一个新样本，旧样本权重乘以 forgetting，
+统计量随之偏向近期；forgetting == 1.0（默认）时与整段历史的两遍算法一致（仅浮点误差）。
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Tuple
+
+
+class OnlineStats:
+    __slots__ = ("forgetting", "count", "weight", "mean_x", "mean_y", "m2_x", "m2_y", "c_xy")
+
+    def __init__(self, forgetting: float = 1.0):
+        if not 0.0 < forgetting <= 1.0:
+            raise ValueError("forgetting must be in (0, 1]")
+        self.forgetting = float(forgetting)
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.weight = 0.0
+        self.mean_x = 0.0  # 样本序号均值
+        self.mean_y = 0.0  # 反馈均值
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def push(self, y: float) -> None:
+        """加入一个反馈样本（序号自动为 count）。"""
+        lam = self.forgetting
+        x = float(self.count)
+        self.count += 1
+        self.weight = lam * self.weight + 1.0
+
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.weight
+        self.mean_y += dy / self.weight
+        self.m2_x = lam * self.m2_x + dx * (x - self.mean_x)
+        self.m2_y = lam * self.m2_y + dy * (y - self.mean_y)
+        self.c_xy = lam * self.c_xy + dx * (y - self.mean_y)
+
+    def push_repeated(self, y: float, n: int) -> None:
+        """加入 n 个相同的反馈样本（序号 count .. count+n-1），等价于 n 次 push。"""
+        n = int(n)
+        if n <= 0:
+            return
+        if n == 1:
+            self.push(y)
+            return
+        lam = self.forgetting
+        # 块内第 j 个样本的权重为 lam**k（k = n-1-j）；s0/s1/s2 = Σ lam**k · k**p
+        s0, s1, s2 = _power_sums(lam, n)
+        w_b = s0
+        mean_k = s1 / s0
+        m2_b = max(0.0, s2 - s1 * mean_k)
+        mean_x_b = self.count + (n - 1) - mean_k
+
+        decay = lam ** n
+        w_a = self.weight * decay
+        w = w_a + w_b
+        dx = mean_x_b - self.mean_x
+        dy = y - self.mean_y
+        f = w_a * w_b / w
+
+        self.mean_x += dx * w_b / w
+        self.mean_y += dy * w_b / w
+        self.m2_x = self.m2_x * decay + m2_b + dx * dx * f
+        self.m2_y = self.m2_y * decay + dy * dy * f
+        self.c_xy = self.c_xy * decay + dx * dy * f
+        self.weight = w
+        self.count += n
+
+    @property
+    def mean(self) -> float:
+        return self.mean_y if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """总体方差；少于 2 个样本返回 0"""
+        if self.count < 2:
+            return 0.0
+        return max(0.0, self.m2_y / self.weight)
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def slope(self) -> float:
+        """反馈随序号的最小二乘斜率；少于 2 个样本返回 0"""
+        if self.count < 2:
+            return 0.0
+        return self.c_xy / (self.m2_x or 1e-6)
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(count=self.count, mean=self.mean, variance=self.variance, slope=self.slope)
+
+    def __repr__(self) -> str:
+        return f"OnlineStats(count={self.count}, mean={self.mean:.4f}, var={self.variance:.4f}, slope={self.slope:.4f})"
+
+
+def _power_sums(lam: float, n: int) -> Tuple[float, float, float]:
+    """(Σ lam**k, Σ k·lam**k, Σ k²·lam**k)，k = 0..n-1；按二进制拆分倍增拼接。"""
+    # acc: 已拼好的前 a 项；blk: 长度为 2**i 的块，blk_pow = lam**len
+    acc, a, acc_pow = (0.0, 0.0, 0.0), 0, 1.0
+    blk, b, blk_pow = (1.0, 0.0, 0.0), 1, lam
+    while n:
+        if n & 1:
+            acc = _concat(acc, a, acc_pow, blk)
+            a += b
+            acc_pow *= blk_pow
+        n >>= 1
+        if n:
+            blk = _concat(blk, b, blk_pow, blk)
+            b *= 2
+            blk_pow *= blk_pow
+    return acc
+
+
+def _concat(
+    head: Tuple[float, float, float], length: int, head_pow: float, tail: Tuple[float, float, float]
+) -> Tuple[float, float, float]:
+    """把 tail（下标从 0 起）接在长度为 length 的 head 之后，tail 下标整体平移 length。"""
+    h0, h1, h2 = head
+    t0, t1, t2 = tail
+    return (
+        h0 + head_pow * t0,
+        h1 + head_pow * (t1 + length * t0),
+        h2 + head_pow * (t2 + 2 * length * t1 + length * length * t0),
+    )
+
+
+__all__ = ["OnlineStats"]
@@ -0,0 +1,49 @@
+# cabsaia/state/session_locks.py
+"""
+Striped per-session locks.
+
+Every code path that changes a session's FRRState and logs the change
+(update_frr, fast_forward_frr, apply_burst_recovery, RoleEngine decisions
+and timer expiries) holds lock_for(state) around both steps. A
+StrategyLog checkpoint takes all the stripes of the sessions it saves
+(holding_all) first, so its snapshot never includes a change whose event
+has not been sequenced yet.
+
+The stripes are shared by every session, so no lock is allocated per
+session. They are re-entrant because RoleEngine calls the FRR hooks while
+already holding the lock. Lock order is always stripes (ascending) before
+the StrategyLog lock.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator
+
+LOCK_STRIPES = 64
+_LOCKS = tuple(threading.RLock() for _ in range(LOCK_STRIPES))
+
+
+def _stripe(state: Any) -> int:
+    return (id(state) >> 4) % LOCK_STRIPES
+
+
+def lock_for(state: Any) -> threading.RLock:
+    return _LOCKS[_stripe(state)]
+
+
+@contextmanager
+def holding_all(states: Iterable[Any]) -> Iterator[None]:
+    """Hold the stripes of all `states` (acquired in ascending order)."""
+    stripes = sorted({_stripe(s) for s in states})
+    taken = []
+    try:
+        for i in stripes:
+            _LOCKS[i].acquire()
+            taken.append(i)
+        yield
+    finally:
+        for i in reversed(taken):
+            _LOCKS[i].release()
+
+
+__all__ = ["LOCK_STRIPES", "holding_all", "lock_for"]
@@ -0,0 +1,381 @@
+# cabsaia/state/snapshot.py
+"""
+Compact, versioned binary snapshots of many sessions in one file.
+
+A session is an FRRState (with its per-strategy feedback rings and their
+OnlineStats) plus an optional EmotionalState. Sessions are stored column-wise
+so that saving / restoring 100k of them is a handful of array copies rather
+than a pickle walk over dicts of dicts:
+
+    header   "CBSNAP" + u16 format version
+    blocks   u64 byte length + payload, in a fixed order per version
+      v1:  meta JSON        session ids, strategy names, string columns, sparse extras
+           FRR floats       one float64 column per field in _FRR_FLOATS
+           FRR ints         one int64 column per field in _FRR_INTS
+           bucket ints      (session, strategy, retention, stats.count, length) per bucket
+           bucket floats    OnlineStats accumulators per bucket
+           events           timestamp / feedback / energy columns, all buckets concatenated
+           emotion floats   one float64 column per field in _EMOTION_FLOATS
+      v2:  v1 blocks (FRR ints gain history_rollup), then
+           rollup ints      (bucket row, bucket counts per tier, has older, has untimed) per rolled-up ring
+           rollup floats    FeedbackRollup buckets (BUCKET_FIELDS each), in to_flat() order
+
+Numbers are little-endian. Runtime attributes attached by main.py /
+RoleEngine / apply_burst_recovery (avoid_mode, last_burst_level,
+last_prompt_style, cooling_period, ...) are stored explicitly; any other extra
+attribute is kept if it is JSON-serialisable. FRRState.strategy_state goes into
+the meta block (deques are tagged so they come back as deques).
+
+Older files stay loadable: loads_sessions() dispatches on the header version
+through _READERS, so a format bump adds a reader instead of replacing one.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import logging
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from state.emotion import EmotionalState
+from state.emotion_frr import FRRState, UserProfile
+from state.feedback_history import FeedbackRing, HistoryStore
+from state.feedback_rollup import BUCKET_FIELDS, TIERS, FeedbackRollup
+from state.online_stats import OnlineStats
+
+FORMAT_VERSION = 2
+MAGIC = b"CBSNAP"
+
+_HEADER = struct.Struct("<6sH")
+_BLOCK = struct.Struct("<Q")
+_NO_COOLING = -1
+
+Session = Tuple[FRRState, Optional[EmotionalState]]
+
+# FRRState fields by storage column (order is part of the layout)
+_FRR_FLOATS = ("emotion_debt", "resilience", "energy", "avoid_mode_since", "last_switch_time", "stats_forgetting")
+_FRR_INTS_V1 = ("time_active", "avoid_mode", "pending_resume_confirm", "history_retention", "cooling_period")
+_FRR_INTS = _FRR_INTS_V1 + ("history_rollup",)
+_FRR_STRINGS = ("last_style", "last_burst_level", "last_prompt_style")
+_STATS_FLOATS = ("forgetting", "weight", "mean_x", "mean_y", "m2_x", "m2_y", "c_xy")
+_EMOTION_FLOATS = ("valence", "arousal", "dominance", "resilience", "emotion_debt", "last_update")
+
+# attributes restored from their own columns / derived on load
+_FRR_KNOWN = set(_FRR_FLOATS) | set(_FRR_INTS) | set(_FRR_STRINGS) | {
+    "history", "user_profile", "strategy_state", "burst_thresholds",
+}
+
+logger = logging.getLogger(__name__)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# helpers
+# ──────────────────────────────────────────────────────────────────────
+def _le(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _from_le(typecode: str, raw: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(raw)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, deque):
+        return {"__deque__": list(value), "maxlen": value.maxlen}
+    raise TypeError(f"not JSON serialisable: {type(value).__name__}")
+
+
+def _json_hook(obj: Dict[str, Any]) -> Any:
+    if "__deque__" in obj:
+        return deque(obj["__deque__"], maxlen=obj.get("maxlen"))
+    return obj
+
+
+def _json_safe(value: Any) -> bool:
+    try:
+        json.dumps(value, default=_json_default)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+# ──────────────────────────────────────────────────────────────────────
+# writer
+# ──────────────────────────────────────────────────────────────────────
+def dumps_sessions(sessions: Mapping[str, Union[FRRState, Session]]) -> bytes:
+    """Serialise {session_id: FRRState | (FRRState, EmotionalState | None)}."""
+    ids: List[str] = []
+    frrs: List[FRRState] = []
+    emotions: List[Optional[EmotionalState]] = []
+    for sid, value in sessions.items():
+        frr, emo = (value, None) if isinstance(value, FRRState) else value
+        ids.append(str(sid))
+        frrs.append(frr)
+        emotions.append(emo)
+
+    strategies: Dict[str, int] = {}
+    bucket_ints, bucket_floats = array("q"), array("d")
+    ev_ts, ev_fb, ev_en = array("d"), array("d"), array("d")
+    rollup_ints, rollup_floats = array("q"), array("d")
+    extras: Dict[int, Dict[str, Any]] = {}
+    strategy_state: Dict[int, Any] = {}
+    row = 0
+
+    for i, frr in enumerate(frrs):
+        for name, ring in frr.history.items():
+            if not isinstance(ring, FeedbackRing):
+                ring = FeedbackRing(max(1, len(ring)), ring)
+            sid = strategies.setdefault(name, len(strategies))
+            ts, fb, en = ring.columns()
+            ev_ts.extend(ts)
+            ev_fb.extend(fb)
+            ev_en.extend(en)
+            bucket_ints.extend((i, sid, ring.capacity, ring.stats.count, len(fb)))
+            bucket_floats.extend(getattr(ring.stats, f) for f in _STATS_FLOATS)
+            if ring.rollup is not None:
+                sizes, flat = ring.rollup.to_flat()
+                rollup_ints.append(row)
+                rollup_ints.extend(sizes)
+                rollup_floats.extend(flat)
+            row += 1
+
+        if frr.strategy_state:
+            strategy_state[i] = frr.strategy_state
+        extra = {k: v for k, v in vars(frr).items() if k not in _FRR_KNOWN}
+        dropped = [k for k, v in extra.items() if not _json_safe(v)]
+        for k in dropped:
+            logger.warning("[snapshot] session %s: dropping non-serialisable attribute %r", ids[i], k)
+            del extra[k]
+        if extra:
+            extras[i] = extra
+
+    emo_rows = [i for i, e in enumerate(emotions) if e is not None]
+    meta = {
+        "sessions": ids,
+        "strategies": list(strategies),
+        "personality": [f.user_profile.personality for f in frrs],
+        "strings": {k: [getattr(f, k, None) for f in frrs] for k in _FRR_STRINGS},
+        "strategy_state": strategy_state,
+        "extras": extras,
+        "emotion_rows": emo_rows,
+        "emotion_personality": [emotions[i].personality_type for i in emo_rows],
+    }
+
+    frr_floats = array("d")
+    for k in _FRR_FLOATS:
+        frr_floats.extend(float(getattr(f, k)) for f in frrs)
+    frr_ints = array("q")
+    for k in _FRR_INTS:
+        default = _NO_COOLING if k == "cooling_period" else 0
+        frr_ints.extend(int(getattr(f, k, default)) for f in frrs)
+    emo_floats = array("d")
+    for k in _EMOTION_FLOATS:
+        emo_floats.extend(float(getattr(emotions[i], k)) for i in emo_rows)
+
+    blocks = [
+        json.dumps(meta, default=_json_default, separators=(",", ":")).encode("utf-8"),
+        _le(frr_floats), _le(frr_ints),
+        _le(bucket_ints), _le(bucket_floats),
+        _le(ev_ts), _le(ev_fb), _le(ev_en),
+        _le(emo_floats),
+        _le(rollup_ints), _le(rollup_floats),
+    ]
+    out = [_HEADER.pack(MAGIC, FORMAT_VERSION)]
+    for block in blocks:
+        out.append(_BLOCK.pack(len(block)))
+        out.append(block)
+    return b"".join(out)
+
+
+def save_sessions(path: Union[str, Path], sessions: Mapping[str, Union[FRRState, Session]]) -> None:
+    """Write a snapshot atomically (temp file + rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = dumps_sessions(sessions)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# ──────────────────────────────────────────────────────────────────────
+# readers
+# ──────────────────────────────────────────────────────────────────────
+def _split_blocks(data: memoryview, offset: int) -> List[memoryview]:
+    blocks = []
+    while offset < len(data):
+        (size,) = _BLOCK.unpack_from(data, offset)
+        offset += _BLOCK.size
+        blocks.append(data[offset:offset + size])
+        offset += size
+    return blocks
+
+
+def _read_columns(
+    blocks: List[memoryview], frr_int_fields: Tuple[str, ...]
+) -> Tuple[Dict[str, Session], List[FeedbackRing]]:
+    """Blocks shared by v1 / v2; also returns the rings in bucket-row order."""
+    meta = json.loads(bytes(blocks[0]).decode("utf-8"), object_hook=_json_hook)
+    frr_floats = _from_le("d", blocks[1])
+    frr_ints = _from_le("q", blocks[2])
+    bucket_ints = _from_le("q", blocks[3])
+    bucket_floats = _from_le("d", blocks[4])
+    ev_ts, ev_fb, ev_en = (_from_le("d", b) for b in blocks[5:8])
+    emo_floats = _from_le("d", blocks[8])
+
+    ids: List[str] = meta["sessions"]
+    n = len(ids)
+    floats = {k: frr_floats[j * n:(j + 1) * n] for j, k in enumerate(_FRR_FLOATS)}
+    ints = {k: frr_ints[j * n:(j + 1) * n] for j, k in enumerate(frr_int_fields)}
+    strings = meta["strings"]
+    personality = meta["personality"]
+    extras = {int(k): v for k, v in meta["extras"].items()}
+    strategy_state = {int(k): v for k, v in meta["strategy_state"].items()}
+
+    # per-personality pieces shared by every restored session
+    thresholds: Dict[str, Dict[str, float]] = {}
+    frrs: List[FRRState] = []
+    float_rows = zip(*(floats[k] for k in _FRR_FLOATS))
+    int_rows = zip(*(ints[k] for k in frr_int_fields))
+    string_rows = zip(*(strings[k] for k in _FRR_STRINGS))
+    for i, (frow, irow, srow) in enumerate(zip(float_rows, int_rows, string_rows)):
+        p = personality[i]
+        if p not in thresholds:
+            thresholds[p] = FRRState(user_profile=UserProfile(p)).burst_thresholds
+
+        time_active, avoid_mode, pending, retention, cooling = irow[:5]
+        rollup = bool(irow[5]) if len(irow) > 5 else False
+        history = HistoryStore.__new__(HistoryStore)
+        if retention != HistoryStore.retention:
+            history.retention = retention
+        if frow[-1] != HistoryStore.forgetting:
+            history.forgetting = frow[-1]
+        if rollup:
+            history.rollup = True
+
+        attrs = dict(zip(_FRR_FLOATS, frow))
+        attrs.update(
+            time_active=time_active,
+            avoid_mode=bool(avoid_mode),
+            pending_resume_confirm=bool(pending),
+            history_retention=retention,
+            history_rollup=rollup,
+            user_profile=UserProfile(p),
+            strategy_state=strategy_state.get(i, {}),
+            burst_thresholds=dict(thresholds[p]),
+            history=history,
+        )
+        if cooling != _NO_COOLING:
+            attrs["cooling_period"] = cooling
+        for k, value in zip(_FRR_STRINGS, srow):
+            if value is not None:
+                attrs[k] = value
+        if i in extras:
+            attrs.update(extras[i])
+        frr = object.__new__(FRRState)
+        frr.__dict__ = attrs
+        frrs.append(frr)
+
+    strategies = meta["strategies"]
+    pos = 0
+    rings: List[FeedbackRing] = []
+    bucket_rows = zip(*[iter(bucket_ints.tolist())] * 5)
+    stats_rows = zip(*[iter(bucket_floats.tolist())] * len(_STATS_FLOATS))
+    new_stats, new_ring = OnlineStats.__new__, FeedbackRing.from_columns
+    for (i, sid, capacity, count, length), srow in zip(bucket_rows, stats_rows):
+        stats = new_stats(OnlineStats)
+        stats.forgetting, stats.weight, stats.mean_x, stats.mean_y, stats.m2_x, stats.m2_y, stats.c_xy = srow
+        stats.count = count
+        end = pos + length
+        ring = new_ring(capacity, ev_ts[pos:end], ev_fb[pos:end], ev_en[pos:end], stats)
+        dict.__setitem__(frrs[i].history, strategies[sid], ring)
+        rings.append(ring)
+        pos = end
+
+    emotions: List[Optional[EmotionalState]] = [None] * n
+    rows = meta["emotion_rows"]
+    m = len(rows)
+    templates: Dict[str, Dict[str, Any]] = {}
+    emo_rows = zip(*(emo_floats[j * m:(j + 1) * m] for j in range(len(_EMOTION_FLOATS))))
+    for i, p, values in zip(rows, meta["emotion_personality"], emo_rows):
+        if p not in templates:
+            templates[p] = vars(EmotionalState(personality_type=p))
+        emo = object.__new__(EmotionalState)
+        emo.__dict__.update(templates[p])
+        emo.__dict__.update(zip(_EMOTION_FLOATS, values))
+        emotions[i] = emo
+
+    return {sid: (frrs[i], emotions[i]) for i, sid in enumerate(ids)}, rings
+
+
+def _read_v1(blocks: List[memoryview]) -> Dict[str, Session]:
+    return _read_columns(blocks, _FRR_INTS_V1)[0]
+
+
+def _read_v2(blocks: List[memoryview]) -> Dict[str, Session]:
+    sessions, rings = _read_columns(blocks[:9], _FRR_INTS)
+    rollup_ints = _from_le("q", blocks[9]).tolist()
+    rollup_floats = _from_le("d", blocks[10]).tolist()
+    stride = 1 + len(TIERS) + 2
+    width = len(BUCKET_FIELDS)
+    pos = 0
+    for k in range(0, len(rollup_ints), stride):
+        row, sizes = rollup_ints[k], rollup_ints[k + 1:k + stride]
+        end = pos + sum(sizes) * width
+        rings[row].rollup = FeedbackRollup.from_flat(sizes, rollup_floats[pos:end])
+        pos = end
+    return sessions
+
+
+# format version -> reader; keep old entries when bumping FORMAT_VERSION
+_READERS = {1: _read_v1, 2: _read_v2}
+
+
+def loads_sessions(data: bytes) -> Dict[str, Session]:
+    """Inverse of dumps_sessions(): {session_id: (FRRState, EmotionalState | None)}."""
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError("not a CABSAIA snapshot (truncated header)")
+    magic, version = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("not a CABSAIA snapshot")
+    reader = _READERS.get(version)
+    if reader is None:
+        raise ValueError(f"unsupported snapshot version {version} (this build reads {sorted(_READERS)})")
+    # restoring creates millions of small objects; skip cyclic GC passes meanwhile
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return reader(_split_blocks(view, _HEADER.size))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def load_sessions(path: Union[str, Path]) -> Dict[str, Session]:
+    with open(path, "rb") as f:
+        return loads_sessions(f.read())
+
+
+__all__ = ["FORMAT_VERSION", "Session", "dumps_sessions", "load_sessions", "loads_sessions", "save_sessions"]
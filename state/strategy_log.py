@@ -0,0 +1,403 @@
+# cabsaia/state/strategy_log.py
+"""
+Append-only strategy event log (strategy_log.jsonl) with periodic checkpoints.
+
+Every state change that drives the FRR / RoleEngine loop is written as one
+JSON line:
+
+    update_frr      strategy, feedback, system_energy, ts
+    fast_forward    strategy, feedback, n, system_energy, ts
+    burst_recovery  level
+    cooling_expired                                  (RoleEngine timer cleared cooling_period)
+    style_switch    style, tone, burst_level, switch_time   (RoleEngine decision changed)
+    strategy_cooldown strategy, cooldown, recent_feedback    (RoleEngine strategy_state entry changed)
+    session_start   personality, history_retention, stats_forgetting, history_rollup
+
+Each line also carries a global sequence number, the wall-clock time and the
+session id. Lines are buffered and written in batches (batch_size /
+flush_interval); fsync=True makes every batch durable before returning.
+
+With checkpoint_every > 0 the log marks a checkpoint as due after that many
+events; it is written by the next maybe_checkpoint() (or checkpoint()) call,
+never from inside emit(), so the hot path only pays for the append. A
+checkpoint holds the striped locks of every attached session
+(state/session_locks.py) while it snapshots them through state/snapshot.py
+(checkpoint-<seq>.snap next to the log); every hook changes state and emits
+under that lock, so the snapshot is exactly the state after event <seq>.
+rebuild_sessions() loads the newest checkpoint and replays only the events
+after its sequence number.
+
+Hooks: update_frr / fast_forward_frr / apply_burst_recovery / RoleEngine call
+emit(state, ...); trigger_burst is a query and logs nothing (the transition
+it detects is logged by apply_burst_recovery). It is a no-op unless a log is active and the
+state was attached to it (attach() sets state.session_id). Attributes changed
+outside those hooks (e.g. main.py's avoid_mode flags) only reach a rebuilt
+session through checkpoints.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from state.session_locks import holding_all
+
+DEFAULT_FILENAME = "strategy_log.jsonl"
+CHECKPOINT_PREFIX = "checkpoint-"
+CHECKPOINT_SUFFIX = ".snap"
+
+logger = logging.getLogger(__name__)
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+_active: Optional["StrategyLog"] = None
+
+
+def _default_dir() -> Path:
+    from config import CONFIG
+    return Path(CONFIG.LOG_DIR)
+
+
+def _checkpoint_path(log_dir: Path, seq: int) -> Path:
+    return log_dir / f"{CHECKPOINT_PREFIX}{seq:012d}{CHECKPOINT_SUFFIX}"
+
+
+def list_checkpoints(log_dir: Union[str, Path, None] = None) -> List[Tuple[int, Path]]:
+    """[(seq, path)] of the checkpoints in log_dir, oldest first."""
+    log_dir = _default_dir() if log_dir is None else Path(log_dir)
+    if not log_dir.is_dir():
+        return []
+    found = []
+    for path in log_dir.glob(f"{CHECKPOINT_PREFIX}*{CHECKPOINT_SUFFIX}"):
+        digits = path.name[len(CHECKPOINT_PREFIX):-len(CHECKPOINT_SUFFIX)]
+        if digits.isdigit():
+            found.append((int(digits), path))
+    return sorted(found)
+
+
+def _last_seq(path: Path) -> Tuple[int, bool]:
+    """(sequence number of the last complete line, file ends mid-line)."""
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return 0, False
+    if not size:
+        return 0, False
+    with open(path, "rb") as f:
+        f.seek(max(0, size - 65536))
+        tail = f.read()
+    torn = not tail.endswith(b"\n")
+    for line in reversed(tail.splitlines()):
+        try:
+            return int(json.loads(line)["seq"]), torn
+        except (ValueError, KeyError, TypeError):
+            continue
+    return 0, torn
+
+
+class StrategyLog:
+    """
+    Batched JSONL writer for one log directory.
+
+    batch_size:       buffered events before a write (1 = write every event)
+    flush_interval:   also write once this many seconds passed since the last write
+    fsync:            os.fsync after every write
+    checkpoint_every: mark a checkpoint due after this many events (0 = off);
+                      callers run it between turns with maybe_checkpoint()
+    keep_checkpoints: older checkpoint files are removed
+    """
+
+    def __init__(
+        self,
+        log_dir: Union[str, Path, None] = None,
+        filename: str = DEFAULT_FILENAME,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        fsync: bool = False,
+        checkpoint_every: int = 0,
+        keep_checkpoints: int = 2,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.log_dir = _default_dir() if log_dir is None else Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.log_dir / filename
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.fsync = bool(fsync)
+        self.checkpoint_every = int(checkpoint_every)
+        self.keep_checkpoints = max(1, int(keep_checkpoints))
+        self.clock = clock
+
+        self.sessions: Dict[str, Any] = {}
+        self._buffer: List[str] = []
+        self._lock = threading.RLock()
+
+        seq, torn = _last_seq(self.path)
+        checkpoints = list_checkpoints(self.log_dir)
+        self.seq = max(seq, checkpoints[-1][0] if checkpoints else 0)
+        self._since_checkpoint = 0
+        self.checkpoint_due = False
+        self._file = open(self.path, "a", encoding="utf-8")
+        if torn:
+            # a crash left half a line; terminate it so the next event starts clean
+            self._file.write("\n")
+        self._last_flush = time.monotonic()
+
+    # ── sessions ──────────────────────────────────────────────────────
+    def attach(self, session_id: str, frr: Any, emotion: Any = None) -> None:
+        """Register a session for logging and checkpoints (sets frr.session_id)."""
+        session_id = str(session_id)
+        frr.session_id = session_id
+        self.sessions[session_id] = (frr, emotion)
+        self.append(session_id, "session_start", {
+            "personality": frr.user_profile.personality,
+            "history_retention": frr.history_retention,
+            "stats_forgetting": frr.stats_forgetting,
+            "history_rollup": getattr(frr, "history_rollup", False),
+        })
+
+    def detach(self, session_id: str) -> None:
+        self.sessions.pop(str(session_id), None)
+
+    # ── writing ───────────────────────────────────────────────────────
+    def append(self, session_id: str, event: str, fields: Dict[str, Any]) -> int:
+        """Buffer one event; returns its sequence number."""
+        with self._lock:
+            self.seq += 1
+            record = {"seq": self.seq, "t": self.clock(), "session": session_id, "event": event}
+            record.update(fields)
+            self._buffer.append(_encode(record))
+            if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+            if self.checkpoint_every:
+                self._since_checkpoint += 1
+                if self._since_checkpoint >= self.checkpoint_every:
+                    self.checkpoint_due = True
+            return self.seq
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._buffer:
+                self._buffer.append("")
+                self._file.write("\n".join(self._buffer))
+                self._buffer.clear()
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._last_flush = time.monotonic()
+
+    def maybe_checkpoint(self) -> Optional[Path]:
+        """Write the checkpoint if checkpoint_every events have been logged since the last one."""
+        if not self.checkpoint_due:
+            return None
+        return self.checkpoint()
+
+    def checkpoint(self) -> Optional[Path]:
+        """
+        Snapshot attached sessions as of the current sequence number. Must not be
+        called while holding a session lock or from inside emit().
+        """
+        from state.snapshot import save_sessions
+
+        sessions = dict(self.sessions)
+        # stripes before the log lock: the same order as the hooks (lock_for -> emit)
+        with holding_all(frr for frr, _ in sessions.values()), self._lock:
+            self.flush()
+            self._since_checkpoint = 0
+            self.checkpoint_due = False
+            if not sessions:
+                return None
+            path = _checkpoint_path(self.log_dir, self.seq)
+            save_sessions(path, sessions)
+            for _, old in list_checkpoints(self.log_dir)[:-self.keep_checkpoints]:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+            return path
+
+    def close(self) -> None:
+        global _active
+        with self._lock:
+            if self._file.closed:
+                return
+            self.flush()
+            self._file.close()
+        if _active is self:
+            _active = None
+
+    def __enter__(self) -> "StrategyLog":
+        activate(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ──────────────────────────────────────────────────────────────────────
+# hooks
+# ──────────────────────────────────────────────────────────────────────
+def activate(log: Optional[StrategyLog]) -> None:
+    """Make log the target of emit() (None switches logging off)."""
+    global _active
+    _active = log
+
+
+def active_log() -> Optional[StrategyLog]:
+    return _active
+
+
+@contextmanager
+def suspended() -> Iterator[None]:
+    """Temporarily disable emit() (used while replaying)."""
+    global _active
+    saved, _active = _active, None
+    try:
+        yield
+    finally:
+        _active = saved
+
+
+def emit(state: Any, event: str, **fields: Any) -> None:
+    log = _active
+    if log is None:
+        return
+    session_id = getattr(state, "session_id", None)
+    if session_id is not None and session_id in log.sessions:
+        log.append(session_id, event, fields)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# replay
+# ──────────────────────────────────────────────────────────────────────
+def _line_seq(line: bytes) -> Optional[int]:
+    try:
+        return int(json.loads(line)["seq"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _seek_after(f, after_seq: int) -> None:
+    """
+    Position f at (or shortly before) the first line with seq > after_seq.
+    Sequence numbers grow along the file, so this bisects on byte offsets
+    instead of parsing the whole prefix.
+    """
+    lo, hi = 0, f.seek(0, os.SEEK_END)
+    while hi - lo > 65536:
+        mid = (lo + hi) // 2
+        f.seek(mid)
+        f.readline()  # skip the partial line
+        seq = None
+        while seq is None:
+            line = f.readline()
+            if not line:
+                break
+            seq = _line_seq(line)
+        if seq is not None and seq <= after_seq:
+            lo = mid
+        else:
+            hi = mid
+    f.seek(lo)
+    if lo:
+        f.readline()
+
+
+def read_events(path: Union[str, Path], after_seq: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield logged events with seq > after_seq; torn / corrupt lines are skipped."""
+    with open(path, "rb") as f:
+        if after_seq > 0:
+            _seek_after(f, after_seq)
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("[strategy_log] %s: skipping unreadable line at byte %d", path, f.tell())
+                continue
+            if record["seq"] > after_seq:
+                yield record
+
+
+def replay_events(sessions: Dict[str, Any], events: Iterable[Dict[str, Any]]) -> int:
+    """
+    Apply logged events to {session_id: (FRRState, EmotionalState | None)} in place.
+    Sessions first seen in the log are created from their session_start event.
+    Returns the number of events applied.
+    """
+    from state.emotion_frr import FRRState, UserProfile, fast_forward_frr, update_frr
+    from state.emotion_trigger import apply_burst_recovery
+
+    applied = 0
+    states = {sid: (s if isinstance(s, FRRState) else s[0]) for sid, s in sessions.items()}
+    with suspended():
+        for ev in events:
+            sid, kind = ev["session"], ev["event"]
+            state = states.get(sid)
+            if kind == "session_start":
+                if state is None:
+                    state = FRRState(
+                        user_profile=UserProfile(ev["personality"]),
+                        history_retention=ev["history_retention"],
+                        stats_forgetting=ev["stats_forgetting"],
+                        history_rollup=ev.get("history_rollup", False),
+                    )
+                    state.session_id = sid
+                    states[sid] = state
+                    sessions[sid] = (state, None)
+            elif state is None:
+                logger.warning("[strategy_log] event %s for unknown session %r", ev["seq"], sid)
+                continue
+            elif kind == "update_frr":
+                update_frr(state, ev["strategy"], ev["feedback"], ev.get("system_energy"), timestamp=ev["ts"])
+            elif kind == "fast_forward":
+                fast_forward_frr(state, ev["strategy"], ev["feedback"], ev["n"], ev.get("system_energy"),
+                                 timestamp=ev["ts"])
+            elif kind == "burst_recovery":
+                apply_burst_recovery(state, ev["level"])
+            elif kind == "cooling_expired":
+                state.__dict__.pop("cooling_period", None)
+            elif kind == "strategy_cooldown":
+                ss = state.strategy_state.setdefault(ev["strategy"], {})
+                ss["cooldown"] = ev["cooldown"]
+                ss["recent_feedback"] = deque(ev["recent_feedback"], maxlen=5)
+            elif kind == "style_switch":
+                state.last_style = ev["style"]
+                state.last_prompt_style = ev["tone"]
+                state.last_burst_level = ev["burst_level"]
+                state.last_switch_time = ev["switch_time"]
+            applied += 1
+    return applied
+
+
+def rebuild_sessions(
+    log_dir: Union[str, Path, None] = None,
+    filename: str = DEFAULT_FILENAME,
+) -> Dict[str, Any]:
+    """Newest checkpoint + replay of the events logged after it."""
+    from state.snapshot import load_sessions
+
+    log_dir = _default_dir() if log_dir is None else Path(log_dir)
+    checkpoints = list_checkpoints(log_dir)
+    sessions: Dict[str, Any] = {}
+    after = 0
+    if checkpoints:
+        after, path = checkpoints[-1]
+        sessions = load_sessions(path)
+    log_path = log_dir / filename
+    if log_path.exists():
+        replay_events(sessions, read_events(log_path, after_seq=after))
+    return sessions
+
+
+__all__ = [
+    "DEFAULT_FILENAME", "StrategyLog", "activate", "active_log", "emit", "list_checkpoints",
+    "read_events", "rebuild_sessions", "replay_events", "suspended",
+]
@@ -0,0 +1,175 @@
+# cabsaia/state/timer_wheel.py
+"""
+Hierarchical timer wheel for many short-lived expiries (tone cooldowns,
+burst cooling periods, strategy cooldowns across thousands of sessions).
+
+    level 0   SLOTS slots of `tick` seconds
+    level k   SLOTS slots of tick * SLOTS**k seconds
+
+A timer goes into the lowest level whose span covers its distance from the
+current tick; when a lower wheel wraps, the matching slot one level up is
+cascaded down. schedule() / cancel() are O(1) (each slot is a dict keyed by
+timer key, and each key maps to at most one pending timer: scheduling the
+same key again replaces it). advance(now) returns every timer due by `now`
+as one batch, in deadline order. Timers beyond the top level's span wait in
+its slots and are re-placed when cascaded.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+LEVELS = 4
+
+
+class Expiry(NamedTuple):
+    key: Hashable
+    deadline: float
+    payload: Any
+
+
+class _Timer:
+    __slots__ = ("key", "deadline", "tick", "payload", "level", "slot")
+
+    def __init__(self, key: Hashable, deadline: float, tick: int, payload: Any):
+        self.key = key
+        self.deadline = deadline
+        self.tick = tick
+        self.payload = payload
+        self.level = 0
+        self.slot = 0
+
+
+class TimerWheel:
+    def __init__(self, tick: float = 1.0, clock: Callable[[], float] = time.time):
+        if tick <= 0:
+            raise ValueError("tick must be > 0")
+        self.tick = float(tick)
+        self.clock = clock
+        self._now_tick = math.floor(clock() / self.tick)
+        self._wheels: List[List[Dict[Hashable, _Timer]]] = [[{} for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self._timers: Dict[Hashable, _Timer] = {}
+        self._counts = [0] * LEVELS  # pending timers per level (lets advance() skip empty spans)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        timer = self._timers.get(key)
+        return None if timer is None else timer.deadline
+
+    # ------------------------------------------------------------------
+    # insert / cancel
+    # ------------------------------------------------------------------
+    def _place(self, timer: _Timer) -> None:
+        delta = timer.tick - self._now_tick
+        if delta <= 0:
+            # already due: current slot, collected by the next advance()
+            level, slot = 0, self._now_tick % SLOTS
+        else:
+            level = 0
+            while level < LEVELS - 1 and delta >= SLOTS << (SLOT_BITS * level):
+                level += 1
+            if delta >= SLOTS << (SLOT_BITS * level):
+                # beyond the top span: park in the slot cascaded last, re-placed then
+                slot = ((self._now_tick >> (SLOT_BITS * level)) - 1) % SLOTS
+            else:
+                slot = (timer.tick >> (SLOT_BITS * level)) % SLOTS
+        timer.level, timer.slot = level, slot
+        self._wheels[level][slot][timer.key] = timer
+        self._counts[level] += 1
+
+    def _unlink(self, timer: _Timer) -> None:
+        del self._wheels[timer.level][timer.slot][timer.key]
+        self._counts[timer.level] -= 1
+
+    def schedule(self, key: Hashable, deadline: float, payload: Any = None) -> None:
+        """Arm (or re-arm) the timer for key; it fires at the first advance() with now >= deadline."""
+        timer = _Timer(key, float(deadline), math.ceil(deadline / self.tick), payload)
+        with self._lock:
+            old = self._timers.pop(key, None)
+            if old is not None:
+                self._unlink(old)
+            self._timers[key] = timer
+            self._place(timer)
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._lock:
+            timer = self._timers.pop(key, None)
+            if timer is None:
+                return False
+            self._unlink(timer)
+            return True
+
+    # ------------------------------------------------------------------
+    # advance
+    # ------------------------------------------------------------------
+    def _cascade(self, level: int) -> None:
+        slot = (self._now_tick >> (SLOT_BITS * level)) % SLOTS
+        bucket = self._wheels[level][slot]
+        if not bucket:
+            return
+        self._wheels[level][slot] = {}
+        self._counts[level] -= len(bucket)
+        for timer in bucket.values():
+            self._place(timer)
+
+    def _collect_current(self, due: List[_Timer]) -> None:
+        """Timers placed in the current slot because they were already due."""
+        bucket = self._wheels[0][self._now_tick % SLOTS]
+        for key in [k for k, tm in bucket.items() if tm.tick <= self._now_tick]:
+            due.append(bucket.pop(key))
+            del self._timers[key]
+            self._counts[0] -= 1
+
+    def advance(self, now: Optional[float] = None) -> List[Expiry]:
+        """Move the wheel to `now` (default clock()) and return the expired timers."""
+        now = self.clock() if now is None else now
+        target = math.floor(now / self.tick)
+        due: List[_Timer] = []
+        with self._lock:
+            self._collect_current(due)
+            while self._now_tick < target:
+                # nothing can happen before the next cascade of the lowest non-empty level
+                empty = 0
+                while empty < LEVELS and not self._counts[empty]:
+                    empty += 1
+                if empty:
+                    if empty == LEVELS:
+                        self._now_tick = target
+                        break
+                    span = 1 << (SLOT_BITS * empty)
+                    self._now_tick = min(target, (self._now_tick // span + 1) * span - 1)
+                    if self._now_tick == target:
+                        break
+                self._now_tick += 1
+                t = self._now_tick
+                for level in range(1, LEVELS):
+                    if t & ((1 << (SLOT_BITS * level)) - 1):
+                        break
+                    self._cascade(level)
+                bucket = self._wheels[0][t % SLOTS]
+                if bucket:
+                    self._wheels[0][t % SLOTS] = {}
+                    self._counts[0] -= len(bucket)
+                    for timer in bucket.values():
+                        if timer.tick <= t:
+                            due.append(timer)
+                            del self._timers[timer.key]
+                        else:
+                            self._place(timer)
+            self._collect_current(due)
+        due.sort(key=lambda tm: tm.deadline)
+        return [Expiry(tm.key, tm.deadline, tm.payload) for tm in due]
+
+
+__all__ = ["Expiry", "TimerWheel"]
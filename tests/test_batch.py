@@ -0,0 +1,52 @@
+# cabsaia/tests/test_batch.py
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processing.batch import analyse_emotion_batch, analyse_one
+from processing.context_negators import detect_negators
+from processing.emotion_classifier import analyse_emotion_from_text, infer_feedback_score
+
+TEXTS = [
+    "thanks, that helped",
+    "just go away",
+    "I feel very happy and grateful today",
+    "",
+    "whatever, you're useless",
+    "I walked my dog and watered the plants",
+] * 5
+
+
+def test_analyse_one_matches_single_calls():
+    for t in TEXTS[:6]:
+        r = analyse_one(t)
+        assert r.emotion == analyse_emotion_from_text(t)
+        assert r.feedback_score == infer_feedback_score(t)
+        assert r.negators == detect_negators(t)
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(0, 4), (2, 3), (2, 64)])
+def test_batch_preserves_order(workers, chunk_size):
+    results = list(analyse_emotion_batch(iter(TEXTS), workers=workers, chunk_size=chunk_size))
+    assert results == [analyse_one(t) for t in TEXTS]
+
+
+def test_batch_is_lazy():
+    consumed = []
+
+    def gen():
+        for t in TEXTS:
+            consumed.append(t)
+            yield t
+
+    it = analyse_emotion_batch(gen(), workers=0, chunk_size=2)
+    next(it)
+    assert len(consumed) == 2
+
+
+def test_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        list(analyse_emotion_batch(TEXTS, workers=0, chunk_size=0))
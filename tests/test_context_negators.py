@@ -41,4 +41,32 @@ def test_severity():
         "contempt": ["stupid"],
     }
     sev = get_severity(matches)
-    assert sev in {"moderate", "high", "critical"}
\ No newline at end of file
+    assert sev in {"moderate", "high", "critical"}
+
+def test_output_order_follows_lexicon():
+    det = ContextNegatorDetector({
+        "contempt": ["idiot", "stupid", "what an idiot"],
+        "communication_shutdown": ["shut up"],
+    })
+    m = det.detect("stupid idiot, what an idiot. shut up")
+    assert list(m.keys()) == ["contempt", "communication_shutdown"]
+    # multiword phrases first, then single words, each in lexicon order
+    assert m["contempt"] == ["what an idiot", "idiot", "stupid"]
+
+def test_same_phrase_in_several_categories(toy_lexicon):
+    lex = dict(toy_lexicon, rejection=["go away"])
+    det = ContextNegatorDetector(lex)
+    m = det.detect("just go away")
+    assert m == {"communication_shutdown": ["go away"], "rejection": ["go away"]}
+
+def test_apostrophe_boundaries():
+    det = ContextNegatorDetector({"contempt": ["stupid"], "shutdown": ["shut up"]})
+    # single words keep \b semantics (apostrophe is a boundary) ...
+    assert det.detect("that's stupid's problem") == {"contempt": ["stupid"]}
+    # ... multiword phrases only match whole tokens
+    assert det.detect("shut up's") == {}
+
+def test_matches_returns_pairs(toy_lexicon):
+    det = ContextNegatorDetector(toy_lexicon)
+    pairs = [(m.category, m.phrase) for m in det.matches("stop, you idiot")]
+    assert pairs == [("communication_shutdown", "stop"), ("contempt", "idiot")]
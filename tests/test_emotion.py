@@ -1,7 +1,7 @@
 # cabsaia/tests/test_emotion.py
 
 import pytest
-from cabsaia.state.emotion import EmotionalState
+from cabsaia.state.emotion import SECONDS_PER_TIME_UNIT, EmotionalState
 
 def test_emotion_update():
     state = EmotionalState(personality_type="neurotic")
@@ -41,3 +41,48 @@ def test_emotion_projection():
     proj = state.get_2d_projection()
     assert isinstance(proj, dict)
     assert "x" in proj and "y" in proj
+
+def test_lazy_decay_matches_explicit_maintenance():
+    clock = [1000.0]
+    lazy = EmotionalState(personality_type="introvert", clock=lambda: clock[0])
+    eager = EmotionalState(personality_type="introvert", clock=lambda: 1000.0)
+    for s in (lazy, eager):
+        s.update(delta_valence=-0.6, delta_arousal=0.4)
+
+    clock[0] += 5 * SECONDS_PER_TIME_UNIT   # 闲置 5 个单位，无需维护调用
+    eager.apply_emotional_maintenance(time_passed=5)
+
+    now = lazy.current()
+    assert now["valence"] == eager.valence
+    assert now["arousal"] == eager.arousal
+    assert now["emotion_debt"] == eager.emotion_debt
+    assert lazy.valence == -0.6              # 读取不修改字段
+
+    lazy.update(delta_valence=0.1)           # 写入前先结算
+    assert lazy.last_update == clock[0]
+    assert abs(lazy.valence - (eager.valence + 0.1)) < 1e-12
+
+def test_long_idle_settles_to_baseline():
+    clock = [0.0]
+    state = EmotionalState(personality_type="extrovert", clock=lambda: clock[0])
+    state.update(delta_valence=-0.8, delta_arousal=0.3)
+    clock[0] += 1e6
+    now = state.current()
+    assert abs(now["valence"]) < 1e-9
+    assert now["arousal"] == state.params["arousal_base"]
+    assert now["emotion_debt"] == 0
+
+def test_checks_do_not_depend_on_polling_frequency():
+    clock = [0.0]
+    polled = EmotionalState(personality_type="neurotic", clock=lambda: clock[0])
+    untouched = EmotionalState(personality_type="neurotic", clock=lambda: clock[0])
+    for s in (polled, untouched):
+        s.update(delta_valence=-0.9, delta_arousal=0.9)
+    anchor = (polled.valence, polled.arousal, polled.emotion_debt, polled.last_update)
+
+    for _ in range(10):
+        clock[0] += 60.0
+        assert polled.check_burnout_risk() is False
+        polled.select_coping_strategy()
+    assert (polled.valence, polled.arousal, polled.emotion_debt, polled.last_update) == anchor
+    assert polled.current() == untouched.current()
@@ -26,7 +26,7 @@ $ pytest tests/test_emotion_frr.py -s
 
 
 import time
-from cabsaia.state.emotion_frr import FRRState, update_frr, recent_avg_feedback
+from cabsaia.state.emotion_frr import FRRState, fast_forward_frr, update_frr, recent_avg_feedback
 
 
 def test_initial_state():
@@ -73,4 +73,20 @@ def test_recent_avg_feedback():
     ]
     avg = recent_avg_feedback(mock_history, window=3)
     expected = (0.5 + 0.7 + 1.0) / 3
-    assert abs(avg - expected) < 0.01
\ No newline at end of file
+    assert abs(avg - expected) < 0.01
+
+def test_fast_forward_matches_repeated_updates():
+    for fb, n, ext, start in [(-1.0, 40, None, {}), (0.6, 25, None, dict(resilience=0.3, energy=0.2)),
+                              (0.0, 200, None, {}), (-0.5, 7, 0.6, dict(emotion_debt=4.0))]:
+        looped, fast = FRRState(**start), FRRState(**start)
+        for _ in range(n):
+            update_frr(looped, "probe", feedback_score=fb, system_energy=ext)
+        fast_forward_frr(fast, "probe", fb, n, system_energy=ext)
+
+        assert abs(fast.emotion_debt - looped.emotion_debt) < 1e-9
+        assert abs(fast.resilience - looped.resilience) < 1e-9
+        assert abs(fast.energy - looped.energy) < 1e-9
+        # one aggregated record, but the streaming stats count every event
+        assert len(fast.history["probe"]) == 1
+        assert fast.history["probe"].stats.count == n
+        assert abs(fast.history["probe"].stats.mean - looped.history["probe"].stats.mean) < 1e-12
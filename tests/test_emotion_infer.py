@@ -0,0 +1,45 @@
+# cabsaia/tests/test_emotion_infer.py
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processing.emotion_infer import StreamingEmotionInfer, infer_emotion_from_text
+
+
+def _stream(chunks):
+    st = StreamingEmotionInfer()
+    for c in chunks:
+        st.feed(c)
+    return st.finish()
+
+
+def test_word_boundaries():
+    assert infer_emotion_from_text("I sat in the saddle")["valence"] == 0.0
+    assert infer_emotion_from_text("I am sad")["valence"] < 0
+
+
+def test_intensity_modifier():
+    plain = infer_emotion_from_text("I am happy")
+    mild = infer_emotion_from_text("I am a bit happy")
+    assert 0 < mild["valence"] < plain["valence"]
+
+
+@pytest.mark.parametrize("chunks", [
+    ["I feel so ha", "ppy and fired", " up today"],
+    ["I", " ", "feel", " a", " bi", "t", " sad", "dle"],
+    ["Honestly I'm devastated, helpless and ", "very calm"],
+    [""],
+])
+def test_stream_matches_one_shot(chunks):
+    assert _stream(chunks) == infer_emotion_from_text("".join(chunks))
+
+
+def test_running_delta_and_reset():
+    st = StreamingEmotionInfer()
+    st.feed("I am happy ")
+    assert st.delta["valence"] > 0
+    st.reset()
+    assert st.finish() == {"valence": 0.0, "arousal": 0.0, "dominance": 0.0}
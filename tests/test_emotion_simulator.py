@@ -0,0 +1,49 @@
+# cabsaia/tests/test_emotion_simulator.py
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from state.emotion import EmotionalState
+from state.emotion_simulator import COPING_STRATEGIES, PERSONALITIES, random_events, simulate_trajectories
+
+
+def test_matches_scalar_state_step_for_step():
+    m, t = 24, 30
+    rng = np.random.default_rng(3)
+    dv, da, dd = random_events(m, t, rng, valence_scale=0.5, arousal_scale=0.3, dominance_scale=0.2)
+    personality = [PERSONALITIES[i % len(PERSONALITIES)] for i in range(m)]
+    result = simulate_trajectories(personality, dv, da, dd, time_step=1.5)
+
+    coping_seen = set()
+    for i in range(m):
+        state = EmotionalState(personality_type=personality[i], clock=lambda: 1.0)  # frozen clock: no lazy decay
+        for k in range(t):
+            state.update(dv[i, k], da[i, k], dd[i, k])
+            state.apply_emotional_maintenance(time_passed=1.5)
+            strategy = state.select_coping_strategy() if state.emotion_debt > 5.0 else None
+            burnt = state.check_burnout_risk()
+
+            assert np.isclose(result.valence[i, k], state.valence, rtol=1e-12, atol=1e-12)
+            assert np.isclose(result.arousal[i, k], state.arousal, rtol=1e-12, atol=1e-12)
+            assert np.isclose(result.dominance[i, k], state.dominance, rtol=1e-12, atol=1e-12)
+            assert np.isclose(result.emotion_debt[i, k], state.emotion_debt, rtol=1e-12, atol=1e-12)
+            coping = result.coping[i, k]
+            assert (coping >= 0) == burnt
+            if burnt:
+                assert COPING_STRATEGIES[coping] == strategy
+                coping_seen.add(strategy)
+        assert np.isclose(result.final["resilience"][i], state.resilience, rtol=1e-12, atol=1e-12)
+    assert len(coping_seen) >= 2
+
+
+def test_unrecorded_run_and_summary():
+    dv, da, dd = random_events(400, 20, np.random.default_rng(0))
+    result = simulate_trajectories("neurotic", dv, da, dd, record=False)
+    assert result.valence is None and result.coping is None
+    summary = result.summary()
+    assert list(summary) == ["neurotic"]
+    assert summary["neurotic"]["runs"] == 400
+    assert 0.0 <= summary["neurotic"]["burnout_rate"] <= 1.0
@@ -0,0 +1,59 @@
+# tests/test_feedback_history.py
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from state.emotion_frr import FRRState, update_frr
+from state.feedback_history import FeedbackRing
+
+
+def test_ring_retention_and_windows():
+    ring = FeedbackRing(3)
+    for i, fb in enumerate([1.0, -1.0, 0.5, 0.25, -0.5]):
+        ring.record(fb, float(i), 0.5)
+    assert len(ring) == 3
+    assert [e["feedback"] for e in ring] == [0.5, 0.25, -0.5]
+    assert ring[0] == {"feedback": 0.5, "timestamp": 2.0, "energy": 0.5}
+    assert abs(ring.mean_last(2) - (-0.125)) < 1e-12
+    assert abs(ring.mean_since(3.0) - (-0.125)) < 1e-12
+    assert ring.mean_since(10.0) == 0.0
+
+
+def test_unordered_timestamps_fall_back_to_scan():
+    ring = FeedbackRing(8, [
+        {"feedback": 1.0, "timestamp": 5},
+        {"feedback": -1.0, "timestamp": 1},
+        {"feedback": 0.5},
+    ])
+    assert ring.mean_since(2.0) == 1.0
+    assert "timestamp" not in ring[2]
+
+
+def test_state_history_compat_view():
+    state = FRRState(history_retention=5)
+    state.history["echo"] = [{"feedback": -1.0, "timestamp": 0}, {"feedback": 0.5, "timestamp": 1}]
+    assert isinstance(state.history["echo"], FeedbackRing)
+    assert state.history["echo"][-1:] == [{"feedback": 0.5, "timestamp": 1.0}]
+
+    for _ in range(8):
+        update_frr(state, "probe", feedback_score=-0.5)
+    assert len(state.history["probe"]) == 5
+    assert state.history["probe"][0]["timestamp"] <= time.time()
+    assert abs(state.recent_avg_feedback("probe") - (-0.5)) < 1e-12
+
+
+def test_compat_view_is_read_only_and_warns_on_dropped_keys():
+    state = FRRState()
+    with pytest.warns(UserWarning, match="note"):
+        state.history["echo"] = [{"feedback": -1.0, "timestamp": 0, "note": "x"}]
+    assert state.history["echo"][0] == {"feedback": -1.0, "timestamp": 0.0}
+
+    with pytest.raises(TypeError):
+        state.history["echo"][0]["feedback"] = 1.0
+    with pytest.raises(TypeError):
+        next(iter(state.history["echo"]))["feedback"] = 1.0
+    assert state.history["echo"][0]["feedback"] == -1.0
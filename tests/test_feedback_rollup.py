@@ -0,0 +1,75 @@
+# tests/test_feedback_rollup.py
+
+import math
+import os
+import random
+import sys
+from statistics import pstdev
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from state.emotion_frr import FRRState, update_frr
+from state.feedback_history import FeedbackRing
+from state.feedback_rollup import TIERS
+from state.snapshot import dumps_sessions, loads_sessions
+
+DAY = 86400.0
+
+
+def _filled_ring(days=5, step=30.0, seed=0):
+    rng = random.Random(seed)
+    ring = FeedbackRing(16, rollup=True)
+    events = []
+    t = 0.0
+    while t < days * DAY:
+        fb, en = rng.uniform(-1, 1), rng.random()
+        ring.record(fb, t, en)
+        events.append((t, fb, en))
+        t += step
+    return ring, events
+
+
+def test_buckets_stay_bounded_and_keep_totals():
+    ring, events = _filled_ring()
+    rollup = ring.rollup
+    assert len(rollup) <= sum(keep for _, _, keep in TIERS) + 2
+    total = rollup.total()
+    evicted = events[:-len(ring)]
+    assert total["count"] == len(evicted)
+    assert math.isclose(total["mean"], sum(e[1] for e in evicted) / len(evicted), abs_tol=1e-9)
+    assert total["min"] == min(e[1] for e in evicted)
+    assert total["max"] == max(e[1] for e in evicted)
+
+
+def test_window_queries_combine_buckets_and_raw_tail():
+    ring, events = _filled_ring()
+    now = events[-1][0]
+    # thresholds on minute / hour / day boundaries are answered exactly
+    for threshold in (now - 600 - now % 60, now - 20 * 3600 - now % 3600, 2 * DAY):
+        inside = [e for e in events if e[0] >= threshold]
+        stats = ring.window_stats(threshold)
+        fbs = [e[1] for e in inside]
+        assert stats["count"] == len(inside)
+        assert math.isclose(stats["mean"], sum(fbs) / len(fbs), abs_tol=1e-9)
+        assert math.isclose(stats["std_dev"], pstdev(fbs), abs_tol=1e-7)
+        assert (stats["min"], stats["max"]) == (min(fbs), max(fbs))
+        assert math.isclose(stats["energy_mean"], sum(e[2] for e in inside) / len(inside), abs_tol=1e-9)
+        assert math.isclose(ring.mean_since(threshold), stats["mean"], abs_tol=1e-9)
+
+    ring.clear()
+    assert len(ring.rollup) == 0 and ring.window_stats(0.0)["count"] == 0
+
+
+def test_state_rollup_survives_snapshot():
+    state = FRRState(history_retention=4, history_rollup=True)
+    for fb in [-1.0, 0.5, -0.25, 1.0, -0.75, 0.0, 0.25]:
+        update_frr(state, "probe", feedback_score=fb)
+    window = state.feedback_window("probe", 3600)
+    assert window["count"] == 7
+    assert math.isclose(window["mean"], sum([-1.0, 0.5, -0.25, 1.0, -0.75, 0.0, 0.25]) / 7, abs_tol=1e-12)
+
+    restored, _ = loads_sessions(dumps_sessions({"s": state}))["s"]
+    assert restored.history_rollup and restored.history.rollup
+    assert restored.history["probe"].rollup.to_flat() == state.history["probe"].rollup.to_flat()
+    update_frr(restored, "fresh", feedback_score=-1.0)
+    assert restored.history["fresh"].rollup is not None
+    assert FRRState().history.bucket("x").rollup is None
@@ -0,0 +1,55 @@
+# cabsaia/tests/test_frr_population.py
+
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from state.emotion_frr import FRRState, update_frr
+from state.emotion_trigger import get_recent_feedback_avg, trigger_burst
+from state.frr_population import NO_BURST, FRRPopulation
+
+STRATEGIES = ["reflective_listening", "probe", "echo"]
+
+
+def _random_batch(rng, n_sessions, n_events):
+    sessions = [rng.randrange(n_sessions) for _ in range(n_events)]
+    strategies = [rng.choice(STRATEGIES) for _ in range(n_events)]
+    feedback = [rng.choice([-1.0, -0.5, 0.0, 0.25, 1.0, rng.uniform(-1, 1)]) for _ in range(n_events)]
+    return sessions, strategies, feedback
+
+
+def test_batches_match_scalar_path_exactly():
+    rng = random.Random(7)
+    n = 12
+    pop = FRRPopulation(n)
+    states = [FRRState(history_retention=8) for _ in range(n)]
+
+    for _ in range(6):
+        sessions, strategies, feedback = _random_batch(rng, n, 40)
+        result = pop.apply_events(sessions, strategies, feedback)
+
+        last_strategy = {}
+        for sid, strat, fb in zip(sessions, strategies, feedback):
+            update_frr(states[sid], strat, feedback_score=fb)
+            last_strategy[sid] = strat
+
+        assert list(result.session_ids) == sorted(last_strategy)
+        for sid, label, avg in zip(result.session_ids, result.labels(), result.recent_avg):
+            st = states[sid]
+            assert pop.resilience[sid] == st.resilience
+            assert pop.energy[sid] == st.energy
+            assert pop.emotion_debt[sid] == st.emotion_debt
+            assert avg == get_recent_feedback_avg(st, last_strategy[sid])
+            assert label == trigger_burst(st, last_strategy[sid])
+
+
+def test_bursts_fire_and_external_energy():
+    pop = FRRPopulation(3, energy=0.25, emotion_debt=5.5)
+    result = pop.apply_events([0, 1, 1], ["echo", "echo", "echo"], [-1.0, 1.0, 1.0],
+                              system_energy=[np.nan, 0.9, np.nan])
+    assert result.labels() == ["severe", ""]
+    assert result.levels[1] == NO_BURST
+    assert pop.energy[2] == 0.25  # untouched session
@@ -0,0 +1,55 @@
+# cabsaia/tests/test_frr_sweep.py
+
+import json
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from state import emotion_trigger
+from state.frr_sweep import (
+    evaluate_params,
+    parameter_grid,
+    parameter_overrides,
+    run_sweep,
+    synthetic_traces,
+    write_csv,
+)
+
+TRACES = synthetic_traces(4, 60, seed=1)
+GRID = parameter_grid({"burst.mild.debt_threshold": [1.5, 2.5], "cooling.mild": [1, 4]})
+
+
+def test_overrides_are_scoped():
+    before = emotion_trigger.BURST_LEVELS["mild"]["debt_threshold"]
+    with parameter_overrides({"burst.mild.debt_threshold": 9.0, "resilience.floor": 0.1}):
+        assert emotion_trigger.BURST_LEVELS["mild"]["debt_threshold"] == 9.0
+    assert emotion_trigger.BURST_LEVELS["mild"]["debt_threshold"] == before
+
+
+def test_metrics_and_parallel_matches_serial(tmp_path):
+    serial = run_sweep(GRID, TRACES, workers=0)
+    parallel = run_sweep(GRID, TRACES, workers=2)
+    assert [r.metrics for r in serial] == [r.metrics for r in parallel]
+
+    m = serial[0].metrics
+    assert m["steps"] == 240
+    assert 0.0 <= m["burst_rate"] <= m["time_in_burst"] <= 1.0
+    assert m["bursts"] == m["bursts_mild"] + m["bursts_moderate"] + m["bursts_severe"]
+    assert math.isnan(m["recovery_latency"]) or m["recovery_latency"] >= 1
+
+    path = tmp_path / "sweep.csv"
+    write_csv(serial, str(path))
+    assert path.read_text().splitlines()[0].startswith("param_id,burst.mild.debt_threshold,cooling.mild")
+
+
+def test_checkpoint_resume(tmp_path):
+    ckpt = str(tmp_path / "sweep.jsonl")
+    first = run_sweep(GRID[:2], TRACES, workers=0, checkpoint=ckpt)
+    resumed = run_sweep(GRID, TRACES, workers=0, checkpoint=ckpt)
+
+    with open(ckpt) as f:
+        ids = [json.loads(line)["id"] for line in f]
+    assert ids == [0, 1, 2, 3]  # first two were not recomputed
+    assert [r.metrics for r in resumed[:2]] == [r.metrics for r in first]
+    assert resumed[3].metrics == evaluate_params(GRID[3], TRACES)
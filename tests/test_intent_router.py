@@ -0,0 +1,33 @@
+# cabsaia/tests/test_intent_router.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processing.intent_router import IntentRouter, route_intent
+from processing.text_analysis import TextAnalysis
+
+
+def test_labels():
+    cases = {
+        "Leave me alone": "hard_stop",
+        "ok, just shut up": "hard_stop",
+        "no thanks": "negate",
+        "nope, what now?": "negate",
+        "Yeah sure": "affirm",
+        "Go on": "affirm",
+        "honestly I want to talk again": "affirm",
+        "can you explain this": "question_or_topic",
+        "whatever you like": "question_or_topic",
+        "is it raining?": "question_or_topic",
+        "hello there": "other",
+        "": "other",
+    }
+    for text, intent in cases.items():
+        assert route_intent(text) == intent, text
+
+
+def test_accepts_shared_analysis():
+    a = TextAnalysis("I want to talk about work")
+    assert route_intent(a) == "affirm"
+    assert IntentRouter().classify_many(["stop it", "yes", a]) == ["negate", "affirm", "affirm"]
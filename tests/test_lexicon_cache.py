@@ -0,0 +1,115 @@
+# cabsaia/tests/test_lexicon_cache.py
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processing import lexicon_cache
+from processing.context_negators import CONTEXT_NEGATORS, ContextNegatorDetector
+from processing.lexicon_index import PhraseIndex
+
+
+@pytest.fixture
+def cache_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("CABSAIA_LEXICON_CACHE", str(tmp_path / "cache"))
+    src = tmp_path / "lexicon.py"
+    src.write_text("LEXICON = 1\n")
+    return src
+
+
+def _load(src, calls):
+    def build():
+        calls.append(1)
+        return ContextNegatorDetector({"shutdown": ["go away", "stop"]})
+    return lexicon_cache.load_or_build(
+        "toy", [src], build,
+        export=ContextNegatorDetector.export_state,
+        restore=ContextNegatorDetector.from_state,
+    )
+
+
+def test_built_once_then_restored(cache_env):
+    calls = []
+    first = _load(cache_env, calls)
+    second = _load(cache_env, calls)
+    assert len(calls) == 1
+    assert lexicon_cache.artifact_path("toy").exists()
+    assert second.detect("please go away") == first.detect("please go away")
+
+
+def test_source_change_rebuilds(cache_env):
+    calls = []
+    _load(cache_env, calls)
+    cache_env.write_text("LEXICON = 2\n")
+    _load(cache_env, calls)
+    assert len(calls) == 2
+
+
+def test_corrupt_artifact_rebuilds(cache_env):
+    calls = []
+    _load(cache_env, calls)
+    lexicon_cache.artifact_path("toy").write_bytes(b"not json {")
+    det = _load(cache_env, calls)
+    assert len(calls) == 2
+    assert det.detect("stop") == {"shutdown": ["stop"]}
+
+
+def test_disabled(cache_env, monkeypatch):
+    monkeypatch.setenv("CABSAIA_LEXICON_CACHE", "off")
+    calls = []
+    _load(cache_env, calls)
+    _load(cache_env, calls)
+    assert len(calls) == 2
+
+
+def test_state_roundtrip_full_lexicon():
+    det = ContextNegatorDetector(CONTEXT_NEGATORS)
+    restored = ContextNegatorDetector.from_state(det.export_state())
+    text = "whatever, you're just a machine. leave me alone"
+    assert restored.detect(text) == det.detect(text)
+
+    idx = PhraseIndex()
+    idx.add("at ease", 0)
+    idx.add("'cause", 1)
+    idx.add("calm", 2)
+    back = PhraseIndex.from_state(idx.export_state())
+    assert back.lookup("calm and at ease 'cause") == idx.lookup("calm and at ease 'cause")
+
+
+def test_default_dir_is_per_user_and_artifacts_are_json(tmp_path, monkeypatch):
+    monkeypatch.delenv("CABSAIA_LEXICON_CACHE", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert lexicon_cache.cache_dir() == tmp_path / "xdg" / "cabsaia" / "lexicons"
+
+    src = tmp_path / "lexicon.py"
+    src.write_text("LEXICON = 1\n")
+    calls = []
+    first = _load(src, calls)
+    blob = json.loads(lexicon_cache.artifact_path("toy").read_text(encoding="utf-8"))
+    assert blob["name"] == "toy" and blob["format"] == lexicon_cache.FORMAT_VERSION
+    restored = _load(src, calls)
+    assert len(calls) == 1
+    assert restored.export_state() == first.export_state()   # tuples restored, not lists
+
+
+def test_unserialisable_state_is_built_but_not_cached(cache_env):
+    obj = lexicon_cache.load_or_build(
+        "bad", [cache_env], build=lambda: object(), export=lambda o: o, restore=lambda s: s,
+    )
+    assert obj is not None
+    path = lexicon_cache.artifact_path("bad")
+    assert not path.exists() and not list(path.parent.glob(".bad.*"))
+
+
+def test_cue_index_json_roundtrip(cache_env):
+    from processing import emotion_classifier
+
+    entries, index = emotion_classifier._load_cue_index(rebuild=True)
+    r_entries, r_index = emotion_classifier._load_cue_index()   # restored from the JSON artifact
+    text = "i feel at ease but also a bit heartbroken, you know"
+    assert r_index is not index and r_entries == entries
+    assert r_index.lookup(text) == index.lookup(text)
+    assert r_index.export_state() == index.export_state()
@@ -0,0 +1,37 @@
+# cabsaia/tests/test_lexicon_index.py
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processing.lexicon_index import PhraseIndex
+from processing.emotion_classifier import keyword_in_text
+
+CUES = ["sad", "at ease", "in my chest", "i'm", "self-esteem", "I feel", "'cause", "a bit"]
+
+@pytest.mark.parametrize("text", [
+    "i feel sad",
+    "saddle up",
+    "i'm at ease now",
+    "at  ease",
+    "in my chest's centre",
+    "low self esteem",
+    "i feel a bit off",
+    "because 'cause",
+    "",
+])
+def test_lookup_matches_keyword_in_text(text):
+    idx = PhraseIndex()
+    for i, cue in enumerate(CUES):
+        idx.add(cue, i)
+    expected = {i for i, cue in enumerate(CUES) if keyword_in_text(cue, text)}
+    assert idx.lookup(text) == expected
+
+def test_multiple_payloads_per_cue():
+    idx = PhraseIndex()
+    idx.add("tired", "depression")
+    idx.add("tired", "fatigue")
+    assert idx.lookup("so tired") == {"depression", "fatigue"}
+    assert len(idx) == 2
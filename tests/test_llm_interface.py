@@ -1,9 +1,12 @@
 # cabsaia/tests/test_llm_interface.py
 
+import json
 import os
 import sys
+import threading
 import pytest
 import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from core.llm_interface import LLMInterface
@@ -46,3 +49,70 @@ def test_generate_connection_error():
     print("Connection Error Test Output:", result)
     
     assert "[LLM Error]" in result
+
+
+class _OllamaStub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def _reply(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(b"Ollama is running")
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self._reply(json.dumps({"response": f"echo: {payload['prompt']}"}).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_llm():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OllamaStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    class PoolConfig:
+        LLM_TEMPERATURE = 0.7
+        LLM_POOL_SIZE = 2
+
+    llm = LLMInterface(PoolConfig())
+    llm.api_url = f"http://127.0.0.1:{server.server_address[1]}/api/generate"
+    yield llm
+    llm.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_pooled_requests_reuse_one_connection(stub_llm):
+    assert stub_llm.check_health()
+    for i in range(5):
+        assert stub_llm.generate(f"hi {i}") == f"echo: hi {i}"
+    stats = stub_llm.latency_stats()
+    assert stats["requests"] == 6 and stats["errors"] == 0
+    assert stats["connects"] == 1 and stats["reused"] == 5
+    assert stats["avg_request_ms"] > 0
+
+
+def test_pool_shared_across_threads(stub_llm):
+    results = []
+
+    def work(n):
+        results.extend(stub_llm.generate(f"t{n}-{i}") for i in range(10))
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert len(results) == 40 and all(r.startswith("echo: t") for r in results)
+    stats = stub_llm.latency_stats()
+    assert stats["requests"] == 40
+    # 4 threads over a pool of 2: a few extra connections at most, not one per request
+    assert stats["connects"] < 20
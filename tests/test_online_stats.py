@@ -0,0 +1,60 @@
+# tests/test_online_stats.py
+
+import math
+import os
+import sys
+from statistics import pstdev
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from state.emotion_frr import FRRState, update_frr
+from state.emotion_trigger import _calculate_regression_slope, evaluate_strategy
+from state.online_stats import OnlineStats
+
+
+def test_matches_two_pass_statistics():
+    ys = [1.0, -0.5, 0.25, -1.0, 0.75, 0.0, -0.25]
+    stats = OnlineStats()
+    for y in ys:
+        stats.push(y)
+    assert stats.count == len(ys)
+    assert math.isclose(stats.mean, sum(ys) / len(ys), abs_tol=1e-12)
+    assert math.isclose(stats.std_dev, pstdev(ys), abs_tol=1e-12)
+    assert math.isclose(stats.slope, _calculate_regression_slope(list(range(len(ys))), ys), abs_tol=1e-12)
+
+
+def test_forgetting_tracks_recent_feedback():
+    plain, fading = OnlineStats(), OnlineStats(forgetting=0.5)
+    for y in [-1.0] * 10 + [1.0] * 3:
+        plain.push(y)
+        fading.push(y)
+    assert fading.mean > 0.5 > plain.mean
+
+
+def test_evaluate_strategy_reads_streaming_stats():
+    state = FRRState()
+    for fb in [1.0, 0.5, -0.5, -1.0]:
+        update_frr(state, "echo", feedback_score=fb)
+    result = evaluate_strategy(state, "echo")
+
+    history = [e["feedback"] for e in state.history["echo"]]
+    assert state.history["echo"].stats.count == 4
+    assert math.isclose(result["stability"], 1 - min(1.0, pstdev(history)), abs_tol=1e-12)
+    slope = _calculate_regression_slope(list(range(len(history))), history)
+    assert math.isclose(result["trend"], math.tanh(slope), abs_tol=1e-12)
+
+    state.history.clear()
+    assert evaluate_strategy(state, "echo")["composite"] == 0.0
+
+
+def test_push_repeated_matches_pushes():
+    for forgetting in (1.0, 0.9):
+        block, looped = OnlineStats(forgetting), OnlineStats(forgetting)
+        for y in [0.3, -1.0, 0.5]:
+            block.push(y)
+            looped.push(y)
+        block.push_repeated(-0.5, 37)
+        for _ in range(37):
+            looped.push(-0.5)
+        assert block.count == looped.count
+        for key, value in looped.as_dict().items():
+            assert math.isclose(block.as_dict()[key], value, rel_tol=1e-9, abs_tol=1e-12)
@@ -37,3 +37,17 @@ def test_prompt_generation(role, valence, arousal, dominance):
     assert role in prompt
     assert "User says" in prompt
     assert "Emotion Label" in prompt
+
+
+def test_prompt_uses_decayed_emotion_after_idle():
+    from state.emotion import SECONDS_PER_TIME_UNIT, EmotionalState
+
+    clock = [0.0]
+    state = EmotionalState(personality_type="extrovert", clock=lambda: clock[0])
+    state.update(delta_valence=-0.8, delta_arousal=0.3)
+    clock[0] += 100 * SECONDS_PER_TIME_UNIT
+
+    prompt = PromptGenerator(config_path="config/roles.yaml").build_prompt("hi", "Analyst", state)
+    now = state.current()
+    assert f"V={now['valence']:.2f}, A={now['arousal']:.2f}" in prompt
+    assert "V=-0.80" not in prompt
@@ -0,0 +1,48 @@
+# cabsaia/tests/test_prompt_templates.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from behavior.role_engine import COPING_STYLES, PROMPT_STYLE_MAP, RoleEngine
+from config import CONFIG
+from core.prompt_generator import PromptGenerator
+from core.prompt_templates import ENGINE_RULES, registry
+from state.emotion_frr import FRRState
+
+
+class _Emotion:
+    valence, arousal, dominance, resilience, emotion_debt = -0.6, 0.7, 0.2, 0.9, 1.5
+
+
+def test_registry_covers_every_combination():
+    reg = registry()
+    assert len(reg.engine) == len(COPING_STYLES) * len(PROMPT_STYLE_MAP)
+    for (style, tone_key), text in reg.engine.items():
+        assert text.startswith(ENGINE_RULES)
+        assert f"coping style '{style}' ({', '.join(COPING_STYLES[style]['traits'])})" in text
+        assert text.endswith(f"Tone: {PROMPT_STYLE_MAP[tone_key]}.")
+    for role in CONFIG.ROLES:
+        head, tail = reg.role_parts(role, CONFIG.ROLES[role].get("description", ""))
+        assert f"[Role]: {role} (" in head and tail.endswith(f"{role}.")
+
+
+def test_engines_share_rendered_prompts():
+    a, b = RoleEngine(FRRState()), RoleEngine(FRRState())
+    assert a.get_prompt("resentful", "moderate") is b.get_prompt("resentful", "moderate")
+    assert a.get_prompt("resentful", "unknown") is a.get_prompt("resentful", "baseline")
+
+
+def test_prompt_generator_output_unchanged():
+    pg = PromptGenerator(config_path=str(CONFIG.ROLES_PATH))
+    prompt = pg.build_prompt("hello", "Analyst", _Emotion())
+    expected = "\n".join([
+        pg.default_instruction,
+        f"[Role]: Analyst ({pg.get_role_description('Analyst')})",
+        "[Emotion]: V=-0.60, A=0.70, D=0.20, R=0.90, Debt=1.50",
+        "[Emotion Label]: Angry",
+        "User says: hello",
+        "Respond in the tone of a Analyst.",
+    ])
+    assert prompt == expected
+    assert "[Role]: Stranger (clear and informative" in pg.build_prompt("hi", "Stranger", _Emotion())
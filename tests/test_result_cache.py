@@ -0,0 +1,103 @@
+# cabsaia/tests/test_result_cache.py
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processing.result_cache import (
+    ResultCache,
+    disable_result_cache,
+    enable_result_cache,
+    invalidate_result_cache,
+)
+from processing.emotion_classifier import (
+    analyse_emotion_from_text,
+    detect_hard_stop,
+    infer_feedback_score,
+)
+from processing import context_negators
+from processing.context_negators import detect_negators
+from resources import emotion_dictionary
+
+
+@pytest.fixture
+def cache():
+    c = enable_result_cache(maxsize=8)
+    yield c
+    disable_result_cache()
+
+
+def test_lru_counters_and_eviction():
+    c = ResultCache(maxsize=2)
+    assert c.get_or_compute("a", lambda: 1) == 1
+    assert c.get_or_compute("a", lambda: 2) == 1
+    c.get_or_compute("b", lambda: 2)
+    c.get_or_compute("a", lambda: 0)       # refresh "a"
+    c.get_or_compute("c", lambda: 3)       # evicts "b"
+    s = c.stats()
+    assert (s.hits, s.misses, s.evictions, s.size) == (2, 3, 1, 2)
+    assert c.get_or_compute("b", lambda: 20) == 20
+
+
+def test_repeats_hit_after_normalisation(cache):
+    first = infer_feedback_score("Thanks!")
+    misses = cache.stats().misses
+    assert infer_feedback_score("  THANKS ") == first
+    assert cache.stats().misses == misses
+    assert cache.stats().hits >= 1
+
+
+def test_cached_results_are_plain_and_unshared(cache):
+    text = "I'm completely devastated and hopeless"
+    res = analyse_emotion_from_text(text)
+    assert type(res) is dict and isinstance(res["keywords"], list)
+    res["valence"] = 1.0
+    res["keywords"].clear()
+    again = analyse_emotion_from_text(text)
+    assert cache.stats().hits >= 1
+    assert again["valence"] != 1.0 and again["keywords"]
+    disable_result_cache()
+    assert analyse_emotion_from_text(text) == again
+
+
+def test_cached_values_match_uncached(cache):
+    texts = ["go away", "thanks, that helped", "I feel very happy", "whatever"]
+    cached = [(detect_hard_stop(t), infer_feedback_score(t), analyse_emotion_from_text(t), detect_negators(t))
+              for t in texts]
+    disable_result_cache()
+    fresh = [(detect_hard_stop(t), infer_feedback_score(t), analyse_emotion_from_text(t), detect_negators(t))
+             for t in texts]
+    assert cached == fresh
+
+
+def test_module_level_detect_negators_is_cached(cache):
+    first = detect_negators("Leave me alone!")
+    hits = cache.stats().hits
+    assert detect_negators("leave me ALONE") == first
+    assert cache.stats().hits == hits + 1
+
+
+def test_invalidate(cache):
+    infer_feedback_score("go away")
+    assert len(cache) > 0
+    invalidate_result_cache()
+    assert len(cache) == 0
+
+
+def test_invalidate_rebuilds_matchers(cache):
+    text = "you are a zorblax"
+    assert detect_negators(text) == {}
+    emotion_dictionary.EMOTION_KEYWORDS["negative"].append("zorblax")
+    context_negators.CONTEXT_NEGATORS["contempt"].append("zorblax")
+    try:
+        assert detect_negators(text) == {}          # stale until invalidated
+        invalidate_result_cache()
+        assert "zorblax" in detect_negators(text)["contempt"]
+        assert ("negative", "zorblax") in analyse_emotion_from_text(text)["keywords"]
+    finally:
+        emotion_dictionary.EMOTION_KEYWORDS["negative"].remove("zorblax")
+        context_negators.CONTEXT_NEGATORS["contempt"].remove("zorblax")
+        invalidate_result_cache()
+    assert detect_negators(text) == {}
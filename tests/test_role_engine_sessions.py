@@ -0,0 +1,86 @@
+# cabsaia/tests/test_role_engine_sessions.py
+
+import os
+import random
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from behavior.role_engine import RoleEngine
+from state.emotion_frr import FRRState, update_frr
+
+_FIELDS = ("emotion_debt", "energy", "last_style", "last_prompt_style", "last_burst_level", "cooling_period")
+
+
+def _states(n, seed=0):
+    rng = random.Random(seed)
+    states = []
+    for _ in range(n):
+        state = FRRState()
+        for _ in range(4):
+            update_frr(state, "probe", feedback_score=rng.uniform(-1, 0.1))
+        states.append(state)
+    return states
+
+
+def test_shared_engine_matches_engine_per_state():
+    shared_states, own_states = _states(20), _states(20)
+    shared = RoleEngine(switch_cooldown_secs=1e-9)
+    for round_ in range(3):
+        for a, b in zip(shared_states, own_states):
+            prompt = shared.decide_and_generate_prompt("probe", a)
+            engine = RoleEngine(b, switch_cooldown_secs=1e-9)
+            assert prompt is engine.decide_and_generate_prompt("probe")
+            for name in _FIELDS:
+                assert getattr(a, name, None) == getattr(b, name, None), (round_, name)
+
+    with pytest.raises(ValueError):
+        shared.decide_and_generate_prompt("probe")
+
+
+def test_concurrent_decisions_on_shared_sessions():
+    states = _states(8)
+    engine = RoleEngine()
+    errors = []
+
+    def work(seed):
+        rng = random.Random(seed)
+        try:
+            for _ in range(300):
+                state = rng.choice(states)
+                update_frr(state, "probe", feedback_score=rng.uniform(-1, 0.2))
+                engine.decide_and_generate_prompt("probe", state)
+                engine.update_strategy_cooldown("probe", state)
+        except Exception as e:  # pragma: no cover - surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    for state in states:
+        assert state.last_style == engine.decide_coping_style(state.last_burst_level)
+
+
+def test_per_call_states_are_normalised(tmp_path):
+    from types import SimpleNamespace
+
+    from state.strategy_log import StrategyLog, read_events
+
+    engine = RoleEngine()
+    fresh = FRRState()
+    with StrategyLog(tmp_path, batch_size=1) as log:
+        log.attach("s", fresh)
+        engine.decide_and_generate_prompt("probe", fresh)
+    events = [e["event"] for e in read_events(tmp_path / "strategy_log.jsonl")]
+    assert events == ["session_start"]          # a baseline decision is not a style switch
+    assert fresh.last_style == "emotion_focused"
+
+    legacy = SimpleNamespace(energy=1.0, emotion_debt=0.0, history={}, last_switch_time=0.0)
+    assert engine.decide_and_generate_prompt("probe", legacy)
+    assert (legacy.last_style, legacy.last_prompt_style, legacy.last_burst_level) == \
+        ("emotion_focused", "baseline", "baseline")
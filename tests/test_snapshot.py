@@ -0,0 +1,70 @@
+# cabsaia/tests/test_snapshot.py
+
+import os
+import struct
+import sys
+from collections import deque
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from state.emotion import EmotionalState
+from state.emotion_frr import FRRState, UserProfile, update_frr
+from state.emotion_trigger import apply_burst_recovery, evaluate_strategy
+from state.snapshot import dumps_sessions, load_sessions, loads_sessions, save_sessions
+
+
+def _session(personality="neurotic"):
+    frr = FRRState(user_profile=UserProfile(personality), history_retention=4, stats_forgetting=0.9)
+    for fb in [-1.0, 0.5, -0.25, 1.0, -0.75, 0.0]:
+        update_frr(frr, "probe", feedback_score=fb)
+    update_frr(frr, "echo", feedback_score=0.3)
+    frr.history["manual"] = [{"feedback": 1.0, "timestamp": 5}, {"feedback": -1.0}]
+    frr.avoid_mode = True
+    frr.last_burst_level = "mild"
+    frr.strategy_state["probe"] = {"cooldown": 3, "recent_feedback": deque([-1.0, 0.5], maxlen=5)}
+    apply_burst_recovery(frr, "moderate")
+    frr.custom_note = {"seen": 2}
+    emo = EmotionalState(personality_type="extrovert")
+    emo.update(delta_valence=-0.4, delta_arousal=0.2)
+    return frr, emo
+
+
+def test_roundtrip_preserves_state(tmp_path):
+    frr, emo = _session()
+    path = tmp_path / "sessions.snap"
+    save_sessions(path, {"a": (frr, emo), "b": FRRState()})
+    restored = load_sessions(path)
+
+    r_frr, r_emo = restored["a"]
+    for name in ("emotion_debt", "resilience", "energy", "avoid_mode", "history_retention", "stats_forgetting",
+                 "last_burst_level", "cooling_period", "custom_note", "burst_thresholds"):
+        assert getattr(r_frr, name) == getattr(frr, name), name
+    assert r_frr.user_profile.personality == "neurotic"
+    assert r_frr.strategy_state["probe"]["recent_feedback"] == deque([-1.0, 0.5], maxlen=5)
+    assert r_frr.strategy_state["probe"]["recent_feedback"].maxlen == 5
+    for strategy in ("probe", "echo", "manual"):
+        assert list(r_frr.history[strategy]) == list(frr.history[strategy])
+    assert r_frr.history["probe"].stats.as_dict() == frr.history["probe"].stats.as_dict()
+    assert evaluate_strategy(r_frr, "probe") == evaluate_strategy(frr, "probe")
+    assert r_frr.recent_avg_feedback("manual", window_secs=10**10) == frr.recent_avg_feedback("manual", window_secs=10**10)
+
+    # restored rings keep working (and keep their retention)
+    update_frr(r_frr, "probe", feedback_score=-1.0)
+    assert len(r_frr.history["probe"]) == 4
+    assert r_frr.history["probe"][-1]["feedback"] == -1.0
+
+    assert (r_emo.valence, r_emo.arousal, r_emo.emotion_debt, r_emo.last_update) == \
+        (emo.valence, emo.arousal, emo.emotion_debt, emo.last_update)
+    assert r_emo.personality_type == "extrovert"
+    assert restored["b"][1] is None
+    assert not hasattr(restored["b"][0], "cooling_period")
+
+
+def test_rejects_foreign_and_future_files():
+    blob = dumps_sessions({"a": FRRState()})
+    with pytest.raises(ValueError):
+        loads_sessions(b"not a snapshot")
+    future = blob[:6] + struct.pack("<H", 99) + blob[8:]
+    with pytest.raises(ValueError, match="unsupported snapshot version 99"):
+        loads_sessions(future)
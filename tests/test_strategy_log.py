@@ -0,0 +1,133 @@
+# cabsaia/tests/test_strategy_log.py
+
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from behavior.role_engine import RoleEngine
+from state.emotion_frr import FRRState, UserProfile, fast_forward_frr, update_frr
+from state.strategy_log import StrategyLog, list_checkpoints, read_events, rebuild_sessions
+
+_FIELDS = ("emotion_debt", "resilience", "energy", "last_style", "last_prompt_style",
+           "last_burst_level", "last_switch_time", "cooling_period")
+
+
+def _drive(log, sessions, steps=40, seed=0):
+    rng = random.Random(seed)
+    engines = {sid: RoleEngine(frr) for sid, frr in sessions.items()}
+    for sid, frr in sessions.items():
+        log.attach(sid, frr)
+    for _ in range(steps):
+        sid = rng.choice(sorted(sessions))
+        update_frr(sessions[sid], rng.choice(["probe", "echo"]), feedback_score=rng.uniform(-1, 0.3))
+        if rng.random() < 0.3:
+            engines[sid].decide_and_generate_prompt("probe")
+        log.maybe_checkpoint()
+    fast_forward_frr(sessions["a"], "echo", -1.0, 25)
+    engines["a"].decide_and_generate_prompt("echo")
+
+
+def _assert_same(rebuilt, sessions):
+    assert set(rebuilt) == set(sessions)
+    for sid, frr in sessions.items():
+        r = rebuilt[sid][0]
+        for name in _FIELDS:
+            assert getattr(r, name, None) == getattr(frr, name, None), (sid, name)
+        assert set(r.history) == set(frr.history)
+        for strategy, ring in frr.history.items():
+            assert list(r.history[strategy]) == list(ring)
+            assert r.history[strategy].stats.as_dict() == ring.stats.as_dict()
+
+
+def test_rebuild_from_checkpoint_and_tail(tmp_path, capsys):
+    sessions = {"a": FRRState(user_profile=UserProfile("neurotic")), "b": FRRState(history_retention=8)}
+    with StrategyLog(tmp_path, batch_size=5, checkpoint_every=13) as log:
+        _drive(log, sessions)
+        last = log.seq
+
+    checkpoints = list_checkpoints(tmp_path)
+    assert 1 <= len(checkpoints) <= 2
+    assert checkpoints[-1][0] <= last
+    events = list(read_events(tmp_path / "strategy_log.jsonl"))
+    assert [e["seq"] for e in events] == list(range(1, last + 1))
+    kinds = {e["event"] for e in events}
+    assert {"session_start", "update_frr", "fast_forward", "burst_recovery", "style_switch"} <= kinds
+    assert "burst" not in kinds   # trigger_burst is a query; only the recovery is logged
+
+    _assert_same(rebuild_sessions(tmp_path), sessions)
+
+    # without checkpoints the full log rebuilds the same sessions
+    for _, path in checkpoints:
+        path.unlink()
+    _assert_same(rebuild_sessions(tmp_path), sessions)
+
+
+def test_reopen_continues_sequence_after_torn_write(tmp_path):
+    frr = FRRState()
+    with StrategyLog(tmp_path, batch_size=1) as log:
+        log.attach("s", frr)
+        update_frr(frr, "probe", feedback_score=-0.5)
+    with open(tmp_path / "strategy_log.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"seq":3,"t":1.0,"sess')
+
+    with StrategyLog(tmp_path, batch_size=1) as log:
+        log.sessions["s"] = (frr, None)
+        update_frr(frr, "probe", feedback_score=0.5)
+
+    lines = (tmp_path / "strategy_log.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[-1])["seq"] == 3
+    assert [e["seq"] for e in read_events(tmp_path / "strategy_log.jsonl")] == [1, 2, 3]
+    _assert_same(rebuild_sessions(tmp_path), {"s": frr})
+
+
+def test_unattached_states_are_not_logged(tmp_path):
+    with StrategyLog(tmp_path, batch_size=1) as log:
+        update_frr(FRRState(), "probe", feedback_score=-1.0)
+        assert log.seq == 0
+    update_frr(FRRState(), "probe", feedback_score=-1.0)  # no active log: no-op
+
+
+def test_checkpoint_waits_for_explicit_call_and_stays_consistent(tmp_path):
+    import threading
+    from collections import deque
+
+    sessions = {f"s{i}": FRRState() for i in range(4)}
+    with StrategyLog(tmp_path, batch_size=50, checkpoint_every=5) as log:
+        for sid, frr in sessions.items():
+            log.attach(sid, frr)
+        for _ in range(10):
+            update_frr(sessions["s0"], "probe", feedback_score=-0.4)
+        assert log.checkpoint_due and list_checkpoints(tmp_path) == []   # never from inside emit()
+
+        engine = RoleEngine()
+        frr = sessions["s1"]
+        frr.strategy_state["probe"] = {"cooldown": 1, "recent_feedback": deque([-1.0, -0.8], maxlen=5)}
+        engine.update_strategy_cooldown("probe", frr)
+
+        def work(sid, seed):
+            rng = random.Random(seed)
+            for _ in range(300):
+                update_frr(sessions[sid], "probe", feedback_score=rng.uniform(-1, 1))
+
+        workers = [threading.Thread(target=work, args=(sid, i)) for i, sid in enumerate(sessions)]
+        for w in workers:
+            w.start()
+        while any(w.is_alive() for w in workers):
+            log.checkpoint()
+        for w in workers:
+            w.join()
+        log.checkpoint()
+        update_frr(sessions["s2"], "echo", feedback_score=0.2)
+
+    rebuilt = rebuild_sessions(tmp_path)
+    _assert_same(rebuilt, sessions)
+    assert rebuilt["s1"][0].strategy_state["probe"]["cooldown"] == 3
+
+    # strategy_state changes are logged, not only restored from checkpoints
+    for _, path in list_checkpoints(tmp_path):
+        path.unlink()
+    rebuilt = rebuild_sessions(tmp_path)
+    _assert_same(rebuilt, sessions)
+    assert list(rebuilt["s1"][0].strategy_state["probe"]["recent_feedback"]) == [-1.0, -0.8]
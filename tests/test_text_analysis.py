@@ -0,0 +1,62 @@
+# cabsaia/tests/test_text_analysis.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processing import context_negators
+from processing.text_analysis import TextAnalysis
+from processing.emotion_classifier import (
+    analyse_emotion_from_text,
+    detect_hard_stop,
+    infer_feedback_score,
+)
+
+
+def test_views_are_cached():
+    a = TextAnalysis("Just SHUT UP, you're useless!")
+    assert a.cleaned == "just shut up you're useless"
+    assert a.tokens == ("just", "shut", "up", "you're", "useless")
+    assert a.negators is a.negators
+    assert a.emotion is analyse_emotion_from_text(a)
+
+
+def test_matches_string_path():
+    for text in ["Just go away", "thanks, that helped", "I feel hopeless and tired", ""]:
+        a = TextAnalysis(text)
+        assert detect_hard_stop(a) == detect_hard_stop(text)
+        assert infer_feedback_score(a) == infer_feedback_score(text)
+        assert analyse_emotion_from_text(a) == analyse_emotion_from_text(text)
+
+
+def test_negators_scanned_once_per_turn(monkeypatch):
+    calls = []
+    real = context_negators.DETECTOR.detect_normalised
+
+    def counting(t):
+        calls.append(t)
+        return real(t)
+
+    monkeypatch.setattr(context_negators.DETECTOR, "detect_normalised", counting)
+
+    a = TextAnalysis("leave me alone, whatever")
+    for _ in range(3):
+        detect_hard_stop(a)
+    infer_feedback_score(a)
+    analyse_emotion_from_text(a)
+    assert len(calls) == 1
+
+
+def test_of_reuses_instance():
+    a = TextAnalysis("ok")
+    assert TextAnalysis.of(a) is a
+    assert TextAnalysis.of("ok").raw == "ok"
+
+
+def test_hard_stop_skips_negator_scan(monkeypatch):
+    calls = []
+    monkeypatch.setattr(context_negators.DETECTOR, "detect_normalised", lambda t: calls.append(t) or {})
+
+    assert detect_hard_stop(TextAnalysis("Please just GO AWAY!")) is True
+    assert detect_hard_stop(TextAnalysis("tell me more")) is False
+    assert calls == []
@@ -0,0 +1,99 @@
+# cabsaia/tests/test_timer_wheel.py
+
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from behavior.role_engine import RoleEngine
+from state.emotion_frr import FRRState, update_frr
+from state.timer_wheel import SLOTS, TimerWheel
+
+
+def test_schedule_cancel_and_batches_match_naive_model():
+    rng = random.Random(7)
+    wheel = TimerWheel(tick=1.0, clock=lambda: 0.0)
+    pending = {}
+    now = 0.0
+    for step in range(400):
+        for _ in range(rng.randrange(5)):
+            key = rng.randrange(200)
+            deadline = now + rng.choice([rng.uniform(-3, 10), rng.uniform(0, SLOTS ** 3 * 1.5)])
+            wheel.schedule(key, deadline)
+            pending[key] = deadline
+        if pending and rng.random() < 0.3:
+            key = rng.choice(list(pending))
+            assert wheel.cancel(key)
+            del pending[key]
+        now += rng.choice([1, 3, SLOTS, SLOTS ** 2 * 2])
+        fired = wheel.advance(now)
+        expected = {k for k, d in pending.items() if d <= now}
+        assert {e.key for e in fired} == expected
+        assert [e.deadline for e in fired] == sorted(e.deadline for e in fired)
+        for k in expected:
+            del pending[k]
+        assert len(wheel) == len(pending)
+    assert not wheel.cancel("missing")
+
+
+def test_reschedule_replaces_previous_deadline():
+    wheel = TimerWheel(clock=lambda: 100.0)
+    wheel.schedule("a", 110, "first")
+    wheel.schedule("a", 105, "second")
+    assert len(wheel) == 1 and wheel.deadline("a") == 105
+    assert [(e.key, e.payload) for e in wheel.advance(106)] == [("a", "second")]
+    assert wheel.advance(200) == []
+
+
+def _burst_state():
+    state = FRRState()
+    state.session_id = "s1"
+    for _ in range(8):
+        update_frr(state, "probe", feedback_score=-1.0)
+    state.emotion_debt = 9.0
+    return state
+
+
+def test_engine_consumes_expiry_batches():
+    wheel = TimerWheel()
+    engine = RoleEngine(timers=wheel, switch_cooldown_secs=60, cooling_round_secs=10)
+    state = _burst_state()
+    engine.decide_and_generate_prompt("probe", state)
+    assert state.last_burst_level != "baseline"
+    assert getattr(state, "cooling_period", 0) > 0
+    assert state.last_prompt_style == state.last_burst_level
+    assert len(wheel) >= 1
+
+    # calm down: the tone may only relax once its cooldown has expired
+    state.last_burst_level = "baseline"
+    now = time.time()
+    assert all(e["kind"] != "tone_relaxed" for e in engine.process_expired(now + 1))
+
+    events = engine.process_expired(now + 61 + state.cooling_period * 10)
+    kinds = {e["kind"] for e in events}
+    assert "cooling_expired" in kinds and not hasattr(state, "cooling_period")
+    assert "tone_relaxed" in kinds and state.last_prompt_style == "baseline"
+    assert all(e["session"] == "s1" for e in events)
+
+
+def test_strategy_cooldown_steps_down_and_release_cancels():
+    wheel = TimerWheel()
+    engine = RoleEngine(timers=wheel, cooling_round_secs=5)
+    state = FRRState()
+    state.strategy_state["probe"] = {"cooldown": 1, "recent_feedback": deque([-1.0, -0.9], maxlen=5)}
+    engine.update_strategy_cooldown("probe", state)
+    start = state.strategy_state["probe"]["cooldown"]
+    assert start > 1
+
+    now = time.time()
+    engine.process_expired(now + 6)
+    assert state.strategy_state["probe"]["cooldown"] == start - 1
+    engine.process_expired(now + 6 + 5 * start)
+    assert state.strategy_state["probe"]["cooldown"] == 1
+
+    engine.update_strategy_cooldown("probe", state)
+    assert len(wheel)
+    engine.release(state)
+    assert len(wheel) == 0
@@ -0,0 +1,66 @@
+# cabsaia/tests/test_tracing.py
+
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from behavior.role_engine import RoleEngine
+from core.tracing import TRACER, ConsoleSink, JsonlSink, RingBufferSink
+from state.emotion_frr import FRRState, update_frr
+
+
+@pytest.fixture
+def engine():
+    TRACER.clear()
+    state = FRRState()
+    for fb in [-1.0, -1.0, -0.8, -1.0]:
+        update_frr(state, "probe", feedback_score=fb)
+    calls = []
+    original = state.recent_avg_feedback
+    state.recent_avg_feedback = lambda *a, **k: calls.append(a) or original(*a, **k)
+    yield RoleEngine(state), calls
+    TRACER.clear()
+
+
+def test_disabled_tracing_is_silent_and_skips_history_scan(engine, capsys):
+    eng, calls = engine
+    eng.decide_and_generate_prompt("probe")
+    assert capsys.readouterr().out == ""
+    assert calls == []
+
+
+def test_lazy_fields_only_for_sinks_that_want_them(engine):
+    eng, calls = engine
+    lean = TRACER.add_sink(RingBufferSink(wants=frozenset()))
+    eng.decide_and_generate_prompt("probe")
+    record = lean.records[-1]
+    assert "feedback_avg" not in record and calls == []
+    assert record["style"] == eng.state.last_style
+    assert record["burst_level"] == eng.state.last_burst_level
+    assert record["total_ms"] >= record["burst_ms"] >= 0
+
+    full = TRACER.add_sink(RingBufferSink())
+    eng.decide_and_generate_prompt("probe")
+    assert len(calls) == 1
+    assert full.records[-1]["feedback_avg"] == eng.state.recent_avg_feedback("probe")
+    assert full.records[-1]["decision_id"] == record["decision_id"] + 1
+
+
+def test_jsonl_and_console_sinks(engine, tmp_path):
+    eng, _ = engine
+    out = io.StringIO()
+    jsonl = TRACER.add_sink(JsonlSink(tmp_path / "trace.jsonl", batch_size=10))
+    TRACER.add_sink(ConsoleSink(out))
+    eng.decide_and_generate_prompt("probe")
+    eng.decide_and_generate_prompt("probe")
+    jsonl.close()
+
+    lines = [json.loads(l) for l in (tmp_path / "trace.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [r["tone"] for r in lines] == [eng.state.last_prompt_style] * 2
+    assert "feedback_avg" in lines[0]
+    assert out.getvalue().count("[TRACE] Coping Style Decision") == 2
+    assert f"Chosen Style : {eng.state.last_style}" in out.getvalue()
@@ -0,0 +1,29 @@
+# cabsaia/tests/test_vad_matrix.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processing.emotion_infer import infer_emotion_from_text
+from processing.vad_matrix import DIMENSIONS, score_texts
+
+TEXTS = [
+    "I am happy and calm",
+    "I feel a bit sad, furious and helpless",
+    "extremely excited, energized and confident",
+    "I sat in the saddle",
+    "",
+    "completely devastated but in control",
+]
+
+
+def test_batch_matches_scalar_exactly():
+    scores = score_texts(TEXTS)
+    assert scores.shape == (len(TEXTS), 3)
+    for row, text in zip(scores, TEXTS):
+        expected = infer_emotion_from_text(text)
+        assert tuple(row) == tuple(expected[d] for d in DIMENSIONS)
+
+
+def test_empty_batch():
+    assert score_texts([]).shape == (0, 3)